@@ -202,6 +202,30 @@ async def get_service_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/metrics")
+async def get_operational_metrics():
+    """Get process-wide memory pipeline counters (workers, queues, caches)."""
+    try:
+        from services.memory.consolidation import memory_consolidator
+        from services.memory.ingestion import memory_ingestion_queue
+        from utils.scoring.score_cache import scoring_cache
+        from utils.scoring.prefilter import scoring_prefilter
+        from utils.single_flight import get_single_flight_stats
+
+        return {
+            "ingestion": await memory_ingestion_queue.get_stats(),
+            "consolidation": memory_consolidator.get_stats(),
+            "scoring_cache": scoring_cache.get_stats(),
+            "scoring_prefilter": scoring_prefilter.get_stats(),
+            "coalescing": get_single_flight_stats(),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    except Exception as e:
+        logger.error(f"Error getting operational metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/detailed")
 async def get_detailed_health():
     """Get detailed health information including metrics and diagnostics."""
@@ -6,6 +6,7 @@ A comprehensive mental health support platform with voice assistance.
 # Load centralized configuration manager first
 from config_manager import config_manager
 import os
+import asyncio
 import logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -241,6 +242,38 @@ async def startup_event():
     else:
         logger.info("✅ All configurations loaded successfully")
 
+    # Load every prompt file into the prompt registry
+    from utils.prompts.registry import prompt_registry
+
+    prompt_registry.load_all()
+
+    # Background worker tasks, cancelled and awaited on shutdown
+    app.state.background_tasks = []
+
+    # Start the memory stats reconciliation worker
+    from services.memory.config import Config as MemoryConfig
+
+    if MemoryConfig.MEMORY_STATS_RECONCILE_ENABLED:
+        from services.memory.stats_reconciler import memory_stats_reconciler
+
+        app.state.background_tasks.append(
+            asyncio.create_task(memory_stats_reconciler.start())
+        )
+
+    # Start the long-term memory consolidation worker
+    if MemoryConfig.MEMORY_CONSOLIDATION_ENABLED:
+        from services.memory.consolidation import memory_consolidator
+
+        app.state.background_tasks.append(
+            asyncio.create_task(memory_consolidator.start())
+        )
+
+    # Start the write-behind memory ingestion workers
+    if MemoryConfig.MEMORY_INGESTION_ENABLED:
+        from services.memory.ingestion import memory_ingestion_queue
+
+        await memory_ingestion_queue.start()
+
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -248,6 +281,31 @@ async def shutdown_event():
     """Application shutdown event."""
     logger.info("🛑 Shutting down Nura Backend API")
 
+    from services.memory.stats_reconciler import memory_stats_reconciler
+
+    memory_stats_reconciler.stop()
+
+    from services.memory.config import Config as MemoryConfig
+
+    if MemoryConfig.MEMORY_CONSOLIDATION_ENABLED:
+        from services.memory.consolidation import memory_consolidator
+
+        memory_consolidator.stop()
+
+    if MemoryConfig.MEMORY_INGESTION_ENABLED:
+        from services.memory.ingestion import memory_ingestion_queue
+
+        await memory_ingestion_queue.stop()
+
+    background_tasks = getattr(app.state, "background_tasks", [])
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    from utils.llm_executor import llm_executor
+
+    llm_executor.shutdown()
+
 
 if __name__ == "__main__":
     import uvicorn
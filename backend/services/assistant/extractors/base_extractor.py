@@ -8,6 +8,8 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 import google.generativeai as genai
 
+from utils.llm_executor import llm_executor
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,8 +81,11 @@ Analyze the conversation and extract any {self.get_extraction_type()} informatio
 """
 
         try:
-            response = self.model.generate_content(
-                extraction_prompt, generation_config=self.generation_config
+            response = await llm_executor.generate_content(
+                self.model,
+                extraction_prompt,
+                generation_config=self.generation_config,
+                coalesce=True,
             )
 
             # Parse the structured response
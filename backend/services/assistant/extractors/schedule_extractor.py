@@ -2,9 +2,10 @@
 Schedule extraction functionality for mental health assistant.
 """
 
-import os
 import logging
 from typing import Dict, Any
+
+from utils.prompts.registry import prompt_registry
 from .base_extractor import BaseExtractor, BaseOpportunityAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -13,29 +14,21 @@ logger = logging.getLogger(__name__)
 class ScheduleExtractor(BaseExtractor):
     """Extracts scheduling information from conversations."""
 
-    def __init__(self, model, generation_config):
-        super().__init__(model, generation_config)
-        self.prompt_template = self._load_prompt()
-
     def _load_prompt(self) -> str:
-        """Load the schedule extraction prompt from file."""
-        utils_dir = os.path.join(
-            os.path.dirname(__file__), "..", "..", "..", "utils", "prompts", "chat"
-        )
-        prompt_file = os.path.join(utils_dir, "schedule_extraction.txt")
-
-        if os.path.exists(prompt_file):
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if content:
-                    logger.info("Loaded schedule extraction prompt from file")
-                    return content
+        """Load the schedule extraction prompt (cached and hot-reloaded by the registry)."""
+        try:
+            content = prompt_registry.text("chat/schedule_extraction.txt")
+        except FileNotFoundError:
+            content = None
+
+        if content:
+            return content
 
         logger.warning("Schedule extraction prompt file not found")
         return None
 
     def get_prompt_template(self) -> str:
-        return self.prompt_template
+        return self._load_prompt()
 
     def get_extraction_type(self) -> str:
         return "schedule"
@@ -4,11 +4,11 @@ A cleaner, more maintainable version with separated concerns.
 """
 
 import os
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 import google.generativeai as genai
 from datetime import datetime
-import time
 import random
 
 # New modular imports
@@ -22,6 +22,8 @@ from .crisis_intervention import CrisisInterventionManager
 from ..memory.types import MemoryItem, MemoryContext
 from ..memory.config import Config
 from ..memory.memoryService import MemoryService
+from utils.llm_executor import llm_executor
+from utils.prompt_assembler import PromptSection, prompt_assembler
 
 logger = logging.getLogger(__name__)
 
@@ -91,14 +93,29 @@ class MentalHealthAssistant:
         )
 
     def _load_core_prompts(self, mode: str = "general"):
-        """Load core prompts from configuration for specific mode."""
-        self.system_prompt = Config.get_mental_health_system_prompt(mode)
-        self.conversation_guidelines = Config.get_conversation_guidelines(mode)
-        self.crisis_detection_prompt = Config.get_crisis_detection_prompt()
+        """Select the mode whose core prompts are used.
 
+        The prompts themselves are read through the prompt registry when
+        used, so edited prompt files take effect without a restart.
+        """
         # Store current mode for reference
         self.current_mode = mode
 
+    @property
+    def system_prompt(self) -> str:
+        """System prompt for the current mode."""
+        return Config.get_mental_health_system_prompt(self.current_mode)
+
+    @property
+    def conversation_guidelines(self) -> str:
+        """Conversation guidelines for the current mode."""
+        return Config.get_conversation_guidelines(self.current_mode)
+
+    @property
+    def crisis_detection_prompt(self) -> str:
+        """Crisis detection prompt."""
+        return Config.get_crisis_detection_prompt()
+
     def _initialize_extractors(self):
         """Initialize all the extraction modules."""
         # Schedule extraction
@@ -162,11 +179,13 @@ class MentalHealthAssistant:
         context = self._build_conversation_context(user_message, memory_context)
 
         # Generate the main response
-        response_prompt = self._build_response_prompt(context, user_message)
+        response_prompt = self._build_response_prompt(user_message, memory_context)
 
         try:
-            response = self.model.generate_content(
-                response_prompt, generation_config=self.conversational_config
+            response = await llm_executor.generate_content(
+                self.model,
+                response_prompt,
+                generation_config=self.conversational_config,
             )
 
             response_text = response.text.strip()
@@ -223,17 +242,49 @@ class MentalHealthAssistant:
             logger.error(f"Error in generate_response: {e}")
             return self._create_fallback_response(crisis_assessment, config_warning, e)
 
-    def _build_response_prompt(self, context: str, user_message: str) -> str:
-        """Build the prompt for response generation."""
+    def _build_response_prompt(
+        self, user_message: str, memory_context: Optional[MemoryContext] = None
+    ) -> str:
+        """Build the prompt for response generation within the token budget."""
+        parts = self._conversation_context_parts(memory_context)
+        assembled = prompt_assembler.assemble(
+            [
+                PromptSection("system", self.system_prompt, required=True),
+                PromptSection(
+                    "guidelines", self.conversation_guidelines, required=True
+                ),
+                PromptSection("message", user_message, required=True),
+                # Latest messages matter most; memories are ordered by relevance
+                PromptSection(
+                    "recent", parts["recent"], priority=1, keep="end", header_lines=1
+                ),
+                PromptSection(
+                    "background", parts["background"], priority=2, header_lines=1
+                ),
+                PromptSection("digest", parts["digest"], priority=3),
+            ],
+            mode=f"assistant:{self.current_mode}",
+        )
+        texts = assembled.texts
+
+        if not memory_context:
+            context = "This appears to be a new conversation."
+        else:
+            context = "\n\n".join(
+                texts[name]
+                for name in ("recent", "background", "digest")
+                if texts[name]
+            )
+
         return f"""
-{self.system_prompt}
+{texts["system"]}
 
-{self.conversation_guidelines}
+{texts["guidelines"]}
 
 CONVERSATION CONTEXT:
-{context}
+{context or "No previous context available."}
 
-USER MESSAGE: {user_message}
+USER MESSAGE: {texts["message"]}
 """
 
     async def _extract_all_metadata(
@@ -331,7 +382,8 @@ USER MESSAGE: {user_message}
 
         for attempt in range(max_retries + 1):
             try:
-                assessment_response = self.model.generate_content(
+                assessment_response = await llm_executor.generate_content(
+                    self.model,
                     self.crisis_detection_prompt.format(content=user_message),
                     generation_config=self.crisis_config,
                 )
@@ -389,7 +441,7 @@ USER MESSAGE: {user_message}
                 ):
                     if attempt < max_retries:
                         delay = base_delay * (2**attempt) + random.uniform(0, 1)
-                        time.sleep(delay)
+                        await asyncio.sleep(delay)
                         continue
                     else:
                         return {
@@ -436,8 +488,8 @@ Extract and return the following metadata in JSON format:
 """
 
         try:
-            metadata_response = self.model.generate_content(
-                metadata_prompt, generation_config=self.metadata_config
+            metadata_response = await llm_executor.generate_content(
+                self.model, metadata_prompt, generation_config=self.metadata_config
             )
             import json
 
@@ -478,30 +530,37 @@ Extract and return the following metadata in JSON format:
         if not memory_context:
             return "This appears to be a new conversation."
 
-        context_parts = []
+        parts = self._conversation_context_parts(memory_context)
+        context = "\n\n".join(part for part in parts.values() if part)
+        return context or "No previous context available."
+
+    def _conversation_context_parts(
+        self, memory_context: Optional[MemoryContext]
+    ) -> Dict[str, str]:
+        """Recent conversation, background memories and digest, as text blocks."""
+        parts = {"recent": "", "background": "", "digest": ""}
+        if not memory_context:
+            return parts
 
         # Add recent conversation context
         if memory_context.short_term:
-            recent_memories = memory_context.short_term[-3:]
-            context_parts.append("Recent conversation context:")
-            for memory in recent_memories:
-                context_parts.append(f"- {memory.content}")
+            parts["recent"] = "\n".join(
+                ["Recent conversation context:"]
+                + [f"- {memory.content}" for memory in memory_context.short_term[-3:]]
+            )
 
         # Add relevant long-term context
         if memory_context.long_term:
-            context_parts.append("\nRelevant background information:")
-            for memory in memory_context.long_term[:2]:
-                context_parts.append(f"- {memory.content}")
+            parts["background"] = "\n".join(
+                ["Relevant background information:"]
+                + [f"- {memory.content}" for memory in memory_context.long_term[:2]]
+            )
 
         # Add digest if available
         if memory_context.digest:
-            context_parts.append(f"\nOverall context: {memory_context.digest}")
+            parts["digest"] = f"Overall context: {memory_context.digest}"
 
-        return (
-            "\n".join(context_parts)
-            if context_parts
-            else "No previous context available."
-        )
+        return parts
 
     def _extract_resources(self, response_text: str) -> List[str]:
         """Extract mentioned resources from the response."""
@@ -28,6 +28,8 @@ class AuditLogger:
         self.MEMORY_ACCESSED = "memory_accessed"
         self.MEMORY_DELETED = "memory_deleted"
         self.MEMORY_CLEARED = "memory_cleared"
+        self.MEMORY_CONSOLIDATED = "memory_consolidated"
+        self.SCORING_PREFILTER = "scoring_prefilter"
         self.CONSENT_GRANTED = "consent_granted"
         self.CONSENT_REVOKED = "consent_revoked"
         self.PII_DETECTED = "pii_detected"
@@ -147,6 +149,28 @@ class AuditLogger:
             details={"query": query},
         )
 
+    async def log_memories_accessed(
+        self, user_id: str, memories: List[MemoryItem], query: str
+    ) -> None:
+        """Log one access event covering every memory a retrieval returned."""
+        await self.log_event(
+            event_type=self.MEMORY_ACCESSED,
+            user_id=user_id,
+            details={
+                "query": query,
+                "memory_count": len(memories),
+                "memories": [
+                    {
+                        "id": memory.id,
+                        "type": memory.type,
+                        "has_pii": memory.metadata.get("has_pii", False),
+                        "sensitive_types": memory.metadata.get("sensitive_types", []),
+                    }
+                    for memory in memories
+                ],
+            },
+        )
+
     async def log_memory_deleted(self, user_id: str, memory: MemoryItem) -> None:
         """Log memory deletion event."""
         await self.log_event(
@@ -159,6 +183,35 @@ class AuditLogger:
             event_type=self.MEMORY_CLEARED, user_id=user_id, details={"count": count}
         )
 
+    async def log_memories_consolidated(
+        self, user_id: str, memory: MemoryItem, retired_ids: List[str]
+    ) -> None:
+        """Log memories being replaced by one consolidated memory."""
+        await self.log_event(
+            event_type=self.MEMORY_CONSOLIDATED,
+            user_id=user_id,
+            memory=memory,
+            details={"retired_count": len(retired_ids), "retired_ids": retired_ids},
+        )
+
+    async def log_scoring_prefilter(
+        self,
+        user_id: str,
+        decision: Dict[str, Any],
+        memory_category: str,
+        label_source: str,
+    ) -> None:
+        """Log a scoring pre-filter decision (features only, never content)."""
+        await self.log_event(
+            event_type=self.SCORING_PREFILTER,
+            user_id=user_id,
+            details={
+                **decision,
+                "memory_category": memory_category,
+                "label_source": label_source,
+            },
+        )
+
     async def log_consent_granted(
         self, user_id: str, memory: MemoryItem, sensitive_types: List[str]
     ) -> None:
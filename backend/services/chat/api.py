@@ -29,6 +29,8 @@ from .user_integration import ChatUserIntegration
 # Memory service integration
 from ..memory.memoryService import MemoryService
 from ..memory.types import MemoryItem as ChatMemoryItem
+from ..memory.config import Config as MemoryConfig
+from ..memory.ingestion import memory_ingestion_queue
 
 # Multi-modal chat service integration
 from .multi_modal_chat import MultiModalChatService
@@ -493,15 +495,26 @@ async def send_message(
         db.commit()
         db.refresh(assistant_message)
 
-        # Process message for memory extraction (background task)
+        # Queue message for memory extraction; process inline when the queue
+        # is disabled, unavailable or backed up
         memory_result = {}
         try:
-            memory_result = await memory_service.process_memory(
-                user_id=user_id,
-                content=request.content,
-                type="chat",
-                metadata={"conversation_id": request.conversation_id},
-            )
+            memory_metadata = {"conversation_id": request.conversation_id}
+            job_id = None
+            if MemoryConfig.MEMORY_INGESTION_ENABLED:
+                job_id = await memory_ingestion_queue.enqueue(
+                    user_id, request.content, type="chat", metadata=memory_metadata
+                )
+
+            if job_id:
+                memory_result = {"queued": True, "job_id": job_id, "stored": False}
+            else:
+                memory_result = await memory_service.process_memory(
+                    user_id=user_id,
+                    content=request.content,
+                    type="chat",
+                    metadata=memory_metadata,
+                )
         except Exception as e:
             logger.error(f"Memory processing failed: {str(e)}")
             memory_result = {"error": str(e), "stored": False}
@@ -19,10 +19,15 @@ from utils.redis_client import (
     cache_exists,
     get_redis_client,
 )
+from utils.single_flight import single_flight
 from ..memory.types import MemoryItem, MemoryContext
 
 logger = logging.getLogger(__name__)
 
+# Shared across CacheManager instances so the chat API and the background
+# processor coalesce their misses
+_fallback_flight = single_flight("cache_fallbacks")
+
 
 class CacheManager:
     """Multi-layered cache manager for chat service optimization."""
@@ -133,7 +138,8 @@ class CacheManager:
 
         # Cache miss - execute fallback function
         logger.debug(f"Cache miss for {cache_keys}, executing fallback")
-        try:
+
+        async def load():
             result = await fallback_func()
 
             # Cache the result in the primary cache key
@@ -142,6 +148,12 @@ class CacheManager:
 
             return result
 
+        try:
+            # Concurrent misses for the same keys share one fallback call
+            if cache_keys:
+                return await _fallback_flight.do((user_id, *cache_keys), load)
+            return await load()
+
         except Exception as e:
             logger.error(f"Fallback function failed: {e}")
             return None
@@ -24,6 +24,7 @@ from ...action_plans.service import ActionPlanService
 from .information_gatherer import InformationGatherer
 from .mode_detector import ModeDetector
 from utils.database import get_db
+from utils.llm_executor import llm_executor
 
 logger = logging.getLogger(__name__)
 
@@ -228,8 +229,8 @@ class BackgroundProcessor:
             # Use the loaded crisis detection prompt
             crisis_prompt = self.crisis_detection_prompt.format(content=message)
 
-            assessment_response = self.model.generate_content(
-                crisis_prompt, generation_config=self.crisis_config
+            assessment_response = await llm_executor.generate_content(
+                self.model, crisis_prompt, generation_config=self.crisis_config
             )
 
             assessment_text = assessment_response.text.strip()
@@ -4,11 +4,17 @@ Handles fast response generation with crisis detection.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 import google.generativeai as genai
 
+from utils.llm_executor import llm_executor
+from utils.prompt_assembler import PromptSection, prompt_assembler, truncate_to_tokens
+
 logger = logging.getLogger(__name__)
 
+# Per-message limit in minimal context (roughly the old 300 characters)
+MINIMAL_CONTEXT_MESSAGE_TOKENS = 75
+
 
 class ResponseGenerator:
     """Handles fast response generation for different chat modes."""
@@ -27,25 +33,13 @@ class ResponseGenerator:
         mode_guidelines: Dict[str, str],
     ) -> Dict[str, Any]:
         """Generate response optimized for speed."""
-        # Build mode-specific prompt
-        system_prompt = mode_prompts.get(mode, mode_prompts["general"])
-        guidelines = mode_guidelines.get(mode, mode_guidelines["general"])
-
-        prompt = f"""
-{system_prompt}
-
-{guidelines}
-
-CONTEXT: {context.get('context', 'New conversation')}
-
-USER MESSAGE: {message}
-
-Please provide a supportive, empathetic response. Focus on immediate emotional support.
-"""
+        prompt = self._build_prompt(
+            message, context, mode, mode_prompts, mode_guidelines
+        )
 
         try:
-            response = self.model.generate_content(
-                prompt, generation_config=self.generation_config
+            response = await llm_executor.generate_content(
+                self.model, prompt, generation_config=self.generation_config
             )
 
             response_text = response.text.strip()
@@ -68,6 +62,114 @@ Please provide a supportive, empathetic response. Focus on immediate emotional s
                 "needs_resources": False,
             }
 
+    async def stream_fast_response(
+        self,
+        user_id: str,
+        message: str,
+        context: Dict[str, Any],
+        mode: str,
+        mode_prompts: Dict[str, str],
+        mode_guidelines: Dict[str, str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a fast response as Gemini generates it.
+
+        The quick crisis check runs on the incoming message before generation
+        starts, so crisis flags reach the client ahead of the first token.
+
+        Yields:
+            {"type": "flags", "immediate_crisis": ...} first, then
+            {"type": "token", "text": ...} per chunk, then
+            {"type": "done", "response": ..., "needs_resources": ...,
+            "completed": ...}. If generation fails, "done" carries the
+            fallback or partial text with completed=False (after an "error"
+            event when tokens were already sent).
+        """
+        yield {"type": "flags", "immediate_crisis": self._quick_crisis_check(message)}
+
+        prompt = self._build_prompt(
+            message, context, mode, mode_prompts, mode_guidelines
+        )
+
+        parts = []
+        completed = False
+        try:
+            async for text in llm_executor.stream_content(
+                self.model, prompt, generation_config=self.generation_config
+            ):
+                parts.append(text)
+                yield {"type": "token", "text": text}
+            completed = True
+
+        except Exception as e:
+            logger.error(f"Error streaming fast response: {e}")
+            if not parts:
+                # Nothing sent yet; fall back to the same message as the
+                # non-streaming path
+                fallback = "I hear you and I'm here to support you. Let me take a moment to provide the best response."
+                parts.append(fallback)
+                yield {"type": "token", "text": fallback}
+            else:
+                yield {"type": "error", "error": str(e)}
+
+        response_text = "".join(parts).strip()
+        yield {
+            "type": "done",
+            "response": response_text,
+            "needs_resources": self._quick_resource_check(response_text),
+            "completed": completed,
+        }
+
+    def _build_prompt(
+        self,
+        message: str,
+        context: Dict[str, Any],
+        mode: str,
+        mode_prompts: Dict[str, str],
+        mode_guidelines: Dict[str, str],
+    ) -> str:
+        """Build the mode-specific fast response prompt within the token budget."""
+        context_text = context.get("context", "New conversation")
+        # Conversation context lists messages oldest first; keep the latest
+        conversational = context.get("type") in ("conversation", "database_recent")
+
+        assembled = prompt_assembler.assemble(
+            [
+                PromptSection(
+                    "system",
+                    mode_prompts.get(mode, mode_prompts["general"]),
+                    required=True,
+                ),
+                PromptSection(
+                    "guidelines",
+                    mode_guidelines.get(mode, mode_guidelines["general"]),
+                    required=True,
+                ),
+                PromptSection("message", message, required=True),
+                PromptSection(
+                    "context",
+                    context_text,
+                    priority=1,
+                    keep="end" if conversational else "start",
+                    header_lines=1 if "\n" in context_text else 0,
+                ),
+            ],
+            mode=f"chat:{mode}",
+        )
+        texts = assembled.texts
+
+        return f"""
+{texts["system"]}
+
+{texts["guidelines"]}
+
+CONTEXT: {texts["context"] or "New conversation"}
+
+USER MESSAGE: {texts["message"]}
+
+Please provide a supportive, empathetic response. Focus on immediate emotional support.
+"""
+
     def _quick_crisis_check(self, message: str) -> bool:
         """Quick crisis detection using simple keywords."""
         crisis_keywords = [
@@ -104,8 +206,7 @@ Please provide a supportive, empathetic response. Focus on immediate emotional s
                 role = getattr(msg, "role", "unknown")
 
             # Truncate long messages but keep meaningful content
-            if len(content) > 300:
-                content = content[:280] + "..."
+            content = truncate_to_tokens(content, MINIMAL_CONTEXT_MESSAGE_TOKENS)
 
             # Format based on role
             if role == "user":
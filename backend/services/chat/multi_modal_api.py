@@ -5,13 +5,17 @@ Integrates with all existing Nura services.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+import json
 import logging
 
 # Import authentication
 from utils.auth import get_current_user_id
+from utils.prompt_assembler import prompt_assembler
+from utils.prompts.registry import prompt_registry
 
 # Import the service
 from .multi_modal_chat import MultiModalChatService
@@ -144,6 +148,45 @@ async def send_fast_message(
         )
 
 
+@router.post("/messages/fast/stream")
+async def stream_fast_message(
+    request: FastMessageRequest,
+    user_id: str = Depends(get_current_user_id),
+) -> StreamingResponse:
+    """
+    Streaming variant of /messages/fast, as server-sent events.
+
+    Events, each with a JSON data payload:
+    - start: mode, background_task_id and the immediate crisis flag, sent
+      before the first token
+    - token: a chunk of response text, as Gemini generates it
+    - error: generation failed (after a start event) or the message could
+      not be processed at all
+    - done: the full response, timings and resource flag; when
+      conversation_id belongs to the user, the message and response have been
+      saved to it
+
+    Use /background-results/{task_id} to get comprehensive results.
+    """
+    logger.info(f"Streaming message request from user {user_id}: mode={request.mode}")
+
+    async def events():
+        async for event in multi_modal_service.stream_message(
+            user_id=user_id,
+            message=request.message,
+            conversation_id=request.conversation_id,
+            mode=request.mode,
+        ):
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/background-results/{task_id}", response_model=BackgroundResultsResponse)
 async def get_background_results(
     task_id: str,
@@ -540,6 +583,12 @@ async def get_performance_metrics(
                 "cache": cache_metrics,
                 "user_cache": user_cache_stats,
                 "memory": memory_stats,
+                "embedding_cache": memory_service.vector_store.embedding_cache.get_stats(),
+                "prompt_sizes": prompt_assembler.get_stats(),
+                "prompts": {
+                    **prompt_registry.get_stats(),
+                    "versions": prompt_registry.versions(),
+                },
             },
             "system_targets": {
                 "response_time_target_ms": "50-200",
@@ -4,9 +4,10 @@ Integrates with existing Nura services for ultra-fast responses with background
 """
 
 import os
+import uuid
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from datetime import datetime
 import google.generativeai as genai
 
@@ -87,32 +88,22 @@ class MultiModalChatService:
         )
 
     def _load_mode_prompts(self):
-        """Load mode-specific system prompts and guidelines using the prompt loader."""
-        try:
-            # Load system prompts for each mode
-            self.mode_prompts = {
-                "general": self.prompt_loader.get_system_prompt("general"),
-                "action_plan": self.prompt_loader.get_system_prompt("action_plan"),
-                "visualization": self.prompt_loader.get_system_prompt("visualization"),
-            }
+        """Check that the mode-specific prompts load, and bind the crisis prompt.
 
-            # Load conversation guidelines for each mode
-            self.mode_guidelines = {
-                "general": self.prompt_loader.get_conversation_guidelines("general"),
-                "action_plan": self.prompt_loader.get_conversation_guidelines(
-                    "action_plan"
-                ),
-                "visualization": self.prompt_loader.get_conversation_guidelines(
-                    "visualization"
-                ),
-            }
+        Mode prompts and guidelines are read through the prompt registry on
+        each request (see mode_prompts), so edited prompt files take effect
+        without a restart.
+        """
+        try:
+            # Read every mode's prompts once so missing files fail at startup
+            loaded = len(self.mode_prompts) + len(self.mode_guidelines)
 
             # Load crisis detection prompt
             self.crisis_detection_prompt = (
                 self.prompt_loader.get_crisis_detection_prompt()
             )
 
-            logger.info("Successfully loaded all mode-specific prompts")
+            logger.info(f"Successfully loaded {loaded} mode-specific prompts")
 
         except Exception as e:
             logger.error(f"CRITICAL: Failed to load essential prompts: {e}")
@@ -121,6 +112,28 @@ class MultiModalChatService:
                 f"Check that prompt files exist in backend/utils/prompts/chat/. Error: {e}"
             )
 
+    @property
+    def mode_prompts(self) -> Dict[str, str]:
+        """System prompt for each mode."""
+        return {
+            "general": self.prompt_loader.get_system_prompt("general"),
+            "action_plan": self.prompt_loader.get_system_prompt("action_plan"),
+            "visualization": self.prompt_loader.get_system_prompt("visualization"),
+        }
+
+    @property
+    def mode_guidelines(self) -> Dict[str, str]:
+        """Conversation guidelines for each mode."""
+        return {
+            "general": self.prompt_loader.get_conversation_guidelines("general"),
+            "action_plan": self.prompt_loader.get_conversation_guidelines(
+                "action_plan"
+            ),
+            "visualization": self.prompt_loader.get_conversation_guidelines(
+                "visualization"
+            ),
+        }
+
     def _initialize_services(self):
         """Initialize all existing Nura services."""
         # Memory service
@@ -219,26 +232,8 @@ class MultiModalChatService:
             )
 
             # Start background processing (don't await)
-            background_task_id = f"bg_{user_id}_{datetime.utcnow().timestamp()}"
-
-            # Immediately cache a pending status to avoid 404s on initial polls
-            pending_result = {
-                "task_id": background_task_id,
-                "user_id": user_id,
-                "mode": mode,
-                "started_at": datetime.utcnow().isoformat(),
-                "status": "processing",
-                "tasks": {},
-                "completed_at": None,
-            }
-            await self.cache_manager.cache_background_results(
-                background_task_id, pending_result
-            )
-
-            asyncio.create_task(
-                self.background_processor.process_background_tasks(
-                    user_id, message, conversation_id, mode, background_task_id, context
-                )
+            background_task_id = await self._start_background_processing(
+                user_id, message, conversation_id, mode, context
             )
 
             # Calculate response time
@@ -270,6 +265,229 @@ class MultiModalChatService:
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
+    async def stream_message(
+        self,
+        user_id: str,
+        message: str,
+        conversation_id: Optional[str] = None,
+        mode: str = "general",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a message, streaming the response as it is generated.
+
+        Args:
+            user_id: User identifier
+            message: User's message
+            conversation_id: Optional conversation ID; when it belongs to the
+                user, the message and the full response are saved to it once
+                the stream completes (a failed or partial response is not
+                saved)
+            mode: Chat mode (general, action_plan, visualization)
+
+        Yields:
+            A "start" event (mode, background task ID, crisis flag), "token"
+            events, then a "done" event with the full response and timings
+        """
+        start_time = datetime.utcnow()
+
+        try:
+            if mode == "general":
+                mode = await self.mode_detector.detect_mode(message)
+
+            context = await self._get_fast_context(user_id, message, conversation_id)
+            background_task_id = await self._start_background_processing(
+                user_id, message, conversation_id, mode, context
+            )
+        except Exception as e:
+            logger.error(f"Error preparing streamed message for user {user_id}: {e}")
+            yield {
+                "type": "error",
+                "error": str(e),
+                "response": "I'm here to support you, but I'm having technical difficulties. If you're in crisis, please reach out to emergency services immediately.",
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            return
+
+        immediate_crisis = False
+        first_token_ms = None
+
+        async for event in self.response_generator.stream_fast_response(
+            user_id, message, context, mode, self.mode_prompts, self.mode_guidelines
+        ):
+            if event["type"] == "flags":
+                immediate_crisis = event["immediate_crisis"]
+                yield {
+                    "type": "start",
+                    "mode": mode,
+                    "conversation_id": conversation_id,
+                    "background_task_id": background_task_id,
+                    "cache_performance": {
+                        "context_cached": context.get("from_cache", False),
+                        "crisis_cached": False,
+                    },
+                    "immediate_flags": {"crisis_detected": immediate_crisis},
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+
+            elif event["type"] == "token":
+                if first_token_ms is None:
+                    first_token_ms = (
+                        datetime.utcnow() - start_time
+                    ).total_seconds() * 1000
+                yield event
+
+            elif event["type"] == "error":
+                yield event
+
+            elif event["type"] == "done":
+                saved = None
+                if event["completed"]:
+                    saved = await self._save_exchange(
+                        user_id, conversation_id, message, event["response"]
+                    )
+                yield {
+                    "type": "done",
+                    "response": event["response"],
+                    "mode": mode,
+                    "conversation_id": conversation_id,
+                    "background_task_id": background_task_id,
+                    "first_token_ms": first_token_ms,
+                    "response_time_ms": (datetime.utcnow() - start_time).total_seconds()
+                    * 1000,
+                    "immediate_flags": {
+                        "crisis_detected": immediate_crisis,
+                        "needs_resources": event["needs_resources"],
+                    },
+                    "completed": event["completed"],
+                    "saved_messages": saved,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+
+    async def _start_background_processing(
+        self,
+        user_id: str,
+        message: str,
+        conversation_id: Optional[str],
+        mode: str,
+        context: Dict[str, Any],
+    ) -> str:
+        """Start background processing for a message and return its task ID."""
+        background_task_id = f"bg_{user_id}_{datetime.utcnow().timestamp()}"
+
+        # Immediately cache a pending status to avoid 404s on initial polls
+        pending_result = {
+            "task_id": background_task_id,
+            "user_id": user_id,
+            "mode": mode,
+            "started_at": datetime.utcnow().isoformat(),
+            "status": "processing",
+            "tasks": {},
+            "completed_at": None,
+        }
+        await self.cache_manager.cache_background_results(
+            background_task_id, pending_result
+        )
+
+        asyncio.create_task(
+            self.background_processor.process_background_tasks(
+                user_id, message, conversation_id, mode, background_task_id, context
+            )
+        )
+        return background_task_id
+
+    async def _save_exchange(
+        self,
+        user_id: str,
+        conversation_id: Optional[str],
+        message: str,
+        response_text: str,
+    ) -> Optional[Dict[str, str]]:
+        """
+        Save a message and its response to the user's conversation.
+
+        Returns:
+            IDs of the saved user and assistant messages, or None when there
+            is no conversation to save to
+        """
+        if not conversation_id or not response_text:
+            return None
+
+        try:
+            saved = await asyncio.to_thread(
+                self._save_exchange_sync,
+                user_id,
+                conversation_id,
+                message,
+                response_text,
+            )
+            if saved:
+                await self.cache_manager.clear_conversation_cache(conversation_id)
+            return saved
+
+        except Exception as e:
+            logger.error(
+                f"Failed to save streamed exchange for conversation {conversation_id}: {e}"
+            )
+            return None
+
+    def _save_exchange_sync(
+        self, user_id: str, conversation_id: str, message: str, response_text: str
+    ) -> Optional[Dict[str, str]]:
+        """Write the exchange in one transaction (runs in a worker thread)."""
+        # Import here to avoid circular imports
+        from .database import get_db
+        from models import Conversation, Message
+
+        db_gen = get_db()
+        db = next(db_gen)
+
+        try:
+            conversation = (
+                db.query(Conversation)
+                .filter(
+                    Conversation.id == conversation_id,
+                    Conversation.user_id == user_id,
+                )
+                .first()
+            )
+            if not conversation:
+                logger.warning(
+                    f"Not saving streamed exchange: conversation {conversation_id} "
+                    f"not found for user {user_id}"
+                )
+                return None
+
+            user_message = Message(
+                id=str(uuid.uuid4()),
+                conversation_id=conversation_id,
+                user_id=user_id,
+                content=message,
+                role="user",
+                message_type="chat",
+            )
+            assistant_message = Message(
+                id=str(uuid.uuid4()),
+                conversation_id=conversation_id,
+                user_id=user_id,
+                content=response_text,
+                role="assistant",
+                message_type="response",
+            )
+            db.add_all([user_message, assistant_message])
+            conversation.updated_at = datetime.utcnow()
+            db.commit()
+
+            return {
+                "user_message_id": user_message.id,
+                "assistant_message_id": assistant_message.id,
+            }
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
     async def _get_fast_context(
         self, user_id: str, message: str, conversation_id: Optional[str]
     ) -> Dict[str, Any]:
@@ -3,7 +3,6 @@ Main emotion visualizer that orchestrates the entire process of converting
 user emotions and ideas into visual representations.
 """
 
-import asyncio
 import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -14,6 +13,7 @@ from ..memory.storage.redis_store import RedisStore
 from ..memory.storage.vector_store import VectorStore
 from models import GeneratedImage
 from utils.database import get_db
+from utils.llm_executor import llm_executor
 
 
 class EmotionVisualizer:
@@ -165,8 +165,8 @@ class EmotionVisualizer:
                 formatted_prompt
                 + "\n\nAdditionally, provide a short, descriptive name for this image (max 6 words) on a new line starting with 'Name: '."
             )
-            response = await asyncio.to_thread(
-                self.llm_client.model.generate_content,
+            response = await llm_executor.generate_content(
+                self.llm_client.model,
                 prompt_with_name,
                 generation_config=self.llm_client.metadata_config,
             )
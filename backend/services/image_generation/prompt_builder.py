@@ -6,8 +6,8 @@ from various memory sources and builds comprehensive prompts.
 import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-import os
 
+from utils.prompts.registry import prompt_registry
 from ..memory.memoryService import MemoryService
 
 
@@ -38,14 +38,17 @@ class PromptBuilder:
             Dictionary containing all relevant context for prompt generation
         """
 
-        # Create query for relevant memories
-        query = current_input
-        if identified_emotion:
-            query = f"{current_input} (emotion: {identified_emotion})"
+        # Search memories for the input and, in the same batch, the emotion
+        query = current_input if include_long_term else None
+        queries = (
+            [f"feeling {identified_emotion}"]
+            if include_long_term and identified_emotion
+            else None
+        )
 
         # Use centralized memory service to get context
         memory_context = await self.memory_service.get_memory_context(
-            user_id, query if include_long_term else None
+            user_id, query, queries=queries
         )
 
         # Format context for prompt generation
@@ -59,8 +62,9 @@ class PromptBuilder:
         # Get emotional anchors specifically
         emotional_anchors = ""
         if identified_emotion or include_long_term:
+            # Only the newest few anchors are used in the prompt
             emotional_anchor_memories = await self.memory_service.get_emotional_anchors(
-                user_id
+                user_id, limit=3
             )
             emotional_anchors = self._format_emotional_anchors(
                 emotional_anchor_memories, identified_emotion
@@ -293,20 +297,8 @@ class PromptBuilder:
     def format_prompt_template(self, context: Dict[str, Any]) -> str:
         """Format the context into the prompt template."""
 
-        # Updated to use the centralized chat prompts directory
-        prompt_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "..",
-            "utils",
-            "prompts",
-            "chat",
-            "photo_generation.txt",
-        )
-        with open(prompt_path, "r") as f:
-            template = f.read()
-
-        return template.format(
+        return prompt_registry.render(
+            "chat/photo_generation.txt",
             input_context=context["input_context"],
             short_term_context=context["short_term_context"],
             emotional_anchors=context["emotional_anchors"],
@@ -7,6 +7,7 @@ This is the MAIN memory API for the integrated Nura application.
 """
 
 from fastapi import APIRouter, HTTPException, Query, Body, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import logging
@@ -14,6 +15,8 @@ from dataclasses import asdict
 
 # Import services (now local to this service)
 from .memoryService import MemoryService
+from .consolidation import memory_consolidator
+from .ingestion import memory_ingestion_queue
 from .types import MemoryItem, MemoryContext, MemoryStats
 
 # Import unified authentication system
@@ -194,6 +197,28 @@ async def get_memory_stats(user_id: str = Depends(get_current_user_id)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/consolidation")
+async def get_consolidation_status(user_id: str = Depends(get_current_user_id)):
+    """Get long-term memory consolidation progress for a user. User authenticated via JWT."""
+    try:
+        return {"user": await memory_consolidator.get_user_status(user_id)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/ingestion/{job_id}")
+async def get_ingestion_job(job_id: str, user_id: str = Depends(get_current_user_id)):
+    """Get the processing status of a queued memory. User authenticated via JWT."""
+    try:
+        status = await memory_ingestion_queue.get_job_status(user_id, job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if status is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return status
+
+
 @router.delete("/{memory_id}")
 async def delete_memory(memory_id: str, user_id: str = Depends(get_current_user_id)):
     """Delete a specific memory. User authenticated via JWT."""
@@ -218,24 +243,10 @@ async def delete_multiple_memories(
 ):
     """Delete multiple memories in batch. User authenticated via JWT."""
     try:
-        deleted_count = 0
-        failed_count = 0
-        results = []
-
-        for memory_id in request.memory_ids:
-            try:
-                success = await memory_service.delete_memory(user_id, memory_id)
-                if success:
-                    deleted_count += 1
-                    results.append({"memory_id": memory_id, "status": "deleted"})
-                else:
-                    failed_count += 1
-                    results.append({"memory_id": memory_id, "status": "not_found"})
-            except Exception as e:
-                failed_count += 1
-                results.append(
-                    {"memory_id": memory_id, "status": "error", "error": str(e)}
-                )
+        batch_result = await memory_service.delete_memories(user_id, request.memory_ids)
+        results = batch_result["results"]
+        deleted_count = batch_result["deleted"]
+        failed_count = len(request.memory_ids) - deleted_count
 
         return {
             "message": f"Batch delete completed: {deleted_count} deleted, {failed_count} failed",
@@ -274,13 +285,30 @@ async def bulk_update_memories(
         success_count = 0
         failed_count = 0
 
+        # Run every delete in one bulk call
+        delete_ids = [
+            operation.memory_id
+            for operation in request.operations
+            if operation.action == "delete"
+        ]
+        deleted_statuses = {}
+        if delete_ids:
+            try:
+                delete_result = await memory_service.delete_memories(
+                    user_id, delete_ids
+                )
+                deleted_statuses = {
+                    result["memory_id"]: result["status"]
+                    for result in delete_result["results"]
+                }
+            except Exception as e:
+                deleted_statuses = {memory_id: str(e) for memory_id in delete_ids}
+
         for operation in request.operations:
             try:
                 if operation.action == "delete":
-                    success = await memory_service.delete_memory(
-                        user_id, operation.memory_id
-                    )
-                    if success:
+                    status = deleted_statuses.get(operation.memory_id)
+                    if status == "deleted":
                         success_count += 1
                         results.append(
                             {
@@ -289,7 +317,7 @@ async def bulk_update_memories(
                                 "status": "success",
                             }
                         )
-                    else:
+                    elif status == "not_found":
                         failed_count += 1
                         results.append(
                             {
@@ -298,6 +326,8 @@ async def bulk_update_memories(
                                 "status": "not_found",
                             }
                         )
+                    else:
+                        raise RuntimeError(status)
                 elif operation.action == "update":
                     # For now, just return success - would need to implement update logic
                     success_count += 1
@@ -397,14 +427,36 @@ async def handle_consent(
 
 
 @router.post("/export")
-async def export_memories(user_id: str = Depends(get_current_user_id)):
-    """Export all memories for the authenticated user. User authenticated via JWT."""
+async def export_memories(
+    memory_ids: Optional[List[str]] = Body(
+        None, embed=True, description="Export only these memories (default: all)"
+    ),
+    gzip: bool = Query(False, description="Gzip-compress the export"),
+    user_id: str = Depends(get_current_user_id),
+):
+    """Stream the authenticated user's memories as NDJSON. User authenticated via JWT."""
+    chunks = memory_service.stream_user_data(
+        user_id, memory_ids=memory_ids, compress=gzip
+    )
     try:
-        memories = await memory_service.export_memories(user_id)
-        return {"memories": memories, "total": len(memories)}
+        # Read the first chunk before responding, so store errors are a 500
+        # rather than a 200 with a truncated body
+        first_chunk = await chunks.__anext__()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def body():
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    filename = "memories.ndjson.gz" if gzip else "memories.ndjson"
+    return StreamingResponse(
+        body(),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
 @router.post("/dual-storage", response_model=DualStorageMemoryResponse)
 async def process_memory_dual_storage(
@@ -56,15 +56,199 @@ class Config:
     PINECONE_INDEX_NAME: str = os.getenv("PINECONE_INDEX_NAME", "nura-memories")
     USE_PINECONE: bool = os.getenv("USE_PINECONE", "false").lower() == "true"
 
-    # Vector database selection (pinecone or chroma)
+    # Vector database selection (pinecone, chroma or local)
     VECTOR_DB_TYPE: str = os.getenv("VECTOR_DB_TYPE", "chroma").lower()
 
+    # Local ANN index configuration (VECTOR_DB_TYPE=local)
+    LOCAL_VECTOR_DIR: str = os.getenv("LOCAL_VECTOR_DIR", "./local_vectors")
+    LOCAL_VECTOR_MAX_LOADED_USERS: int = int(
+        os.getenv("LOCAL_VECTOR_MAX_LOADED_USERS", "256")
+    )
+
     # Model configuration
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "models/gemini-2.0-flash")
     GEMINI_EMBEDDING_MODEL: str = os.getenv(
         "GEMINI_EMBEDDING_MODEL", "models/gemini-2.0-flash"
     )
 
+    # Memories classified per Gemini request by GeminiScorer.score_memories
+    MEMORY_SCORING_BATCH_SIZE: int = int(os.getenv("MEMORY_SCORING_BATCH_SIZE", "10"))
+
+    # Scoring cache (in-process LRU entries, Redis TTL in seconds)
+    SCORING_CACHE_ENABLED: bool = (
+        os.getenv("SCORING_CACHE_ENABLED", "true").lower() == "true"
+    )
+    SCORING_CACHE_SIZE: int = int(os.getenv("SCORING_CACHE_SIZE", "5000"))
+    SCORING_CACHE_TTL_SECONDS: int = int(
+        os.getenv("SCORING_CACHE_TTL_SECONDS", "604800")
+    )
+
+    # Local pre-filter that skips Gemini scoring for obviously short-term chat
+    # messages (probability threshold; optional JSON weights refitted offline)
+    SCORING_PREFILTER_ENABLED: bool = (
+        os.getenv("SCORING_PREFILTER_ENABLED", "true").lower() == "true"
+    )
+    SCORING_PREFILTER_THRESHOLD: float = float(
+        os.getenv("SCORING_PREFILTER_THRESHOLD", "0.9")
+    )
+    SCORING_PREFILTER_WEIGHTS_FILE: str = os.getenv(
+        "SCORING_PREFILTER_WEIGHTS_FILE", ""
+    )
+
+    # Embedding configuration
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "models/embedding-001")
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+    EMBEDDING_MAX_CONCURRENCY: int = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "5000"))
+    EMBEDDING_CACHE_TTL_SECONDS: int = int(
+        os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "604800")
+    )
+
+    # Hybrid (lexical + vector) retrieval configuration
+    HYBRID_SEARCH_ENABLED: bool = (
+        os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
+    )
+    HYBRID_LEXICAL_K: int = int(os.getenv("HYBRID_LEXICAL_K", "20"))
+    HYBRID_VECTOR_K: int = int(os.getenv("HYBRID_VECTOR_K", "20"))
+    HYBRID_LEXICAL_WEIGHT: float = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "1.0"))
+    HYBRID_VECTOR_WEIGHT: float = float(os.getenv("HYBRID_VECTOR_WEIGHT", "1.0"))
+    HYBRID_RRF_K: int = int(os.getenv("HYBRID_RRF_K", "60"))
+    # Skip the vector search when enough lexical hits cover this share of query terms
+    HYBRID_LEXICAL_ONLY_COVERAGE: float = float(
+        os.getenv("HYBRID_LEXICAL_ONLY_COVERAGE", "1.0")
+    )
+    HYBRID_RECENCY_HALF_LIFE_DAYS: float = float(
+        os.getenv("HYBRID_RECENCY_HALF_LIFE_DAYS", "30")
+    )
+    HYBRID_RECENCY_WEIGHT: float = float(os.getenv("HYBRID_RECENCY_WEIGHT", "0.2"))
+    HYBRID_ANCHOR_BOOST: float = float(os.getenv("HYBRID_ANCHOR_BOOST", "0.3"))
+    HYBRID_STABILITY_WEIGHT: float = float(
+        os.getenv("HYBRID_STABILITY_WEIGHT", "0.2")
+    )
+    LEXICAL_MAX_QUERY_TERMS: int = int(os.getenv("LEXICAL_MAX_QUERY_TERMS", "16"))
+
+    # Memory stats reconciliation (recounts incremental counters to fix drift)
+    MEMORY_STATS_RECONCILE_ENABLED: bool = (
+        os.getenv("MEMORY_STATS_RECONCILE_ENABLED", "true").lower() == "true"
+    )
+    MEMORY_STATS_RECONCILE_INTERVAL_SECONDS: int = int(
+        os.getenv("MEMORY_STATS_RECONCILE_INTERVAL_SECONDS", "3600")
+    )
+    MEMORY_STATS_RECONCILE_CHECK_SECONDS: int = int(
+        os.getenv("MEMORY_STATS_RECONCILE_CHECK_SECONDS", "60")
+    )
+    MEMORY_STATS_RECONCILE_BATCH_SIZE: int = int(
+        os.getenv("MEMORY_STATS_RECONCILE_BATCH_SIZE", "50")
+    )
+
+    # Memory context cache (reused until a memory write bumps the version)
+    MEMORY_CONTEXT_CACHE_ENABLED: bool = (
+        os.getenv("MEMORY_CONTEXT_CACHE_ENABLED", "true").lower() == "true"
+    )
+    MEMORY_CONTEXT_CACHE_TTL_SECONDS: int = int(
+        os.getenv("MEMORY_CONTEXT_CACHE_TTL_SECONDS", "900")
+    )
+
+    # Semantic query cache (reuses search results for paraphrased queries
+    # until a memory write bumps the version)
+    SEMANTIC_QUERY_CACHE_ENABLED: bool = (
+        os.getenv("SEMANTIC_QUERY_CACHE_ENABLED", "true").lower() == "true"
+    )
+    SEMANTIC_QUERY_CACHE_THRESHOLD: float = float(
+        os.getenv("SEMANTIC_QUERY_CACHE_THRESHOLD", "0.95")
+    )
+    SEMANTIC_QUERY_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("SEMANTIC_QUERY_CACHE_MAX_ENTRIES", "16")
+    )
+    SEMANTIC_QUERY_CACHE_TTL_SECONDS: int = int(
+        os.getenv("SEMANTIC_QUERY_CACHE_TTL_SECONDS", "900")
+    )
+
+    # Embedding precision (float32, float16 or int8) for the in-process
+    # embedding cache (used for queries; stored vectors are always exact
+    # float32) and for newly created local vector indexes
+    EMBEDDING_CACHE_DTYPE: str = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+    LOCAL_VECTOR_DTYPE: str = os.getenv("LOCAL_VECTOR_DTYPE", "float32")
+
+    # Near-duplicate suppression before long-term storage (SimHash Hamming
+    # distance out of 64 bits, optional embedding cosine confirmation, and
+    # the action for confirmed duplicates: merge, refresh or skip)
+    MEMORY_DEDUP_ENABLED: bool = (
+        os.getenv("MEMORY_DEDUP_ENABLED", "true").lower() == "true"
+    )
+    MEMORY_DEDUP_MAX_DISTANCE: int = int(os.getenv("MEMORY_DEDUP_MAX_DISTANCE", "3"))
+    MEMORY_DEDUP_COSINE_CHECK: bool = (
+        os.getenv("MEMORY_DEDUP_COSINE_CHECK", "true").lower() == "true"
+    )
+    MEMORY_DEDUP_COSINE_THRESHOLD: float = float(
+        os.getenv("MEMORY_DEDUP_COSINE_THRESHOLD", "0.92")
+    )
+    MEMORY_DEDUP_ACTION: str = os.getenv("MEMORY_DEDUP_ACTION", "merge").lower()
+
+    # Long-term memory consolidation (clusters older memories of users with
+    # large stores into summary memories; emotional anchors are never touched)
+    MEMORY_CONSOLIDATION_ENABLED: bool = (
+        os.getenv("MEMORY_CONSOLIDATION_ENABLED", "false").lower() == "true"
+    )
+    MEMORY_CONSOLIDATION_INTERVAL_SECONDS: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_INTERVAL_SECONDS", "86400")
+    )
+    MEMORY_CONSOLIDATION_CHECK_SECONDS: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_CHECK_SECONDS", "300")
+    )
+    MEMORY_CONSOLIDATION_BATCH_SIZE: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_BATCH_SIZE", "20")
+    )
+    MEMORY_CONSOLIDATION_MIN_MEMORIES: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_MIN_MEMORIES", "200")
+    )
+    MEMORY_CONSOLIDATION_MIN_AGE_DAYS: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_MIN_AGE_DAYS", "30")
+    )
+    MEMORY_CONSOLIDATION_MAX_MEMORIES_PER_RUN: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_MAX_MEMORIES_PER_RUN", "500")
+    )
+    MEMORY_CONSOLIDATION_SIMILARITY: float = float(
+        os.getenv("MEMORY_CONSOLIDATION_SIMILARITY", "0.8")
+    )
+    MEMORY_CONSOLIDATION_MIN_CLUSTER_SIZE: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_MIN_CLUSTER_SIZE", "3")
+    )
+    MEMORY_CONSOLIDATION_MAX_CLUSTER_SIZE: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_MAX_CLUSTER_SIZE", "10")
+    )
+    MEMORY_CONSOLIDATION_SUMMARIES_PER_MINUTE: int = int(
+        os.getenv("MEMORY_CONSOLIDATION_SUMMARIES_PER_MINUTE", "30")
+    )
+
+    # Write-behind ingestion (chat messages are queued on Redis streams and
+    # processed by a worker pool; ordering is kept per user)
+    MEMORY_INGESTION_ENABLED: bool = (
+        os.getenv("MEMORY_INGESTION_ENABLED", "true").lower() == "true"
+    )
+    MEMORY_INGESTION_WORKERS: int = int(os.getenv("MEMORY_INGESTION_WORKERS", "4"))
+    MEMORY_INGESTION_PARTITIONS: int = int(
+        os.getenv("MEMORY_INGESTION_PARTITIONS", "16")
+    )
+    MEMORY_INGESTION_BATCH_SIZE: int = int(
+        os.getenv("MEMORY_INGESTION_BATCH_SIZE", "10")
+    )
+    MEMORY_INGESTION_MAX_BACKLOG: int = int(
+        os.getenv("MEMORY_INGESTION_MAX_BACKLOG", "500")
+    )
+    MEMORY_INGESTION_MAX_ATTEMPTS: int = int(
+        os.getenv("MEMORY_INGESTION_MAX_ATTEMPTS", "5")
+    )
+    MEMORY_INGESTION_RETRY_SECONDS: float = float(
+        os.getenv("MEMORY_INGESTION_RETRY_SECONDS", "2")
+    )
+    MEMORY_INGESTION_POLL_SECONDS: float = float(
+        os.getenv("MEMORY_INGESTION_POLL_SECONDS", "0.5")
+    )
+    MEMORY_INGESTION_JOB_TTL_SECONDS: int = int(
+        os.getenv("MEMORY_INGESTION_JOB_TTL_SECONDS", "86400")
+    )
+
     # Service configuration
     SHORT_TERM_MEMORY_SIZE: int = int(os.getenv("SHORT_TERM_MEMORY_SIZE", "100"))
     LONG_TERM_MEMORY_SIZE: int = int(os.getenv("LONG_TERM_MEMORY_SIZE", "1000"))
@@ -131,6 +315,19 @@ class Config:
             logger.error(f"Failed to load memory scoring prompt: {e}")
             return "⚠️ CONFIGURATION ERROR: Comprehensive memory scoring not configured."
 
+    @classmethod
+    def get_memory_batch_scoring_prompt(cls) -> str:
+        """Get the batch memory scoring prompt from file."""
+        try:
+            from utils.prompts.chat.prompt_loader import (
+                get_memory_batch_scoring_prompt,
+            )
+
+            return get_memory_batch_scoring_prompt()
+        except Exception as e:
+            logger.error(f"Failed to load batch memory scoring prompt: {e}")
+            return "⚠️ CONFIGURATION ERROR: Batch memory scoring not configured."
+
     @classmethod
     def validate(cls) -> None:
         """Validate required configuration values."""
@@ -0,0 +1,564 @@
+"""
+Long-term memory consolidation.
+
+Keeps long-tenured users' long-term stores bounded. For users with at least
+MEMORY_CONSOLIDATION_MIN_MEMORIES memories, older memories are clustered by
+embedding similarity and each cluster is replaced by one summary memory
+written by Gemini. Emotional anchors and earlier summaries are never touched.
+
+A user's run is planned up front and the plan is kept in Redis
+(user:{uid}:memory_consolidation), so an interrupted run resumes with the
+clusters it had not finished. A summary's ID is derived from its members, so
+redoing a cluster after a crash overwrites the summary instead of adding a
+second one.
+
+Pinecone only keeps a content preview of each memory, so consolidation is
+disabled there rather than summarizing previews and deleting the originals.
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import google.generativeai as genai
+
+from utils.redis_client import get_redis_client
+from utils.redis_lock import RedisLock
+from utils.llm_executor import llm_executor
+from utils.prompts.registry import prompt_registry
+from services.audit.audit_logger import AuditLogger
+
+from .config import Config
+from .types import MemoryItem
+from .storage.vector_store import VectorStore
+from .storage.memory_stats import memory_stats_index
+from .storage.quantization import as_matrix, normalize_rows
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def cluster_memories(
+    embeddings: np.ndarray, threshold: float, min_size: int, max_size: int
+) -> List[List[int]]:
+    """
+    Greedily group embeddings that are similar to a common seed.
+
+    Rows are taken as seeds in order, and each seed claims the unassigned
+    rows with cosine similarity of at least `threshold`, most similar first.
+
+    Args:
+        embeddings: One embedding per memory, oldest memory first
+        threshold: Minimum cosine similarity to the seed
+        min_size: Smallest cluster worth consolidating
+        max_size: Largest cluster summarized at once
+
+    Returns:
+        Clusters of row indices, each with min_size to max_size rows
+    """
+    if len(embeddings) == 0:
+        return []
+
+    unit = normalize_rows(as_matrix(embeddings))
+    similarities = unit @ unit.T
+    assigned = np.zeros(len(unit), dtype=bool)
+
+    clusters = []
+    for seed in range(len(unit)):
+        if assigned[seed]:
+            continue
+        members = np.flatnonzero(~assigned & (similarities[seed] >= threshold))
+        order = np.argsort(-similarities[seed, members], kind="stable")
+        members = members[order][:max_size]
+        if len(members) < min_size:
+            continue
+        assigned[members] = True
+        clusters.append(sorted(members.tolist()))
+
+    return clusters
+
+
+class MemoryConsolidator:
+    """Worker that consolidates long-term memories, a batch of users at a time."""
+
+    CURSOR_KEY = "memory_consolidation:cursor"
+
+    # A user's run is abandoned by other workers after this long without
+    # progress (the lock is extended before every cluster)
+    LOCK_TTL_SECONDS = 900
+
+    PROMPT_NAME = "chat/memory_consolidation.txt"
+
+    def __init__(self):
+        self.vector_store = VectorStore(
+            persist_directory=Config.CHROMA_PERSIST_DIR,
+            use_pinecone=Config.USE_PINECONE,
+            vector_db_type=Config.VECTOR_DB_TYPE,
+        )
+        self.audit_logger = AuditLogger()
+        self.check_interval = Config.MEMORY_CONSOLIDATION_CHECK_SECONDS
+        self.consolidation_interval = Config.MEMORY_CONSOLIDATION_INTERVAL_SECONDS
+        self.batch_size = Config.MEMORY_CONSOLIDATION_BATCH_SIZE
+        self.min_memories = Config.MEMORY_CONSOLIDATION_MIN_MEMORIES
+        self.min_age = timedelta(days=Config.MEMORY_CONSOLIDATION_MIN_AGE_DAYS)
+        self.max_memories_per_run = Config.MEMORY_CONSOLIDATION_MAX_MEMORIES_PER_RUN
+        self.similarity = Config.MEMORY_CONSOLIDATION_SIMILARITY
+        self.min_cluster_size = max(2, Config.MEMORY_CONSOLIDATION_MIN_CLUSTER_SIZE)
+        self.max_cluster_size = max(
+            self.min_cluster_size, Config.MEMORY_CONSOLIDATION_MAX_CLUSTER_SIZE
+        )
+        self.summary_interval = 60.0 / max(
+            1, Config.MEMORY_CONSOLIDATION_SUMMARIES_PER_MINUTE
+        )
+        self._last_summary_at = 0.0
+        self._model = None
+        self.running = False
+        self._stats = {
+            "passes": 0,
+            "users_consolidated": 0,
+            "users_failed": 0,
+            "clusters_consolidated": 0,
+            "memories_retired": 0,
+            "summaries_failed": 0,
+            "last_pass_at": None,
+        }
+
+    def _state_key(self, user_id: str) -> str:
+        return f"user:{user_id}:memory_consolidation"
+
+    def _lock_key(self, user_id: str) -> str:
+        return f"user:{user_id}:memory_consolidation:lock"
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Memory consolidation running without Redis: {e}")
+            return None
+
+    async def start(self):
+        """Start the consolidation worker."""
+        if self.vector_store.use_pinecone:
+            logger.info("Memory consolidation disabled: Pinecone stores previews only")
+            return
+
+        self.running = True
+        logger.info("Memory consolidation worker started")
+
+        while self.running:
+            try:
+                await self.consolidate_due_users()
+                await asyncio.sleep(self.check_interval)
+
+            except Exception as e:
+                logger.error(f"Error in memory consolidation worker: {e}")
+                await asyncio.sleep(self.check_interval)
+
+    def stop(self):
+        """Stop the consolidation worker."""
+        self.running = False
+        logger.info("Memory consolidation worker stopped")
+
+    async def consolidate_due_users(self) -> int:
+        """
+        Consolidate due users from the next batch of users with memories.
+
+        Users are walked with a ZSCAN cursor saved in Redis, so successive
+        passes (and restarts) continue through the user set in order.
+
+        Returns:
+            Number of users consolidated
+        """
+        if self.vector_store.use_pinecone:
+            return 0
+
+        client = await self._get_client()
+        if not client:
+            return 0
+
+        cursor = int(await client.get(self.CURSOR_KEY) or 0)
+        cursor, entries = await client.zscan(
+            memory_stats_index.USERS_KEY, cursor, count=self.batch_size
+        )
+        await client.set(self.CURSOR_KEY, cursor)
+
+        consolidated = 0
+        for user_id, _ in entries:
+            try:
+                if await self._is_due(client, user_id):
+                    result = await self.consolidate_user(user_id)
+                    consolidated += result["status"] == "completed"
+            except Exception as e:
+                self._stats["users_failed"] += 1
+                logger.error(f"Failed to consolidate memories for user {user_id}: {e}")
+
+        self._stats["passes"] += 1
+        self._stats["last_pass_at"] = datetime.utcnow().isoformat()
+        return consolidated
+
+    async def _is_due(self, client, user_id: str) -> bool:
+        """Whether a user has an unfinished run or a large, stale store."""
+        state = await client.hgetall(self._state_key(user_id))
+        if state.get("plan"):
+            return True
+
+        completed_at = float(state.get("completed_at") or 0)
+        if time.time() - completed_at < self.consolidation_interval:
+            return False
+
+        counters = await memory_stats_index.get_stats(user_id)
+        if counters is not None:
+            long_term = counters["long_term"]
+        else:
+            long_term = await self.vector_store.count_user_memories(user_id)
+        return long_term >= self.min_memories
+
+    async def consolidate_user(self, user_id: str) -> Dict[str, Any]:
+        """
+        Run (or resume) consolidation for one user.
+
+        Args:
+            user_id: Validated user ID from JWT
+
+        Returns:
+            Summary of the clusters consolidated and memories retired
+        """
+        if self.vector_store.use_pinecone:
+            # Only content previews are stored; summarizing them would lose data
+            return {"status": "unsupported"}
+
+        client = await self._get_client()
+        if not client:
+            return {"status": "unavailable"}
+
+        lock = RedisLock(client, self._lock_key(user_id), self.LOCK_TTL_SECONDS)
+        if not await lock.acquire():
+            return {"status": "locked"}
+
+        state_key = self._state_key(user_id)
+        try:
+            state = await client.hgetall(state_key)
+            if state.get("plan"):
+                plan = json.loads(state["plan"])
+                next_cluster = int(state.get("next_cluster") or 0)
+                logger.info(
+                    f"Resuming memory consolidation for user {user_id} "
+                    f"at cluster {next_cluster}/{len(plan)}"
+                )
+            else:
+                plan = await self._plan(user_id)
+                next_cluster = 0
+                await client.hset(
+                    state_key,
+                    mapping={
+                        "plan": json.dumps(plan),
+                        "next_cluster": 0,
+                        "started_at": time.time(),
+                    },
+                )
+
+            clusters = 0
+            retired = 0
+            for position in range(next_cluster, len(plan)):
+                if not await lock.extend():
+                    # Another worker resumes the plan from next_cluster
+                    logger.warning(
+                        f"Memory consolidation lock for user {user_id} expired "
+                        f"at cluster {position}/{len(plan)}; stopping"
+                    )
+                    return {"status": "lock_lost", "clusters": clusters}
+                retired_ids, complete = await self._consolidate_cluster(
+                    user_id, plan[position]
+                )
+                if retired_ids:
+                    clusters += 1
+                    retired += len(retired_ids)
+                if not complete:
+                    # Some originals survived their delete; the next pass
+                    # resumes at this cluster and retires them
+                    logger.warning(
+                        f"Memory consolidation for user {user_id} left cluster "
+                        f"{position}/{len(plan)} incomplete; will retry"
+                    )
+                    return {
+                        "status": "incomplete",
+                        "clusters": clusters,
+                        "retired": retired,
+                    }
+                await client.hset(state_key, "next_cluster", position + 1)
+
+            pipe = client.pipeline(transaction=True)
+            pipe.hdel(state_key, "plan", "next_cluster", "started_at")
+            pipe.hset(
+                state_key,
+                mapping={
+                    "completed_at": time.time(),
+                    "last_clusters": clusters,
+                    "last_retired": retired,
+                },
+            )
+            pipe.hincrby(state_key, "total_clusters", clusters)
+            pipe.hincrby(state_key, "total_retired", retired)
+            await pipe.execute()
+
+            self._stats["users_consolidated"] += 1
+            logger.info(
+                f"Consolidated memories for user {user_id}: "
+                f"{retired} memories into {clusters} summaries"
+            )
+            return {"status": "completed", "clusters": clusters, "retired": retired}
+
+        finally:
+            await lock.release()
+
+    async def _plan(self, user_id: str) -> List[List[str]]:
+        """Cluster a user's oldest eligible memories into consolidation groups."""
+        cutoff = datetime.utcnow() - self.min_age
+        eligible = [
+            memory
+            async for memory in self.vector_store.iter_user_memories(user_id)
+            if self._is_eligible(memory, cutoff)
+        ]
+        eligible.sort(key=lambda memory: memory.get("timestamp") or "")
+        eligible = eligible[: self.max_memories_per_run]
+        if len(eligible) < self.min_cluster_size:
+            return []
+
+        embeddings = await self.vector_store.embed_texts(
+            [memory["content"] for memory in eligible], user_id=user_id
+        )
+        clusters = cluster_memories(
+            embeddings, self.similarity, self.min_cluster_size, self.max_cluster_size
+        )
+        return [[eligible[i]["memory_id"] for i in cluster] for cluster in clusters]
+
+    def _is_eligible(self, memory: Dict[str, Any], cutoff: datetime) -> bool:
+        """Whether a memory may be folded into a summary."""
+        metadata = memory.get("metadata") or {}
+        if metadata.get("memory_category") == "emotional_anchor":
+            return False
+        if metadata.get("consolidated") or not memory.get("content"):
+            return False
+        try:
+            return datetime.fromisoformat(memory.get("timestamp")) < cutoff
+        except (TypeError, ValueError):
+            return False
+
+    async def _consolidate_cluster(
+        self, user_id: str, memory_ids: List[str]
+    ) -> Tuple[List[str], bool]:
+        """
+        Replace one planned cluster with a summary memory.
+
+        Members deleted or changed since planning are left out, and the
+        cluster is skipped if too few remain. The summary's ID is derived
+        from the planned cluster, so when a retry finds it already stored,
+        only the members that survived the earlier delete are retired.
+
+        Returns:
+            IDs of the memories retired, and whether every member that should
+            be retired was
+        """
+        summary_id = self._summary_id(memory_ids)
+        stored = await self.vector_store.get_memories(
+            user_id, memory_ids + [summary_id]
+        )
+        existing = stored.pop(summary_id, None)
+        if existing:
+            summary = MemoryItem(
+                id=summary_id,
+                content=existing["content"],
+                type=existing["metadata"].get("type", "consolidated_memory"),
+                timestamp=datetime.fromisoformat(existing["timestamp"]),
+                metadata=existing["metadata"],
+            )
+            consolidated_from = existing["metadata"].get("consolidated_from") or ""
+            remaining = [
+                memory_id
+                for memory_id in consolidated_from.split(",")
+                if memory_id in stored
+            ]
+            return await self._retire(user_id, summary, remaining)
+
+        cutoff = datetime.utcnow() - self.min_age
+        members = [
+            stored[memory_id]
+            for memory_id in memory_ids
+            if memory_id in stored and self._is_eligible(stored[memory_id], cutoff)
+        ]
+        if len(members) < self.min_cluster_size:
+            return [], True
+        members.sort(key=lambda memory: memory.get("timestamp") or "")
+
+        content = await self._summarize(members)
+        if not content:
+            self._stats["summaries_failed"] += 1
+            return [], True
+
+        summary = self._summary_memory(user_id, summary_id, members, content)
+        if not await self.vector_store.store_memory(user_id, summary):
+            return [], True
+
+        self._stats["clusters_consolidated"] += 1
+        return await self._retire(
+            user_id, summary, [memory["memory_id"] for memory in members]
+        )
+
+    async def _retire(
+        self, user_id: str, summary: MemoryItem, memory_ids: List[str]
+    ) -> Tuple[List[str], bool]:
+        """
+        Delete the memories a stored summary replaces.
+
+        Only the memories actually deleted are audited and counted.
+
+        Returns:
+            IDs of the memories retired, and whether all of them were
+        """
+        if not memory_ids:
+            return [], True
+
+        results = await self.vector_store.delete_memories(user_id, memory_ids)
+        retired_ids = [memory_id for memory_id in memory_ids if results.get(memory_id)]
+        if retired_ids:
+            await self.audit_logger.log_memories_consolidated(
+                user_id, summary, retired_ids
+            )
+            self._stats["memories_retired"] += len(retired_ids)
+
+        return retired_ids, len(retired_ids) == len(memory_ids)
+
+    async def _summarize(self, members: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Write one consolidated memory for a cluster, within the rate limit.
+
+        Returns:
+            The summary, or None if the prompt could not be rendered or the
+            model call failed (the cluster is then left as it is)
+        """
+        try:
+            prompt = prompt_registry.get(self.PROMPT_NAME)
+            if "memories" not in prompt.fields:
+                raise ValueError(f"{self.PROMPT_NAME} has no {{memories}} field")
+            prompt_text = prompt.render(
+                memories="\n".join(
+                    f"- [{(memory.get('timestamp') or '')[:10]}] {memory['content']}"
+                    for memory in members
+                )
+            )
+        except Exception as e:
+            logger.error(f"Memory consolidation prompt unavailable: {e}")
+            return None
+
+        wait = self._last_summary_at + self.summary_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_summary_at = time.monotonic()
+
+        try:
+            response = await llm_executor.generate_content(
+                self._get_model(),
+                prompt_text,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0.2, max_output_tokens=512, candidate_count=1
+                ),
+            )
+            return response.text.strip() or None
+        except Exception as e:
+            logger.warning(f"Failed to summarize memory cluster: {e}")
+            return None
+
+    def _get_model(self):
+        """Create the Gemini model on first use."""
+        if self._model is None:
+            genai.configure(api_key=Config.GOOGLE_API_KEY)
+            self._model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        return self._model
+
+    @staticmethod
+    def _summary_id(memory_ids: List[str]) -> str:
+        """ID of the summary for a planned cluster (stable across retries)."""
+        cluster_key = hashlib.sha256(",".join(sorted(memory_ids)).encode()).hexdigest()
+        return f"consolidated_{cluster_key[:24]}"
+
+    def _summary_memory(
+        self,
+        user_id: str,
+        summary_id: str,
+        members: List[Dict[str, Any]],
+        content: str,
+    ) -> MemoryItem:
+        """Build the memory that replaces a cluster."""
+        member_ids = [memory["memory_id"] for memory in members]
+        metadatas = [memory.get("metadata") or {} for memory in members]
+
+        def strongest(score: str) -> float:
+            return max(float(metadata.get(score, 0.5)) for metadata in metadatas)
+
+        return MemoryItem(
+            id=summary_id,
+            content=content,
+            type="consolidated_memory",
+            metadata={
+                "user_id": user_id,
+                "storage_type": "long_term",
+                "created_at": datetime.utcnow().isoformat(),
+                "memory_category": "long_term",
+                "is_meaningful": True,
+                "is_lasting": True,
+                "is_symbolic": False,
+                "relevance_score": strongest("relevance_score"),
+                "stability_score": strongest("stability_score"),
+                "explicitness_score": strongest("explicitness_score"),
+                "has_pii": any(metadata.get("has_pii") for metadata in metadatas),
+                "pii_handling": "consolidated",
+                "consolidated": True,
+                "consolidated_count": len(members),
+                # Comma-joined: Chroma metadata values must be scalars
+                "consolidated_from": ",".join(member_ids),
+            },
+            timestamp=datetime.fromisoformat(members[-1]["timestamp"]),
+        )
+
+    async def get_user_status(self, user_id: str) -> Dict[str, Any]:
+        """
+        Report a user's consolidation progress.
+
+        Args:
+            user_id: Validated user ID from JWT
+
+        Returns:
+            Pending clusters of an unfinished run and totals of finished runs
+        """
+        client = await self._get_client()
+        state = await client.hgetall(self._state_key(user_id)) if client else {}
+
+        plan = json.loads(state["plan"]) if state.get("plan") else []
+        completed_at = state.get("completed_at")
+        return {
+            "in_progress": bool(plan),
+            "pending_clusters": len(plan) - int(state.get("next_cluster") or 0),
+            "last_completed_at": (
+                datetime.utcfromtimestamp(float(completed_at)).isoformat()
+                if completed_at
+                else None
+            ),
+            "last_clusters": int(state.get("last_clusters") or 0),
+            "last_retired": int(state.get("last_retired") or 0),
+            "total_clusters": int(state.get("total_clusters") or 0),
+            "total_retired": int(state.get("total_retired") or 0),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker counters for this process."""
+        return {**self._stats, "running": self.running}
+
+
+# Global instance
+memory_consolidator = MemoryConsolidator()
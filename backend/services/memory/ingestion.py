@@ -0,0 +1,569 @@
+"""
+Write-behind memory ingestion.
+
+Chat requests enqueue messages instead of awaiting MemoryService.process_memory
+(PII detection, scoring, embedding and dual storage). Messages are kept on
+Redis streams until a worker has processed them:
+
+- memory_ingestion:stream:{partition}   - queued messages; a user's messages
+                                          always land in the same partition
+- memory_ingestion:lock:{partition}     - held by the worker draining it
+- memory_ingestion:deferred:{partition} - sorted set of users with messages
+                                          set aside, by when to retry them
+- memory_ingestion:deferred:{partition}:{uid} - list of a user's set-aside
+                                          messages, oldest first
+- memory_ingestion:dead                 - messages that exhausted their retries
+- user:{uid}:memory_ingestion:{job_id}  - job status, readable by the user
+
+A partition is drained by one worker at a time, in stream order, so a user's
+messages are processed in the order they were sent. The partition lock is
+extended before every message, so a slow batch keeps it. A failed message is
+retried with exponential backoff: it is moved to its user's deferred list,
+along with every later message of that user, and the rest of the partition
+carries on. Once the backoff has passed, the user's deferred messages are
+processed in order before the stream. Messages delivered to a worker that
+died are redelivered to the next worker that takes the partition. A
+message's job ID is used as its memory ID, so a retry overwrites whatever a
+failed attempt had already stored. When a partition's backlog reaches
+MEMORY_INGESTION_MAX_BACKLOG, enqueue refuses the message and the caller
+processes it inline, slowing the producer down to the workers' pace.
+"""
+
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from utils.redis_client import get_redis_client
+from utils.redis_lock import RedisLock
+
+from .config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class MemoryIngestionQueue:
+    """Redis-stream queue of memories to process, with a per-process worker pool."""
+
+    KEY_PREFIX = "memory_ingestion"
+    GROUP = "memory_ingestion"
+
+    # Partitions are locked per worker, so one consumer name is enough; it
+    # lets a new lock holder reclaim messages a dead worker had read
+    CONSUMER = "owner"
+
+    # A partition is abandoned by other workers after this long without
+    # progress (the lock is extended before every message)
+    LOCK_TTL_SECONDS = 300
+
+    def __init__(self, memory_service=None):
+        self._memory_service = memory_service
+        self.workers = max(1, Config.MEMORY_INGESTION_WORKERS)
+        self.partitions = max(1, Config.MEMORY_INGESTION_PARTITIONS)
+        self.batch_size = max(1, Config.MEMORY_INGESTION_BATCH_SIZE)
+        self.max_backlog = Config.MEMORY_INGESTION_MAX_BACKLOG
+        self.max_attempts = max(1, Config.MEMORY_INGESTION_MAX_ATTEMPTS)
+        self.retry_seconds = Config.MEMORY_INGESTION_RETRY_SECONDS
+        self.poll_seconds = Config.MEMORY_INGESTION_POLL_SECONDS
+        self.job_ttl = Config.MEMORY_INGESTION_JOB_TTL_SECONDS
+        self.running = False
+        self._tasks: List[asyncio.Task] = []
+        self._stats = {
+            "enqueued": 0,
+            "rejected": 0,
+            "completed": 0,
+            "retried": 0,
+            "failed": 0,
+            "processing_ms": 0.0,
+        }
+
+    def _stream_key(self, partition: int) -> str:
+        return f"{self.KEY_PREFIX}:stream:{partition}"
+
+    def _lock_key(self, partition: int) -> str:
+        return f"{self.KEY_PREFIX}:lock:{partition}"
+
+    def _deferred_key(self, partition: int) -> str:
+        return f"{self.KEY_PREFIX}:deferred:{partition}"
+
+    def _deferred_list_key(self, partition: int, user_id: str) -> str:
+        return f"{self.KEY_PREFIX}:deferred:{partition}:{user_id}"
+
+    def _dead_key(self) -> str:
+        return f"{self.KEY_PREFIX}:dead"
+
+    def _job_key(self, user_id: str, job_id: str) -> str:
+        return f"user:{user_id}:{self.KEY_PREFIX}:{job_id}"
+
+    def _partition(self, user_id: str) -> int:
+        digest = hashlib.blake2b(user_id.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.partitions
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Memory ingestion running without Redis: {e}")
+            return None
+
+    def _get_memory_service(self):
+        """Memory service the workers process messages with."""
+        if self._memory_service is None:
+            from .memoryService import MemoryService
+
+            self._memory_service = MemoryService()
+        return self._memory_service
+
+    async def enqueue(
+        self,
+        user_id: str,
+        content: str,
+        type: str = "chat",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        Queue a memory for processing.
+
+        Args:
+            user_id: Validated user ID from JWT
+            content: Memory content
+            type: Memory type
+            metadata: Memory metadata
+
+        Returns:
+            Job ID, or None when the message was not queued (workers not
+            running, Redis unavailable or the partition's backlog is full) and
+            should be processed inline
+        """
+        if not self.running:
+            # start() found Redis down at boot, so nothing here drains the queue
+            return None
+
+        client = await self._get_client()
+        if not client:
+            return None
+
+        try:
+            stream_key = self._stream_key(self._partition(user_id))
+            if await client.xlen(stream_key) >= self.max_backlog:
+                self._stats["rejected"] += 1
+                logger.warning(
+                    f"Memory ingestion backlog full for {stream_key}; "
+                    f"processing message for user {user_id} inline"
+                )
+                return None
+
+            job_id = str(uuid.uuid4())
+            job_key = self._job_key(user_id, job_id)
+            pipe = client.pipeline(transaction=True)
+            pipe.hset(
+                job_key,
+                mapping={
+                    "status": "queued",
+                    "attempts": 0,
+                    "enqueued_at": datetime.utcnow().isoformat(),
+                },
+            )
+            pipe.expire(job_key, self.job_ttl)
+            pipe.xadd(
+                stream_key,
+                {
+                    "job_id": job_id,
+                    "user_id": user_id,
+                    "content": content,
+                    "type": type,
+                    "metadata": json.dumps(metadata or {}, default=str),
+                },
+            )
+            await pipe.execute()
+
+            self._stats["enqueued"] += 1
+            return job_id
+
+        except Exception as e:
+            logger.warning(f"Failed to queue memory for user {user_id}: {e}")
+            return None
+
+    async def start(self):
+        """Start the worker pool."""
+        client = await self._get_client()
+        if not client:
+            logger.warning("Memory ingestion workers not started: Redis unavailable")
+            return
+
+        for partition in range(self.partitions):
+            try:
+                await client.xgroup_create(
+                    self._stream_key(partition), self.GROUP, id="0", mkstream=True
+                )
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+        self.running = True
+        self._tasks = [
+            asyncio.create_task(self._run_worker(index))
+            for index in range(self.workers)
+        ]
+        logger.info(f"Memory ingestion started with {self.workers} workers")
+
+    async def stop(self):
+        """Stop the worker pool; unfinished messages are redelivered later."""
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        # Let cancelled workers finish their lock release and ack cleanup
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Memory ingestion workers stopped")
+
+    async def _run_worker(self, index: int):
+        """Drain partitions with queued messages until stopped."""
+        while self.running:
+            try:
+                processed = await self.drain(offset=index)
+                if not processed:
+                    await asyncio.sleep(self.poll_seconds)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in memory ingestion worker {index}: {e}")
+                await asyncio.sleep(self.poll_seconds)
+
+    async def drain(self, offset: int = 0) -> int:
+        """
+        Process a batch from every unlocked partition with queued messages
+        or deferred messages due for a retry.
+
+        Args:
+            offset: Partition to start from, so workers spread out
+
+        Returns:
+            Number of messages processed
+        """
+        client = await self._get_client()
+        if not client:
+            return 0
+
+        now = time.time()
+        pipe = client.pipeline(transaction=False)
+        for partition in range(self.partitions):
+            pipe.xlen(self._stream_key(partition))
+            pipe.zcount(self._deferred_key(partition), "-inf", now)
+        counts = await pipe.execute()
+
+        processed = 0
+        for step in range(self.partitions):
+            partition = (offset + step) % self.partitions
+            queued, due = counts[2 * partition], counts[2 * partition + 1]
+            if queued or due:
+                processed += await self._drain_partition(client, partition)
+        return processed
+
+    async def _drain_partition(self, client, partition: int) -> int:
+        """Process the next batch of a partition, in order, if it is unlocked."""
+        lock = RedisLock(client, self._lock_key(partition), self.LOCK_TTL_SECONDS)
+        if not await lock.acquire():
+            return 0
+
+        processed = 0
+        try:
+            processed += await self._drain_deferred(client, partition, lock)
+
+            stream_key = self._stream_key(partition)
+            # Messages read earlier but never acknowledged come first
+            for last_id in ("0", ">"):
+                response = await client.xreadgroup(
+                    self.GROUP,
+                    self.CONSUMER,
+                    {stream_key: last_id},
+                    count=self.batch_size,
+                )
+                entries = response[0][1] if response else []
+                if entries:
+                    break
+
+            # Users with messages set aside: keep their later messages behind them
+            deferred_users = set(
+                await client.zrange(self._deferred_key(partition), 0, -1)
+            )
+
+            for entry_id, fields in entries:
+                if not await lock.extend():
+                    # Another worker took the partition; it redelivers the rest
+                    break
+
+                def ack(pipe, entry_id=entry_id):
+                    pipe.xack(stream_key, self.GROUP, entry_id)
+                    pipe.xdel(stream_key, entry_id)
+
+                if not fields:
+                    # Deleted after delivery; nothing left to process
+                    pipe = client.pipeline(transaction=True)
+                    ack(pipe)
+                    await pipe.execute()
+                    continue
+
+                user_id = fields["user_id"]
+                if user_id in deferred_users:
+                    await self._defer(client, partition, fields, ack)
+                    continue
+
+                retry_at = await self._process_entry(client, fields, ack)
+                if retry_at is not None:
+                    await self._defer(client, partition, fields, ack, retry_at)
+                    deferred_users.add(user_id)
+                    continue
+                processed += 1
+
+        finally:
+            await lock.release()
+
+        return processed
+
+    async def _defer(
+        self,
+        client,
+        partition: int,
+        fields: Dict[str, str],
+        ack,
+        retry_at: Optional[float] = None,
+    ):
+        """
+        Move a message from the stream to its user's deferred list.
+
+        Args:
+            client: Redis client
+            partition: Partition the message was read from
+            fields: Message fields
+            ack: Queues the message's removal from the stream on a pipeline
+            retry_at: When to retry the user's deferred messages (epoch); None
+                keeps the user's current retry time
+        """
+        user_id = fields["user_id"]
+        deferred_key = self._deferred_key(partition)
+        pipe = client.pipeline(transaction=True)
+        pipe.rpush(self._deferred_list_key(partition, user_id), json.dumps(fields))
+        if retry_at is not None:
+            pipe.zadd(deferred_key, {user_id: retry_at})
+        else:
+            pipe.zadd(deferred_key, {user_id: time.time()}, nx=True)
+        ack(pipe)
+        await pipe.execute()
+
+    async def _drain_deferred(self, client, partition: int, lock: RedisLock) -> int:
+        """Process, in order, the deferred messages of users whose backoff passed."""
+        deferred_key = self._deferred_key(partition)
+        user_ids = await client.zrangebyscore(deferred_key, "-inf", time.time())
+
+        processed = 0
+        for user_id in user_ids:
+            list_key = self._deferred_list_key(partition, user_id)
+            while processed < self.batch_size:
+                if not await lock.extend():
+                    return processed
+
+                raw = await client.lindex(list_key, 0)
+                if raw is None:
+                    # Only the lock holder adds to the list, so it stays empty
+                    await client.zrem(deferred_key, user_id)
+                    break
+
+                retry_at = await self._process_entry(
+                    client, json.loads(raw), lambda pipe: pipe.lpop(list_key)
+                )
+                if retry_at is not None:
+                    await client.zadd(deferred_key, {user_id: retry_at})
+                    break
+                processed += 1
+
+        return processed
+
+    async def _process_entry(
+        self, client, fields: Dict[str, str], ack
+    ) -> Optional[float]:
+        """
+        Run process_memory for a queued message.
+
+        Args:
+            client: Redis client
+            fields: Message fields
+            ack: Queues the message's removal from its stream or deferred list
+                on a pipeline, run with the job's final status
+
+        Returns:
+            None when the message is done with (processed or dead-lettered),
+            otherwise when to retry it (epoch)
+        """
+        user_id = fields["user_id"]
+        job_key = self._job_key(user_id, fields["job_id"])
+        job = await client.hgetall(job_key)
+        retry_at = float(job.get("retry_at") or 0)
+        if time.time() < retry_at:
+            return retry_at
+
+        attempts = int(job.get("attempts") or 0) + 1
+        await client.hset(
+            job_key, mapping={"status": "processing", "attempts": attempts}
+        )
+
+        started = time.perf_counter()
+        try:
+            result = await self._get_memory_service().process_memory(
+                user_id=user_id,
+                content=fields["content"],
+                type=fields.get("type", "chat"),
+                metadata=json.loads(fields.get("metadata") or "{}"),
+                # Retries overwrite the components an earlier attempt stored
+                memory_id=fields["job_id"],
+            )
+        except Exception as e:
+            return await self._handle_failure(client, fields, ack, job_key, attempts, e)
+        finally:
+            self._stats["processing_ms"] += (time.perf_counter() - started) * 1000
+
+        summary = {
+            "stored": bool(result.get("stored")),
+            "stored_components": result.get("stored_components", 0),
+            "needs_consent": bool(result.get("needs_consent")),
+        }
+        pipe = client.pipeline(transaction=True)
+        ack(pipe)
+        pipe.hset(
+            job_key,
+            mapping={
+                "status": "completed",
+                "completed_at": datetime.utcnow().isoformat(),
+                "result": json.dumps(summary),
+            },
+        )
+        pipe.hdel(job_key, "retry_at", "error")
+        pipe.expire(job_key, self.job_ttl)
+        await pipe.execute()
+
+        self._stats["completed"] += 1
+        return None
+
+    async def _handle_failure(
+        self,
+        client,
+        fields: Dict[str, str],
+        ack,
+        job_key: str,
+        attempts: int,
+        error: Exception,
+    ) -> Optional[float]:
+        """Schedule a retry, or dead-letter the message after its last attempt."""
+        if attempts < self.max_attempts:
+            delay = self.retry_seconds * 2 ** (attempts - 1)
+            retry_at = time.time() + delay
+            await client.hset(
+                job_key,
+                mapping={
+                    "status": "retrying",
+                    "retry_at": retry_at,
+                    "error": str(error),
+                },
+            )
+            self._stats["retried"] += 1
+            logger.warning(
+                f"Memory ingestion attempt {attempts} failed for user "
+                f"{fields['user_id']}, retrying in {delay:.1f}s: {error}"
+            )
+            return retry_at
+
+        pipe = client.pipeline(transaction=True)
+        pipe.xadd(self._dead_key(), {**fields, "error": str(error)})
+        ack(pipe)
+        pipe.hset(
+            job_key,
+            mapping={
+                "status": "failed",
+                "failed_at": datetime.utcnow().isoformat(),
+                "error": str(error),
+            },
+        )
+        pipe.hdel(job_key, "retry_at")
+        pipe.expire(job_key, self.job_ttl)
+        await pipe.execute()
+
+        self._stats["failed"] += 1
+        logger.error(
+            f"Memory ingestion failed for user {fields['user_id']} after "
+            f"{attempts} attempts: {error}"
+        )
+        return None
+
+    async def get_job_status(
+        self, user_id: str, job_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a queued memory.
+
+        Args:
+            user_id: Validated user ID from JWT
+            job_id: Job ID returned by enqueue
+
+        Returns:
+            Job status, or None when the job is unknown or has expired
+        """
+        client = await self._get_client()
+        if not client:
+            return None
+
+        job = await client.hgetall(self._job_key(user_id, job_id))
+        if not job:
+            return None
+
+        status = {
+            "job_id": job_id,
+            "status": job["status"],
+            "attempts": int(job.get("attempts") or 0),
+        }
+        for field in ("enqueued_at", "completed_at", "failed_at", "error"):
+            if job.get(field):
+                status[field] = job[field]
+        if job.get("retry_at"):
+            status["retry_at"] = datetime.utcfromtimestamp(
+                float(job["retry_at"])
+            ).isoformat()
+        if job.get("result"):
+            status["result"] = json.loads(job["result"])
+        return status
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and this process's worker counters."""
+        stats = {
+            **self._stats,
+            "processing_ms": round(self._stats["processing_ms"], 3),
+            "running": self.running,
+            "workers": len(self._tasks),
+        }
+
+        client = await self._get_client()
+        if client:
+            pipe = client.pipeline(transaction=False)
+            for partition in range(self.partitions):
+                pipe.xlen(self._stream_key(partition))
+            for partition in range(self.partitions):
+                pipe.zcard(self._deferred_key(partition))
+            pipe.xlen(self._dead_key())
+            *counts, dead = await pipe.execute()
+            backlog = counts[: self.partitions]
+            stats["backlog"] = sum(backlog)
+            stats["max_partition_backlog"] = max(backlog)
+            stats["deferred_users"] = sum(counts[self.partitions :])
+            stats["dead_letters"] = dead
+
+        return stats
+
+
+# Create global instance (shared by every request in the process)
+memory_ingestion_queue = MemoryIngestionQueue()
@@ -13,7 +13,7 @@ This service handles the complete memory processing workflow:
 import asyncio
 import os
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
 import uuid
 from dataclasses import asdict
@@ -90,11 +90,18 @@ class MemoryService:
         type: str = "chat",
         metadata: Optional[Dict[str, Any]] = None,
         user_consent: Optional[Dict[str, Any]] = None,
+        memory_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Process a new memory item with dual storage strategy."""
+        """
+        Process a new memory item with dual storage strategy.
+
+        Component memory IDs are derived from memory_id, so processing the
+        same memory_id again overwrites what an earlier attempt stored
+        instead of storing it twice. A fresh ID is used when none is given.
+        """
         # Create base memory
         base_memory = self.memory_processor.create_base_memory(
-            user_id, content, type, metadata
+            user_id, content, type, metadata, memory_id
         )
 
         # For chat messages, always store in short-term first, handle PII later
@@ -130,36 +137,41 @@ class MemoryService:
         if not component_results.get("stored"):
             return component_results
 
-        # Store components that meet criteria
-        stored_components = []
-        for component_result in component_results["components"]:
-            if component_result.get("stored") and component_result.get(
-                "component_memory"
-            ):
-                component_memory = component_result["component_memory"]
-
-                # Get the score for this component
-                score = MemoryScore(
-                    relevance=component_result["score"]["relevance"],
-                    stability=component_result["score"]["stability"],
-                    explicitness=component_result["score"]["explicitness"],
-                    metadata={
-                        "memory_category": component_result["memory_category"],
-                        "is_meaningful": component_result["is_meaningful"],
-                        "is_lasting": component_result["is_lasting"],
-                        "is_symbolic": component_result["is_symbolic"],
-                        "component_content": component_result["component_content"],
-                    },
-                )
+        # Store components that meet criteria, concurrently
+        async def store_component(component_result: Dict[str, Any]):
+            component_memory = component_result["component_memory"]
+
+            # Get the score for this component
+            score = MemoryScore(
+                relevance=component_result["score"]["relevance"],
+                stability=component_result["score"]["stability"],
+                explicitness=component_result["score"]["explicitness"],
+                metadata={
+                    "memory_category": component_result["memory_category"],
+                    "is_meaningful": component_result["is_meaningful"],
+                    "is_lasting": component_result["is_lasting"],
+                    "is_symbolic": component_result["is_symbolic"],
+                    "component_content": component_result["component_content"],
+                },
+            )
 
-                # Store using dual strategy
-                storage_result = await self.storage_processor.store_with_dual_strategy(
-                    user_id, component_memory, score, pii_results, user_consent or {}
-                )
+            # Store using dual strategy
+            storage_result = await self.storage_processor.store_with_dual_strategy(
+                user_id, component_memory, score, pii_results, user_consent or {}
+            )
 
-                # Merge storage result with component result
-                component_result.update(storage_result)
-                stored_components.append(component_result)
+            # Merge storage result with component result
+            component_result.update(storage_result)
+            return component_result
+
+        stored_components = await asyncio.gather(
+            *(
+                store_component(component_result)
+                for component_result in component_results["components"]
+                if component_result.get("stored")
+                and component_result.get("component_memory")
+            )
+        )
 
         # Update the final result
         component_results["stored_components"] = len(stored_components)
@@ -193,10 +205,11 @@ class MemoryService:
         user_id: str,
         query: Optional[str] = None,
         conversation_id: Optional[str] = None,
+        queries: Optional[List[str]] = None,
     ) -> MemoryContext:
         """Get memory context for a user, optionally scoped to a conversation."""
         return await self.retrieval_processor.get_memory_context(
-            user_id, query, conversation_id
+            user_id, query, conversation_id, queries
         )
 
     async def get_memory_stats(self, user_id: str) -> MemoryStats:
@@ -204,11 +217,14 @@ class MemoryService:
         return await self.retrieval_processor.get_memory_stats(user_id)
 
     async def get_emotional_anchors(
-        self, user_id: str, conversation_id: Optional[str] = None
+        self,
+        user_id: str,
+        conversation_id: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[MemoryItem]:
         """Get emotional anchors (meaningful connections) for a user, optionally filtered by conversation."""
         return await self.retrieval_processor.get_emotional_anchors(
-            user_id, conversation_id
+            user_id, conversation_id, limit
         )
 
     async def get_regular_memories(
@@ -306,6 +322,17 @@ class MemoryService:
             user_id=user_id, memory_ids=memory_ids
         )
 
+    def stream_user_data(
+        self,
+        user_id: str,
+        memory_ids: Optional[List[str]] = None,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """Stream a user data export as NDJSON chunks (optionally gzipped)."""
+        return self.gdpr_processor.stream_user_data(
+            user_id=user_id, memory_ids=memory_ids, compress=compress
+        )
+
     async def delete_all_user_data(self, user_id: str) -> Dict[str, Any]:
         """Delete all user data for GDPR compliance (right to be forgotten)."""
         return await self.gdpr_processor.delete_all_user_data(user_id)
@@ -369,15 +396,18 @@ class MemoryService:
                 "total_count": 0,
             }
 
+        # Get therapeutic scores in batches (first component of each)
+        scores = [
+            memory_scores[0]
+            for memory_scores in await self.scorer.score_memories_cached(chat_memories)
+        ]
+
         # Analyze each memory for PII and therapeutic value
         memory_summaries = []
-        for memory in chat_memories:
+        for memory, score in zip(chat_memories, scores):
             # Run PII detection for review
             pii_results = await self.pii_detector.detect_pii(memory)
 
-            # Get therapeutic score
-            score = self.scorer.score_memory(memory)[0]  # Get first component
-
             memory_summary = {
                 "id": memory.id,
                 "content": memory.content,
@@ -440,6 +470,9 @@ class MemoryService:
         # Get current short-term memories
         short_term_memories = await self.redis_store.get_user_memories(user_id)
 
+        # Long-term copies to write in one bulk call: (result bucket, original id, memory)
+        to_store = []
+
         for memory in short_term_memories:
             choice = memory_choices.get(memory.id, "keep")  # Default to keep
 
@@ -472,8 +505,7 @@ class MemoryService:
                             timestamp=memory.timestamp,
                         )
 
-                        await self.vector_store.store_memory(user_id, long_term_memory)
-                        results["anonymized"].append(memory.id)
+                        to_store.append(("anonymized", memory.id, long_term_memory))
                     else:
                         # No PII found, treat as keep
                         choice = "keep"
@@ -494,12 +526,22 @@ class MemoryService:
                         timestamp=memory.timestamp,
                     )
 
-                    await self.vector_store.store_memory(user_id, long_term_memory)
-                    results["kept"].append(memory.id)
+                    to_store.append(("kept", memory.id, long_term_memory))
 
             except Exception as e:
                 results["errors"].append({"memory_id": memory.id, "error": str(e)})
 
+        stored = await self.vector_store.store_memories(
+            user_id, [long_term_memory for _, _, long_term_memory in to_store]
+        )
+        for bucket, memory_id, long_term_memory in to_store:
+            if stored.get(long_term_memory.id):
+                results[bucket].append(memory_id)
+            else:
+                results["errors"].append(
+                    {"memory_id": memory_id, "error": "Failed to store in long-term"}
+                )
+
         # Clear short-term memories after processing
         await self.redis_store.clear_user_memories(user_id)
 
@@ -574,7 +616,7 @@ class MemoryService:
         try:
             # Get current memories
             short_term_memories = await self.redis_store.get_user_memories(user_id)
-            long_term_count = len(await self.vector_store.get_user_memories(user_id))
+            long_term_count = await self.vector_store.count_user_memories(user_id)
 
             # Categorize short-term memories
             will_be_cleared = []
@@ -681,52 +723,43 @@ class MemoryService:
                 conversation_id, user_id, promote_important=True
             )
 
-            # Process any memories that should be promoted to long-term storage
-            promotion_results = []
+            # Build long-term copies of memories that should be promoted
+            promotions = []
             for memory_info in session_result.get("memories_to_promote", []):
                 memory = memory_info["memory"]
-                reason = memory_info["reason"]
-
-                try:
-                    # Create a new memory item for long-term storage
-                    long_term_memory = MemoryItem(
-                        id=str(uuid.uuid4()),  # New ID for long-term storage
-                        content=memory.content,
-                        type="promoted_from_conversation",
-                        metadata={
-                            **memory.metadata,
-                            "original_conversation_id": conversation_id,
-                            "promotion_reason": reason,
-                            "promoted_at": datetime.utcnow().isoformat(),
-                            "storage_type": "long_term",
-                        },
-                        timestamp=memory.timestamp,
-                    )
-
-                    # Store in vector store
-                    stored = await self.vector_store.store_memory(
-                        user_id, long_term_memory
-                    )
+                long_term_memory = MemoryItem(
+                    id=str(uuid.uuid4()),  # New ID for long-term storage
+                    content=memory.content,
+                    type="promoted_from_conversation",
+                    metadata={
+                        **memory.metadata,
+                        "original_conversation_id": conversation_id,
+                        "promotion_reason": memory_info["reason"],
+                        "promoted_at": datetime.utcnow().isoformat(),
+                        "storage_type": "long_term",
+                    },
+                    timestamp=memory.timestamp,
+                )
+                promotions.append((memory, memory_info["reason"], long_term_memory))
 
-                    promotion_results.append(
-                        {
-                            "original_memory_id": memory.id,
-                            "promoted_memory_id": long_term_memory.id,
-                            "promoted": stored,
-                            "reason": reason,
-                        }
-                    )
+            # Store them in the vector store in one bulk write
+            stored = await self.vector_store.store_memories(
+                user_id, [long_term_memory for _, _, long_term_memory in promotions]
+            )
 
-                except Exception as e:
-                    logger.error(f"Failed to promote memory {memory.id}: {e}")
-                    promotion_results.append(
-                        {
-                            "original_memory_id": memory.id,
-                            "promoted": False,
-                            "error": str(e),
-                            "reason": reason,
-                        }
-                    )
+            promotion_results = []
+            for memory, reason, long_term_memory in promotions:
+                promoted = stored.get(long_term_memory.id, False)
+                if not promoted:
+                    logger.error(f"Failed to promote memory {memory.id}")
+                promotion_results.append(
+                    {
+                        "original_memory_id": memory.id,
+                        "promoted_memory_id": long_term_memory.id,
+                        "promoted": promoted,
+                        "reason": reason,
+                    }
+                )
 
             return {
                 "conversation_id": conversation_id,
@@ -12,6 +12,7 @@ from .types import MemoryItem, MemoryScore
 from .storage.redis_store import RedisStore
 from .storage.vector_store import VectorStore
 from utils.scoring.gemini_scorer import GeminiScorer
+from utils.scoring.prefilter import scoring_prefilter
 from ..privacy.security.pii_detector import PIIDetector
 from services.audit.audit_logger import AuditLogger
 from .config import Config
@@ -33,9 +34,10 @@ class MemoryProcessor:
         content: str,
         type: str = "chat",
         metadata: Optional[Dict[str, Any]] = None,
+        memory_id: Optional[str] = None,
     ) -> MemoryItem:
-        """Create a base memory item."""
-        memory_id = str(uuid.uuid4())
+        """Create a base memory item, with a fresh ID unless one is given."""
+        memory_id = memory_id or str(uuid.uuid4())
         metadata = metadata or {}
         metadata["user_id"] = user_id  # Store user_id in metadata for security
         return MemoryItem(
@@ -73,7 +75,9 @@ class MemoryProcessor:
         )
 
         # Score memory for therapeutic value
-        memory_scores = self.scorer.score_memory(base_memory)
+        memory_scores = await self._score_memory(
+            base_memory, is_chat_message and not is_assistant_message
+        )
 
         # Process each component separately
         stored_components = []
@@ -97,6 +101,41 @@ class MemoryProcessor:
             memory_scores, stored_components, all_results
         )
 
+    async def _score_memory(
+        self, base_memory: MemoryItem, is_user_message: bool
+    ) -> List[MemoryScore]:
+        """Score a memory, skipping Gemini for obviously short-term user messages."""
+        if not (Config.SCORING_PREFILTER_ENABLED and is_user_message):
+            return await self.scorer.score_memory_cached(base_memory)
+
+        decision = scoring_prefilter.evaluate(base_memory.content)
+        if decision["short_term_only"]:
+            memory_scores = self.scorer.short_term_scores(
+                base_memory,
+                reasoning=f"Local pre-filter: {decision['rule'] or 'model'} "
+                f"(p={decision['probability']})",
+            )
+            label_source = "prefilter"
+        else:
+            memory_scores = await self.scorer.score_memory_cached(base_memory)
+            score_metadata = memory_scores[0].metadata or {}
+            label_source = (
+                "gemini"
+                if score_metadata.get("gemini_used") and "error" not in score_metadata
+                else "failed"
+            )
+
+        # Logged decisions (features only) feed the offline evaluation script
+        await self.audit_logger.log_scoring_prefilter(
+            user_id=base_memory.user_id,
+            decision=decision,
+            memory_category=(memory_scores[0].metadata or {}).get(
+                "memory_category", "short_term"
+            ),
+            label_source=label_source,
+        )
+        return memory_scores
+
     async def _process_single_component(
         self,
         base_memory: MemoryItem,
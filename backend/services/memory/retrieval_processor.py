@@ -2,18 +2,86 @@
 Retrieval processor for memory search and context building.
 """
 
+import time
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+from datetime import datetime, timedelta, timezone
 
 from .types import MemoryItem, MemoryContext, MemoryStats
+from .config import Config
+from .stats_reconciler import reconcile_user_stats
 from .storage.redis_store import RedisStore
 from .storage.vector_store import VectorStore
+from .storage.memory_stats import SHORT_TERM, LONG_TERM
 from services.audit.audit_logger import AuditLogger
 import dotenv
 
 dotenv.load_dotenv("backend/.env")
 
+# Users whose lexical index is being backfilled (and the tasks doing it)
+_lexical_rebuilds: Set[str] = set()
+_lexical_rebuild_tasks: Set[asyncio.Task] = set()
+
+
+class _RecentActivity:
+    """Incrementally counts recent memory activity over a stream of memories."""
+
+    def __init__(self):
+        now = datetime.utcnow()
+        self.today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.week_start = now - timedelta(days=7)
+        self.memories_today = 0
+        self.memories_this_week = 0
+        self.latest_timestamp = None
+
+    def add(self, memory):
+        """Count one memory (a MemoryItem or a vector store memory dict)."""
+        # Handle both MemoryItem objects and dictionaries
+        if hasattr(memory, "timestamp"):
+            timestamp = memory.timestamp
+        elif isinstance(memory, dict):
+            timestamp_str = memory.get("timestamp") or memory.get("metadata", {}).get(
+                "timestamp"
+            )
+            if not timestamp_str:
+                return
+            try:
+                # Handle various timestamp formats
+                if timestamp_str.endswith("Z"):
+                    timestamp = datetime.fromisoformat(
+                        timestamp_str.replace("Z", "+00:00")
+                    )
+                else:
+                    timestamp = datetime.fromisoformat(timestamp_str)
+            except Exception as e:
+                logging.warning(f"Failed to parse timestamp {timestamp_str}: {e}")
+                return
+        else:
+            return
+
+        # Track latest timestamp
+        if self.latest_timestamp is None or timestamp > self.latest_timestamp:
+            self.latest_timestamp = timestamp
+
+        # Count memories today and this week
+        if timestamp >= self.today_start:
+            self.memories_today += 1
+        if timestamp >= self.week_start:
+            self.memories_this_week += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        logging.info(
+            f"Recent activity calculated: today={self.memories_today}, week={self.memories_this_week}"
+        )
+        return {
+            "memories_added_today": self.memories_today,
+            "memories_added_this_week": self.memories_this_week,
+            "last_memory_timestamp": (
+                self.latest_timestamp.isoformat() if self.latest_timestamp else None
+            ),
+        }
+
 
 class RetrievalProcessor:
     """Handles memory retrieval, context generation, and classification."""
@@ -27,54 +95,345 @@ class RetrievalProcessor:
         self.redis_store = redis_store
         self.vector_store = vector_store
         self.audit_logger = audit_logger
+        self.context_cache = vector_store.context_cache
 
     async def get_memory_context(
         self,
         user_id: str,
         query: Optional[str] = None,
         conversation_id: Optional[str] = None,
+        queries: Optional[List[str]] = None,
     ) -> MemoryContext:
-        """Get memory context for a user, optionally scoped to a conversation."""
+        """
+        Get memory context for a user, optionally scoped to a conversation.
+
+        When a query is given, the long-term search runs concurrently with
+        the short-term Redis read. Extra `queries` are searched in the same
+        batch and their results merged with the query's. Without any query,
+        the search is seeded from the newest short-term memory, so it starts
+        as soon as that read returns. Built contexts are cached until a
+        memory write bumps the user's or conversation's version. Per-stage
+        timings (milliseconds) are returned on the context.
+        """
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        seeds = ([query] if query else []) + [q for q in queries or [] if q]
+        search_key = "\n".join(seeds) or None
+
+        async def timed(stage: str, awaitable):
+            stage_started = time.perf_counter()
+            try:
+                return await awaitable
+            finally:
+                timings[stage] = round((time.perf_counter() - stage_started) * 1000, 2)
+
+        # Reuse the context built for this request if no memory changed since
+        version = None
+        if Config.MEMORY_CONTEXT_CACHE_ENABLED:
+            cached, version = await timed(
+                "cache", self.context_cache.get(user_id, conversation_id, search_key)
+            )
+            if cached is not None:
+                if cached.long_term:
+                    await self.audit_logger.log_memories_accessed(
+                        user_id=user_id,
+                        memories=cached.long_term,
+                        query=search_key or "context_retrieval",
+                    )
+                timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+                cached.timings = timings
+                return cached
+
         # Get short-term memories (conversation-scoped if available)
         if conversation_id:
-            short_term = await self.redis_store.get_conversation_memories(
+            short_term_read = self.redis_store.get_conversation_memories(
                 conversation_id
             )
         else:
-            short_term = await self.redis_store.get_user_memories(user_id)
-
-        # Get long-term memories
-        long_term = []
-        if query:
-            # Use semantic search with the provided query
-            search_results = await self.vector_store.similarity_search(
-                query=query, user_id=user_id, k=5
+            short_term_read = self.redis_store.get_user_memories(user_id)
+
+        # Get long-term memories with hybrid (lexical + semantic) search
+        if seeds:
+            short_term, search_results = await asyncio.gather(
+                timed("short_term", short_term_read),
+                timed("long_term", self._search_seeds(seeds, user_id, k=5)),
             )
-            long_term = self._convert_search_results_to_memories(search_results)
         else:
-            # If no query provided, use the most recent short-term memory as context
-            # to find relevant long-term memories
+            short_term = await timed("short_term", short_term_read)
+            search_results = []
             if short_term:
-                # Use the most recent message as the query for semantic search
-                recent_message = short_term[0].content  # Redis returns newest first
-                search_results = await self.vector_store.similarity_search(
-                    query=recent_message, user_id=user_id, k=3
+                # Use the most recent message as the query (Redis returns newest first)
+                search_results = await timed(
+                    "long_term",
+                    self.hybrid_search(
+                        query=short_term[0].content, user_id=user_id, k=3
+                    ),
                 )
-                long_term = self._convert_search_results_to_memories(search_results)
-
-        # Log memory access
-        for memory in long_term:
-            await self.audit_logger.log_memory_accessed(
-                user_id=user_id, memory=memory, query=query or "context_retrieval"
+        long_term = self._convert_search_results_to_memories(search_results)
+
+        # Log memory access as a single audit record
+        if long_term:
+            await timed(
+                "audit",
+                self.audit_logger.log_memories_accessed(
+                    user_id=user_id,
+                    memories=long_term,
+                    query=search_key or "context_retrieval",
+                ),
             )
 
         # Generate digest
         digest = await self._generate_digest(short_term + long_term)
 
-        return MemoryContext(short_term=short_term, long_term=long_term, digest=digest)
+        context = MemoryContext(
+            short_term=short_term, long_term=long_term, digest=digest, timings=timings
+        )
+        if version is not None:
+            # Stored under the version read before building, so a write made
+            # meanwhile leaves this entry stale rather than wrongly current
+            await self.context_cache.set(
+                user_id, conversation_id, search_key, version, context
+            )
+
+        timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+        logging.debug(f"Memory context timings for user {user_id}: {timings}")
+        return context
+
+    async def _search_seeds(
+        self, seeds: List[str], user_id: str, k: int
+    ) -> List[Dict[str, Any]]:
+        """Search every seed in one batch, keeping each memory's best result."""
+        if len(seeds) == 1:
+            return await self.hybrid_search(query=seeds[0], user_id=user_id, k=k)
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for results in await self.hybrid_search_many(seeds, user_id, k):
+            for result in results:
+                memory_id = result.get("memory_id")
+                best = merged.get(memory_id)
+                if best is None or result["score"] > best["score"]:
+                    merged[memory_id] = result
+
+        return sorted(merged.values(), key=lambda x: x["score"], reverse=True)[:k]
+
+    async def hybrid_search(
+        self, query: str, user_id: str, k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Search long-term memories with BM25 and vector similarity, then re-rank.
+
+        See hybrid_search_many.
+
+        Args:
+            query: Search query
+            user_id: Validated user ID from JWT
+            k: Number of results
+
+        Returns:
+            Results shaped like VectorStore.similarity_search results
+        """
+        results = await self.hybrid_search_many([query], user_id, k)
+        return results[0]
+
+    async def hybrid_search_many(
+        self, queries: List[str], user_id: str, k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search long-term memories for several queries with BM25 and vector
+        similarity, then re-rank each query's results.
+
+        The lexical and vector rankings are merged with weighted reciprocal
+        rank fusion and re-ranked by recency, emotional-anchor category and
+        stability score. When enough lexical hits cover a query's terms
+        (HYBRID_LEXICAL_ONLY_COVERAGE), its vector search - and its embedding
+        - is skipped. The remaining queries share one batched vector search.
+
+        Args:
+            queries: Search queries
+            user_id: Validated user ID from JWT
+            k: Number of results per query
+
+        Returns:
+            One result list per query, shaped like VectorStore.similarity_search
+            results
+        """
+        if not Config.HYBRID_SEARCH_ENABLED:
+            return await self.vector_store.similarity_search_many(user_id, queries, k)
+
+        lexical_index = self.vector_store.lexical_index
+        lexical_results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if await lexical_index.is_built(user_id):
+            lexical_results = list(
+                await asyncio.gather(
+                    *(
+                        lexical_index.search(
+                            user_id, query, k=max(k, Config.HYBRID_LEXICAL_K)
+                        )
+                        for query in queries
+                    )
+                )
+            )
+        else:
+            # Backfill in the background; these queries are answered by vector search
+            self._schedule_lexical_rebuild(user_id)
+
+        needs_vector = [
+            i
+            for i, results in enumerate(lexical_results)
+            if sum(
+                result["term_coverage"] >= Config.HYBRID_LEXICAL_ONLY_COVERAGE
+                for result in results
+            )
+            < k
+        ]
+        vector_results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if needs_vector:
+            found = await self.vector_store.similarity_search_many(
+                user_id,
+                [queries[i] for i in needs_vector],
+                k=max(k, Config.HYBRID_VECTOR_K),
+            )
+            for i, results in zip(needs_vector, found):
+                vector_results[i] = results
+
+        return [
+            self._rerank(self._fuse_rankings(vector, lexical))[:k]
+            for vector, lexical in zip(vector_results, lexical_results)
+        ]
+
+    def _schedule_lexical_rebuild(self, user_id: str):
+        """Start a background lexical index backfill for a user (once at a time)."""
+        if user_id in _lexical_rebuilds:
+            return
+
+        async def rebuild():
+            try:
+                await self.vector_store.rebuild_lexical_index(user_id)
+            except Exception as e:
+                logging.warning(f"Lexical index rebuild failed for user {user_id}: {e}")
+            finally:
+                _lexical_rebuilds.discard(user_id)
+
+        _lexical_rebuilds.add(user_id)
+        task = asyncio.create_task(rebuild())
+        _lexical_rebuild_tasks.add(task)
+        task.add_done_callback(_lexical_rebuild_tasks.discard)
+
+    def _fuse_rankings(
+        self,
+        vector_results: List[Dict[str, Any]],
+        lexical_results: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Merge vector and lexical rankings with weighted reciprocal rank fusion."""
+        fused: Dict[str, Dict[str, Any]] = {}
+
+        for results, weight, score_key in (
+            (vector_results, Config.HYBRID_VECTOR_WEIGHT, "vector_score"),
+            (lexical_results, Config.HYBRID_LEXICAL_WEIGHT, "lexical_score"),
+        ):
+            for rank, result in enumerate(results):
+                memory_id = result.get("memory_id")
+                if not memory_id:
+                    continue
+
+                entry = fused.get(memory_id)
+                if entry is None:
+                    entry = {**result, "score": 0.0}
+                    entry.pop("term_coverage", None)
+                    fused[memory_id] = entry
+                elif score_key == "lexical_score":
+                    # The lexical index holds the full text (Pinecone only keeps a preview)
+                    entry["content"] = result["content"]
+
+                entry[score_key] = result["score"]
+                entry["score"] += weight / (Config.HYBRID_RRF_K + rank + 1)
+
+        return list(fused.values())
+
+    def _rerank(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Re-rank fused results by recency, emotional-anchor category and stability."""
+        if not results:
+            return []
+
+        top_score = max(result["score"] for result in results) or 1.0
+        now = datetime.utcnow()
+
+        for result in results:
+            metadata = result.get("metadata") or {}
+            boost = 1.0
+
+            timestamp = self._parse_timestamp(metadata.get("timestamp"))
+            if timestamp is not None and Config.HYBRID_RECENCY_HALF_LIFE_DAYS > 0:
+                age_days = max(0.0, (now - timestamp).total_seconds() / 86400)
+                recency = 0.5 ** (age_days / Config.HYBRID_RECENCY_HALF_LIFE_DAYS)
+                boost += Config.HYBRID_RECENCY_WEIGHT * recency
+
+            if metadata.get("memory_category") == "emotional_anchor":
+                boost += Config.HYBRID_ANCHOR_BOOST
+
+            try:
+                stability = float(
+                    metadata.get("stability_score", metadata.get("stability", 0)) or 0
+                )
+            except (TypeError, ValueError):
+                stability = 0.0
+            boost += Config.HYBRID_STABILITY_WEIGHT * stability
+
+            result["score"] = result["score"] / top_score * boost
+
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return results
+
+    def _parse_timestamp(self, value: Any) -> Optional[datetime]:
+        """Parse an ISO timestamp into a naive UTC datetime."""
+        if not value:
+            return None
+        try:
+            timestamp = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
 
     async def get_memory_stats(self, user_id: str) -> MemoryStats:
-        """Get memory statistics for a user."""
+        """Get memory statistics for a user from the incremental counters."""
+        stats_index = self.vector_store.stats_index
+        counters = await stats_index.get_stats(user_id)
+
+        if counters is None:
+            # First read for this user: build the counters from both stores
+            try:
+                await reconcile_user_stats(
+                    user_id,
+                    self.redis_store,
+                    self.vector_store,
+                    stats_index,
+                    self.vector_store.memory_index,
+                )
+                counters = await stats_index.get_stats(user_id)
+            except Exception as e:
+                logging.warning(f"Failed to build memory stats for user {user_id}: {e}")
+
+        if counters is None:
+            # Counters unavailable (no Redis) - count the stores directly
+            return await self._count_memory_stats(user_id)
+
+        return MemoryStats(
+            total=counters["short_term"] + counters["long_term"],
+            short_term=counters["short_term"],
+            long_term=counters["long_term"],
+            sensitive=counters["sensitive"],
+            emotional_anchors=counters["emotional_anchors"],
+            pending_consent=counters["pending_consent"],
+            categories=counters["categories"],
+            recent_activity=counters["recent_activity"],
+            deduplication=await self.vector_store.dedup_index.get_user_stats(user_id),
+        )
+
+    async def _count_memory_stats(self, user_id: str) -> MemoryStats:
+        """Compute memory statistics by reading every memory from both stores."""
         # Get counts from both stores
         try:
             short_term_memories = await self.redis_store.get_user_memories(user_id)
@@ -83,34 +442,36 @@ class RetrievalProcessor:
             short_term_count = 0
             short_term_memories = []
 
-        try:
-            long_term_memories = await self.vector_store.get_user_memories(user_id)
-            long_term_count = len(long_term_memories)
-        except Exception:
-            long_term_count = 0
-            long_term_memories = []
-
-        # Count emotional anchors from both stores
+        # Count emotional anchors, categories and recent activity from both stores
         emotional_anchors_count = 0
-        all_memories = []
+        pending_consent_count = 0
+        categories: Dict[str, int] = {}
+        recent_activity = _RecentActivity()
 
-        # Add short-term memories to all_memories and count emotional anchors
         for memory in short_term_memories:
-            all_memories.append(memory)
-            if memory.metadata.get("memory_category") == "emotional_anchor":
-                emotional_anchors_count += 1
-
-        # Add long-term memories to all_memories and count emotional anchors
-        for memory_dict in long_term_memories:
-            all_memories.append(memory_dict)
-            if (
-                memory_dict.get("metadata", {}).get("memory_category")
-                == "emotional_anchor"
-            ):
+            recent_activity.add(memory)
+            category = memory.metadata.get("memory_category") or "uncategorized"
+            categories[category] = categories.get(category, 0) + 1
+            if category == "emotional_anchor":
                 emotional_anchors_count += 1
+            if memory.metadata.get("pending_long_term_consent"):
+                pending_consent_count += 1
 
-        # Calculate recent activity
-        recent_activity = await self._calculate_recent_activity(all_memories)
+        # Stream long-term memories page by page instead of loading them all
+        long_term_count = 0
+        try:
+            async for memory_dict in self.vector_store.iter_user_memories(user_id):
+                long_term_count += 1
+                recent_activity.add(memory_dict)
+                category = (
+                    memory_dict.get("metadata", {}).get("memory_category")
+                    or "uncategorized"
+                )
+                categories[category] = categories.get(category, 0) + 1
+                if category == "emotional_anchor":
+                    emotional_anchors_count += 1
+        except Exception as e:
+            logging.warning(f"Error streaming long-term memories for stats: {e}")
 
         return MemoryStats(
             total=short_term_count + long_term_count,
@@ -118,13 +479,42 @@ class RetrievalProcessor:
             long_term=long_term_count,
             sensitive=await self._get_sensitive_count(user_id),
             emotional_anchors=emotional_anchors_count,
-            recent_activity=recent_activity,
+            pending_consent=pending_consent_count,
+            categories=categories,
+            recent_activity=recent_activity.as_dict(),
         )
 
     async def get_emotional_anchors(
-        self, user_id: str, conversation_id: Optional[str] = None
+        self,
+        user_id: str,
+        conversation_id: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[MemoryItem]:
         """Get emotional anchors for a user - symbolic memories that provide emotional grounding."""
+        try:
+            # Look the anchors up directly in the category index
+            anchors = await self._get_indexed_memories(
+                user_id,
+                category="emotional_anchor",
+                conversation_id=conversation_id,
+                limit=limit,
+            )
+            if anchors is not None:
+                logging.info(
+                    f"Found {len(anchors)} emotional anchors for user {user_id}"
+                    + (f" in conversation {conversation_id}" if conversation_id else "")
+                )
+                return anchors
+        except Exception as e:
+            logging.warning(f"Emotional anchor index lookup failed: {str(e)}")
+
+        anchors = await self._scan_emotional_anchors(user_id, conversation_id)
+        return anchors[:limit] if limit else anchors
+
+    async def _scan_emotional_anchors(
+        self, user_id: str, conversation_id: Optional[str] = None
+    ) -> List[MemoryItem]:
+        """Find emotional anchors by reading every memory (used without the index)."""
         try:
             # Search both Redis and vector store for comprehensive results
             anchors = []
@@ -150,10 +540,11 @@ class RetrievalProcessor:
 
             # Check vector store (long-term)
             try:
-                all_long_term = await self.vector_store.get_user_memories(user_id)
-                all_long_term = self._convert_memory_dicts_to_memories(all_long_term)
+                async for memory_dict in self.vector_store.iter_user_memories(user_id):
+                    memory = self._convert_memory_dict_to_memory(memory_dict)
+                    if memory is None:
+                        continue
 
-                for memory in all_long_term:
                     # Filter by conversation_id if provided
                     if (
                         conversation_id
@@ -201,28 +592,42 @@ class RetrievalProcessor:
     ) -> List[MemoryItem]:
         """Get regular lasting memories (excluding emotional anchors) for a user."""
         try:
+            all_memories = None
             if query:
-                # Use semantic search
-                search_results = await self.vector_store.similarity_search(
+                # Use hybrid (lexical + semantic) search
+                search_results = await self.hybrid_search(
                     query=query, user_id=user_id, k=20
                 )
                 all_memories = self._convert_search_results_to_memories(search_results)
                 logging.info(
                     f"Query search returned {len(all_memories)} memories for user {user_id}"
                 )
-            else:
-                # Get all long-term memories
-                all_memories = await self.vector_store.get_user_memories(user_id)
-                logging.info(
-                    f"Vector store returned {len(all_memories)} memory dicts for user {user_id}"
+            elif conversation_id:
+                # Look the conversation's long-term memories up in the index
+                all_memories = await self._get_indexed_memories(
+                    user_id, conversation_id=conversation_id, tier=LONG_TERM
                 )
-                all_memories = self._convert_memory_dicts_to_memories(all_memories)
+
+            if all_memories is None:
+                # Stream all long-term memories, keeping only the requested conversation
+                all_memories = []
+                async for memory_dict in self.vector_store.iter_user_memories(user_id):
+                    memory = self._convert_memory_dict_to_memory(memory_dict)
+                    if memory is None:
+                        continue
+                    if (
+                        conversation_id
+                        and memory.metadata.get("conversation_id") != conversation_id
+                    ):
+                        continue
+                    all_memories.append(memory)
                 logging.info(
-                    f"Converted to {len(all_memories)} MemoryItem objects for user {user_id}"
+                    f"Vector store returned {len(all_memories)} memories for user {user_id}"
                 )
 
-            # Filter by conversation_id if provided
-            if conversation_id:
+            # Filter search results by conversation_id if provided
+            # (the index and listing paths already filtered by conversation)
+            if query and conversation_id:
                 filtered_memories = []
                 for memory in all_memories:
                     if memory.metadata.get("conversation_id") == conversation_id:
@@ -247,6 +652,98 @@ class RetrievalProcessor:
             )
             return []
 
+    async def _get_indexed_memories(
+        self,
+        user_id: str,
+        category: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        tier: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[List[MemoryItem]]:
+        """
+        Fetch memories through the category/conversation index, newest first.
+
+        Args:
+            user_id: Validated user ID from JWT
+            category: Only memories with this memory_category
+            conversation_id: Only memories from this conversation
+            tier: Only SHORT_TERM or LONG_TERM memories
+            limit: Maximum number of memories to fetch
+
+        Returns:
+            Short-term then long-term matches, or None when the index is unavailable
+        """
+        index = self.vector_store.memory_index
+        entries = await index.get_memory_ids(
+            user_id, category=category, conversation_id=conversation_id, tier=tier
+        )
+
+        if entries is None:
+            # First lookup for this user: build the index from both stores
+            try:
+                await reconcile_user_stats(
+                    user_id,
+                    self.redis_store,
+                    self.vector_store,
+                    self.vector_store.stats_index,
+                    index,
+                )
+            except Exception as e:
+                logging.warning(f"Failed to build memory index for user {user_id}: {e}")
+                return None
+            entries = await index.get_memory_ids(
+                user_id, category=category, conversation_id=conversation_id, tier=tier
+            )
+            if entries is None:
+                return None
+
+        # Read entries a batch at a time until `limit` live memories are found,
+        # dropping entries whose memory is gone (e.g. the short-term TTL ran out)
+        short_term: List[MemoryItem] = []
+        long_term: List[MemoryItem] = []
+        position = 0
+        while position < len(entries):
+            wanted = limit - len(short_term) - len(long_term) if limit else len(entries)
+            if wanted <= 0:
+                break
+            batch = entries[position : position + wanted]
+            position += len(batch)
+
+            short_term_ids = [memory_id for t, memory_id in batch if t == SHORT_TERM]
+            long_term_ids = [memory_id for t, memory_id in batch if t == LONG_TERM]
+            try:
+                found_short = await self.redis_store.get_memories(
+                    user_id, short_term_ids
+                )
+                found_long = await self.vector_store.get_memories(
+                    user_id, long_term_ids
+                )
+            except Exception as e:
+                # Unknown which memories still exist, so leave the index alone
+                logging.warning(f"Failed to read indexed memories for {user_id}: {e}")
+                return None
+
+            for stale_tier, ids, found in (
+                (SHORT_TERM, short_term_ids, found_short),
+                (LONG_TERM, long_term_ids, found_long),
+            ):
+                stale = [memory_id for memory_id in ids if memory_id not in found]
+                if stale:
+                    await index.remove_memories(user_id, stale_tier, stale)
+
+            short_term.extend(
+                found_short[memory_id]
+                for memory_id in short_term_ids
+                if memory_id in found_short
+            )
+            for memory_id in long_term_ids:
+                if memory_id in found_long:
+                    memory = self._convert_memory_dict_to_memory(found_long[memory_id])
+                    if memory is not None:
+                        long_term.append(memory)
+
+        return short_term + long_term
+
     async def get_user_memories(
         self,
         user_id: str,
@@ -257,7 +754,6 @@ class RetrievalProcessor:
         try:
             # Get memories from both stores
             short_term_memories = await self.redis_store.get_user_memories(user_id)
-            long_term_memories = await self.vector_store.get_user_memories(user_id)
 
             all_memories = []
 
@@ -267,7 +763,7 @@ class RetrievalProcessor:
                 all_memories.append(memory_dict)
 
             # Process long-term memories - they're already dictionaries from vector store
-            for memory_dict in long_term_memories:
+            async for memory_dict in self.vector_store.iter_user_memories(user_id):
                 # Vector store returns dictionaries, so we need to add storage_type
                 memory_dict = dict(memory_dict)  # Create a copy
                 memory_dict["storage_type"] = "long_term"
@@ -387,56 +883,61 @@ class RetrievalProcessor:
         """Convert memory dictionaries to MemoryItem objects."""
         memories = []
         for mem_dict in memory_dicts:
-            try:
-                # Ensure we have the required fields
-                if not mem_dict.get("memory_id") and not mem_dict.get("id"):
-                    logging.warning(
-                        f"Memory dict missing id/memory_id field: {mem_dict}"
-                    )
-                    continue
-
-                memory_id = mem_dict.get("memory_id") or mem_dict.get("id")
-                content = mem_dict.get("content", "")
-                metadata = mem_dict.get("metadata", {})
-
-                # Handle timestamp conversion more robustly
-                timestamp_str = mem_dict.get("timestamp")
-                if timestamp_str:
-                    if isinstance(timestamp_str, str):
-                        try:
-                            timestamp = datetime.fromisoformat(
-                                timestamp_str.replace("Z", "+00:00")
-                            )
-                        except ValueError:
-                            # Try parsing without timezone info
-                            timestamp = datetime.fromisoformat(
-                                timestamp_str.split("+")[0].split("Z")[0]
-                            )
-                    else:
-                        timestamp = timestamp_str  # Assume it's already a datetime
-                else:
-                    timestamp = datetime.utcnow()
-
-                memory = MemoryItem(
-                    id=memory_id,
-                    content=content,
-                    type=metadata.get("type", "chat"),
-                    timestamp=timestamp,
-                    metadata=metadata,
-                )
+            memory = self._convert_memory_dict_to_memory(mem_dict)
+            if memory is not None:
                 memories.append(memory)
-            except Exception as e:
-                logging.error(
-                    f"Failed to convert memory dict to memory: {e}, dict: {mem_dict}"
-                )
-                # Skip this memory rather than adding a broken one
-                continue
 
         logging.info(
             f"Converted {len(memories)} out of {len(memory_dicts)} memory dicts to MemoryItem objects"
         )
         return memories
 
+    def _convert_memory_dict_to_memory(
+        self, mem_dict: Dict[str, Any]
+    ) -> Optional[MemoryItem]:
+        """Convert one memory dictionary to a MemoryItem (None if it is malformed)."""
+        try:
+            # Ensure we have the required fields
+            if not mem_dict.get("memory_id") and not mem_dict.get("id"):
+                logging.warning(f"Memory dict missing id/memory_id field: {mem_dict}")
+                return None
+
+            memory_id = mem_dict.get("memory_id") or mem_dict.get("id")
+            content = mem_dict.get("content", "")
+            metadata = mem_dict.get("metadata", {})
+
+            # Handle timestamp conversion more robustly
+            timestamp_str = mem_dict.get("timestamp")
+            if timestamp_str:
+                if isinstance(timestamp_str, str):
+                    try:
+                        timestamp = datetime.fromisoformat(
+                            timestamp_str.replace("Z", "+00:00")
+                        )
+                    except ValueError:
+                        # Try parsing without timezone info
+                        timestamp = datetime.fromisoformat(
+                            timestamp_str.split("+")[0].split("Z")[0]
+                        )
+                else:
+                    timestamp = timestamp_str  # Assume it's already a datetime
+            else:
+                timestamp = datetime.utcnow()
+
+            return MemoryItem(
+                id=memory_id,
+                content=content,
+                type=metadata.get("type", "chat"),
+                timestamp=timestamp,
+                metadata=metadata,
+            )
+        except Exception as e:
+            logging.error(
+                f"Failed to convert memory dict to memory: {e}, dict: {mem_dict}"
+            )
+            # Skip this memory rather than adding a broken one
+            return None
+
     async def _generate_digest(self, memories: List[MemoryItem]) -> str:
         """Generate a digest of memories."""
         if not memories:
@@ -472,71 +973,3 @@ class RetrievalProcessor:
             return sensitive_count
         except Exception:
             return 0
-
-    async def _calculate_recent_activity(self, all_memories) -> Dict[str, Any]:
-        """Calculate recent memory activity statistics."""
-        from datetime import datetime, timedelta
-        import logging
-
-        now = datetime.utcnow()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_start = now - timedelta(days=7)
-
-        memories_today = 0
-        memories_this_week = 0
-        last_memory_timestamp = None
-        latest_timestamp = None
-
-        logging.info(f"Calculating recent activity for {len(all_memories)} memories")
-        logging.info(f"Today start: {today_start}, Week start: {week_start}")
-
-        for memory in all_memories:
-            # Handle both MemoryItem objects and dictionaries
-            if hasattr(memory, "timestamp"):
-                timestamp = memory.timestamp
-            elif isinstance(memory, dict):
-                timestamp_str = memory.get("timestamp") or memory.get(
-                    "metadata", {}
-                ).get("timestamp")
-                if timestamp_str:
-                    try:
-                        # Handle various timestamp formats
-                        if timestamp_str.endswith("Z"):
-                            timestamp = datetime.fromisoformat(
-                                timestamp_str.replace("Z", "+00:00")
-                            )
-                        elif "+" in timestamp_str or timestamp_str.endswith("00:00"):
-                            timestamp = datetime.fromisoformat(timestamp_str)
-                        else:
-                            # Assume UTC if no timezone info
-                            timestamp = datetime.fromisoformat(timestamp_str)
-                    except Exception as e:
-                        logging.warning(
-                            f"Failed to parse timestamp {timestamp_str}: {e}"
-                        )
-                        continue
-                else:
-                    continue
-            else:
-                continue
-
-            # Track latest timestamp
-            if latest_timestamp is None or timestamp > latest_timestamp:
-                latest_timestamp = timestamp
-                last_memory_timestamp = timestamp.isoformat()
-
-            # Count memories today and this week
-            if timestamp >= today_start:
-                memories_today += 1
-            if timestamp >= week_start:
-                memories_this_week += 1
-
-        logging.info(
-            f"Recent activity calculated: today={memories_today}, week={memories_this_week}"
-        )
-
-        return {
-            "memories_added_today": memories_today,
-            "memories_added_this_week": memories_this_week,
-            "last_memory_timestamp": last_memory_timestamp,
-        }
@@ -0,0 +1,191 @@
+"""
+Memory stats reconciliation.
+
+Rebuilds a user's incremental memory counters, category/conversation index
+and near-duplicate signatures from the stores themselves. Runs once for users whose counters or index
+were never built, and periodically for everyone else to correct drift (e.g.
+writes made while Redis was down).
+"""
+
+import time
+import asyncio
+import logging
+from typing import List, Tuple
+
+from utils.single_flight import single_flight
+
+from .config import Config
+from .storage.redis_store import RedisStore
+from .storage.vector_store import VectorStore
+from .storage.memory_stats import MemoryStatsIndex, StatsEntry, memory_stats_index
+from .storage.memory_index import MemoryIndex, memory_index
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Upper bound on short-term memories read back for a recount
+_SHORT_TERM_RECOUNT_LIMIT = 10000
+
+# Recounts discarded because memories changed while the stores were read
+# are retried this many times before waiting for the next pass
+_RECOUNT_ATTEMPTS = 3
+
+# Concurrent first reads for a user share one recount
+_reconcile_flight = single_flight("memory_reconcile")
+
+
+async def reconcile_user_stats(
+    user_id: str,
+    redis_store: RedisStore,
+    vector_store: VectorStore,
+    stats_index: MemoryStatsIndex = memory_stats_index,
+    index: MemoryIndex = memory_index,
+) -> None:
+    """
+    Recount a user's memories from both stores and replace their counters,
+    category/conversation index and near-duplicate signatures.
+
+    Args:
+        user_id: Validated user ID from JWT
+        redis_store: Short-term store to recount
+        vector_store: Long-term store to recount
+        stats_index: Counters to rebuild
+        index: Secondary index to rebuild
+    """
+    await _reconcile_flight.do(
+        user_id,
+        lambda: _reconcile_user_stats(
+            user_id, redis_store, vector_store, stats_index, index
+        ),
+    )
+
+
+async def _reconcile_user_stats(
+    user_id: str,
+    redis_store: RedisStore,
+    vector_store: VectorStore,
+    stats_index: MemoryStatsIndex,
+    index: MemoryIndex,
+) -> None:
+    for attempt in range(_RECOUNT_ATTEMPTS):
+        if await _recount_user(user_id, redis_store, vector_store, stats_index, index):
+            return
+        logger.debug(
+            f"Memories changed during recount {attempt + 1} for user {user_id}; "
+            f"recounting again"
+        )
+    logger.warning(
+        f"Gave up reconciling memory stats for user {user_id} after "
+        f"{_RECOUNT_ATTEMPTS} recounts; memories kept changing"
+    )
+
+
+async def _recount_user(
+    user_id: str,
+    redis_store: RedisStore,
+    vector_store: VectorStore,
+    stats_index: MemoryStatsIndex,
+    index: MemoryIndex,
+) -> bool:
+    """
+    Recount a user's memories once.
+
+    Returns:
+        False if memories were stored or deleted while the stores were read,
+        in which case nothing was replaced
+    """
+    # Read before the stores, so changes made while reading them are detected
+    version = await stats_index.get_version(user_id)
+
+    short_term_memories = await redis_store.get_user_memories(
+        user_id, limit=_SHORT_TERM_RECOUNT_LIMIT
+    )
+    ttls = await redis_store.get_memory_ttls(
+        user_id, [memory.id for memory in short_term_memories]
+    )
+    short_term: List[StatsEntry] = [
+        (memory.id, memory.metadata, memory.timestamp.isoformat(), ttls.get(memory.id))
+        for memory in short_term_memories
+    ]
+
+    long_term: List[StatsEntry] = []
+    signatures: List[Tuple[str, str]] = []
+    async for memory in vector_store.iter_user_memories(user_id):
+        metadata = memory.get("metadata") or {}
+        long_term.append(
+            (memory["memory_id"], metadata, memory.get("timestamp") or "", None)
+        )
+        signatures.append((memory["memory_id"], memory.get("content") or ""))
+
+    if not await stats_index.rebuild_user(user_id, short_term, long_term, version):
+        return False
+    await index.rebuild_user(
+        user_id,
+        [entry[:3] for entry in short_term],
+        [entry[:3] for entry in long_term],
+    )
+
+    # Pinecone only keeps a content preview, so keep the signatures written
+    # from full content at store time rather than rebuilding from previews
+    if Config.MEMORY_DEDUP_ENABLED and not vector_store.use_pinecone:
+        await vector_store.dedup_index.rebuild_user(user_id, signatures)
+    logger.debug(
+        f"Reconciled memory stats for user {user_id}: "
+        f"{len(short_term)} short-term, {len(long_term)} long-term"
+    )
+    return True
+
+
+class MemoryStatsReconciler:
+    """Worker that periodically recounts memory stats, a batch of users at a time."""
+
+    def __init__(self):
+        self.redis_store = RedisStore()
+        self.vector_store = VectorStore(
+            persist_directory=Config.CHROMA_PERSIST_DIR,
+            use_pinecone=Config.USE_PINECONE,
+            vector_db_type=Config.VECTOR_DB_TYPE,
+        )
+        self.check_interval = Config.MEMORY_STATS_RECONCILE_CHECK_SECONDS
+        self.reconcile_interval = Config.MEMORY_STATS_RECONCILE_INTERVAL_SECONDS
+        self.batch_size = Config.MEMORY_STATS_RECONCILE_BATCH_SIZE
+        self.running = False
+
+    async def start(self):
+        """Start the reconciliation worker."""
+        self.running = True
+        logger.info("Memory stats reconciler started")
+
+        while self.running:
+            try:
+                await self.reconcile_due_users()
+                await asyncio.sleep(self.check_interval)
+
+            except Exception as e:
+                logger.error(f"Error in memory stats reconciler: {e}")
+                await asyncio.sleep(self.check_interval)
+
+    def stop(self):
+        """Stop the reconciliation worker."""
+        self.running = False
+        logger.info("Memory stats reconciler stopped")
+
+    async def reconcile_due_users(self) -> int:
+        """Reconcile users not reconciled within the last interval."""
+        user_ids = await memory_stats_index.users_due_for_reconcile(
+            older_than=time.time() - self.reconcile_interval, limit=self.batch_size
+        )
+
+        for user_id in user_ids:
+            try:
+                await reconcile_user_stats(user_id, self.redis_store, self.vector_store)
+            except Exception as e:
+                logger.error(
+                    f"Failed to reconcile memory stats for user {user_id}: {e}"
+                )
+
+        return len(user_ids)
+
+
+# Global instance
+memory_stats_reconciler = MemoryStatsReconciler()
@@ -0,0 +1,216 @@
+"""
+Memory Context Cache.
+
+Caches the assembled MemoryContext (short-term list, long-term search results
+and digest) per user, conversation and query, so repeated context requests
+within a conversation skip Redis reads, embedding and search until a write
+actually happens:
+
+- user:{uid}:memory_version                  - bumped by every user-scoped
+                                               short-term write and every
+                                               long-term write or delete
+- conversation:{cid}:memory_version          - bumped by conversation writes
+- user:{uid}:memory_context:{scope}:{query}  - JSON of the context plus the
+                                               versions it was built from
+
+An entry is only served while both versions still match, so writes only
+bump a version. Erasing a user's memories also deletes their entries, since
+those hold memory content.
+"""
+
+import json
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from utils.redis_client import get_redis_client
+
+from ..types import MemoryItem, MemoryContext
+from ..config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class MemoryContextCache:
+    """Version-checked cache of assembled memory contexts in Redis."""
+
+    KEY_PREFIX = "memory_context"
+
+    # Versions must outlive any entry built from them
+    VERSION_TTL = timedelta(days=7)
+
+    def __init__(self):
+        self.ttl_seconds = Config.MEMORY_CONTEXT_CACHE_TTL_SECONDS
+
+    def user_version_key(self, user_id: str) -> str:
+        return f"user:{user_id}:memory_version"
+
+    def _conversation_version_key(self, conversation_id: str) -> str:
+        return f"conversation:{conversation_id}:memory_version"
+
+    def _entry_key(
+        self, user_id: str, conversation_id: Optional[str], query: Optional[str]
+    ) -> str:
+        scope = f"conversation:{conversation_id}" if conversation_id else "user"
+        query_key = (
+            hashlib.sha256(query.encode("utf-8")).hexdigest()[:32]
+            if query
+            else "recent"
+        )
+        return f"user:{user_id}:{self.KEY_PREFIX}:{scope}:{query_key}"
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Memory context cache running without Redis: {e}")
+            return None
+
+    async def get(
+        self,
+        user_id: str,
+        conversation_id: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> Tuple[Optional[MemoryContext], Optional[str]]:
+        """
+        Look up a cached context.
+
+        Args:
+            user_id: Validated user ID from JWT
+            conversation_id: Conversation the context is scoped to
+            query: Query the context was retrieved for
+
+        Returns:
+            Tuple of (cached context or None, current version to store a
+            freshly built context under, or None when Redis is unavailable)
+        """
+        client = await self._get_client()
+        if not client:
+            return None, None
+
+        try:
+            keys = [
+                self._entry_key(user_id, conversation_id, query),
+                self.user_version_key(user_id),
+            ]
+            if conversation_id:
+                keys.append(self._conversation_version_key(conversation_id))
+            entry, *versions = await client.mget(keys)
+            version = ":".join(str(v or 0) for v in versions)
+
+            if entry:
+                data = json.loads(entry)
+                if data.get("version") == version:
+                    return self._context_from_dict(data["context"]), version
+
+            return None, version
+
+        except Exception as e:
+            logger.warning(f"Memory context cache read failed for {user_id}: {e}")
+            return None, None
+
+    async def set(
+        self,
+        user_id: str,
+        conversation_id: Optional[str],
+        query: Optional[str],
+        version: str,
+        context: MemoryContext,
+    ) -> None:
+        """Cache a context built while the stores were at `version`."""
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            await client.setex(
+                self._entry_key(user_id, conversation_id, query),
+                self.ttl_seconds,
+                json.dumps(
+                    {"version": version, "context": self._context_to_dict(context)},
+                    default=str,
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Memory context cache write failed for {user_id}: {e}")
+
+    async def invalidate_user(self, user_id: str) -> None:
+        """Invalidate every cached context for a user."""
+        await self._bump(self.user_version_key(user_id))
+
+    async def clear_user(self, user_id: str) -> None:
+        """Delete every cached context for a user (for memory erasure)."""
+        # Bump first so a context built concurrently is never served
+        await self.invalidate_user(user_id)
+
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            keys = [
+                key
+                async for key in client.scan_iter(
+                    match=f"user:{user_id}:{self.KEY_PREFIX}:*", count=500
+                )
+            ]
+            for i in range(0, len(keys), 500):
+                await client.delete(*keys[i : i + 500])
+        except Exception as e:
+            logger.warning(f"Failed to clear memory context cache for {user_id}: {e}")
+
+    async def invalidate_conversation(self, conversation_id: str) -> None:
+        """Invalidate cached contexts scoped to a conversation."""
+        await self._bump(self._conversation_version_key(conversation_id))
+
+    async def _bump(self, version_key: str) -> None:
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.incr(version_key)
+            pipe.expire(version_key, self.VERSION_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to bump memory version {version_key}: {e}")
+
+    def _context_to_dict(self, context: MemoryContext) -> Dict[str, Any]:
+        def memory_to_dict(memory: MemoryItem) -> Dict[str, Any]:
+            return {
+                "id": memory.id,
+                "content": memory.content,
+                "type": memory.type,
+                "timestamp": memory.timestamp.isoformat(),
+                "metadata": memory.metadata,
+            }
+
+        return {
+            "short_term": [memory_to_dict(m) for m in context.short_term],
+            "long_term": [memory_to_dict(m) for m in context.long_term],
+            "digest": context.digest,
+        }
+
+    def _context_from_dict(self, data: Dict[str, Any]) -> MemoryContext:
+        def memory_from_dict(memory: Dict[str, Any]) -> MemoryItem:
+            return MemoryItem(
+                id=memory["id"],
+                content=memory["content"],
+                type=memory["type"],
+                timestamp=datetime.fromisoformat(memory["timestamp"]),
+                metadata=memory.get("metadata", {}),
+            )
+
+        return MemoryContext(
+            short_term=[memory_from_dict(m) for m in data["short_term"]],
+            long_term=[memory_from_dict(m) for m in data["long_term"]],
+            digest=data["digest"],
+        )
+
+
+# Create global instance (shared by every store in the process)
+memory_context_cache = MemoryContextCache()
@@ -0,0 +1,303 @@
+"""
+Near-Duplicate Memory Index.
+
+Per-user SimHash signatures of long-term memories, kept in Redis and updated
+whenever the vector store writes or deletes memories, so a new memory can be
+checked against everything the user already treasured without a vector search:
+
+- user:{uid}:memory_dedup:signatures          - hash of memory_id -> signature
+- user:{uid}:memory_dedup:band:{band}:{value} - set of memory IDs whose
+                                                signature has `value` in `band`
+- user:{uid}:memory_dedup:stats               - hash of dedup outcome counters
+
+Signatures are 64-bit SimHashes over content terms and term bigrams. They are
+split into MEMORY_DEDUP_MAX_DISTANCE + 1 bands, so any two signatures within
+that Hamming distance share at least one band exactly and a lookup only reads
+a handful of small sets.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from utils.redis_client import get_redis_client
+
+from ..config import Config
+from .lexical_index import tokenize
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SIGNATURE_BITS = 64
+
+# Outcomes counted per user and per process
+DEDUP_OUTCOMES = (
+    "checked",
+    "duplicates",
+    "merged",
+    "refreshed",
+    "skipped",
+    "cosine_rejected",
+)
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    Compute the 64-bit SimHash of a text.
+
+    Args:
+        text: Memory content
+
+    Returns:
+        Signature, or None when the text has no indexable terms
+    """
+    terms = tokenize(text)
+    if not terms:
+        return None
+
+    features = Counter(terms)
+    features.update(f"{first} {second}" for first, second in zip(terms, terms[1:]))
+
+    weights = [0] * SIGNATURE_BITS
+    for feature, weight in features.items():
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(SIGNATURE_BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two signatures."""
+    return bin(first ^ second).count("1")
+
+
+class MemoryDedupIndex:
+    """Per-user SimHash signature index of long-term memories stored in Redis."""
+
+    KEY_PREFIX = "memory_dedup"
+
+    def __init__(self):
+        self.max_distance = max(0, Config.MEMORY_DEDUP_MAX_DISTANCE)
+        bands = min(self.max_distance + 1, SIGNATURE_BITS)
+        self._band_bounds = [
+            (SIGNATURE_BITS * band // bands, SIGNATURE_BITS * (band + 1) // bands)
+            for band in range(bands)
+        ]
+        self._stats = {outcome: 0 for outcome in DEDUP_OUTCOMES}
+
+    def _key(self, user_id: str, suffix: str) -> str:
+        return f"user:{user_id}:{self.KEY_PREFIX}:{suffix}"
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Memory dedup index running without Redis: {e}")
+            return None
+
+    def _band_keys(self, user_id: str, signature: int) -> List[str]:
+        """Keys of the band sets a signature belongs to."""
+        keys = []
+        for band, (start, end) in enumerate(self._band_bounds):
+            value = signature >> start & ((1 << (end - start)) - 1)
+            keys.append(self._key(user_id, f"band:{band}:{value:x}"))
+        return keys
+
+    async def add_memories(self, user_id: str, entries: List[Tuple[str, str]]) -> bool:
+        """
+        Index (or re-index) stored memories.
+
+        Args:
+            user_id: Validated user ID from JWT
+            entries: (memory_id, content) tuples
+
+        Returns:
+            Success status
+        """
+        client = await self._get_client()
+        if not client or not entries:
+            return False
+
+        try:
+            signatures_key = self._key(user_id, "signatures")
+            previous = await client.hmget(
+                signatures_key, [memory_id for memory_id, _ in entries]
+            )
+
+            pipe = client.pipeline(transaction=True)
+            for (memory_id, content), value in zip(entries, previous):
+                # Re-indexing a memory moves it out of its previous bands
+                if value:
+                    for key in self._band_keys(user_id, int(value, 16)):
+                        pipe.srem(key, memory_id)
+
+                signature = simhash(content)
+                if signature is None:
+                    pipe.hdel(signatures_key, memory_id)
+                    continue
+
+                for key in self._band_keys(user_id, signature):
+                    pipe.sadd(key, memory_id)
+                pipe.hset(signatures_key, memory_id, f"{signature:016x}")
+
+            await pipe.execute()
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to update dedup index for user {user_id}: {e}")
+            return False
+
+    async def remove_memories(self, user_id: str, memory_ids: List[str]) -> int:
+        """
+        Remove memories from a user's index.
+
+        Args:
+            user_id: Validated user ID from JWT
+            memory_ids: Memory IDs to remove
+
+        Returns:
+            Number of indexed memories removed
+        """
+        client = await self._get_client()
+        if not client or not memory_ids:
+            return 0
+
+        try:
+            signatures_key = self._key(user_id, "signatures")
+            values = await client.hmget(signatures_key, memory_ids)
+
+            pipe = client.pipeline(transaction=True)
+            removed = 0
+            for memory_id, value in zip(memory_ids, values):
+                if value is None:
+                    continue
+                for key in self._band_keys(user_id, int(value, 16)):
+                    pipe.srem(key, memory_id)
+                pipe.hdel(signatures_key, memory_id)
+                removed += 1
+
+            if removed:
+                await pipe.execute()
+            return removed
+
+        except Exception as e:
+            logger.warning(f"Failed to remove dedup entries for user {user_id}: {e}")
+            return 0
+
+    async def clear_user(self, user_id: str) -> None:
+        """Drop a user's signatures (outcome counters are kept)."""
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            keys = [
+                key
+                async for key in client.scan_iter(
+                    match=self._key(user_id, "*"), count=500
+                )
+                if key != self._key(user_id, "stats")
+            ]
+            for i in range(0, len(keys), 500):
+                await client.delete(*keys[i : i + 500])
+
+        except Exception as e:
+            logger.warning(f"Failed to clear dedup index for user {user_id}: {e}")
+
+    async def find_candidates(
+        self, user_id: str, content: str
+    ) -> List[Tuple[str, int]]:
+        """
+        Find memories whose signature is within MEMORY_DEDUP_MAX_DISTANCE.
+
+        Args:
+            user_id: Validated user ID from JWT
+            content: Content of the memory about to be stored
+
+        Returns:
+            (memory_id, Hamming distance) pairs, closest first
+        """
+        signature = simhash(content)
+        client = await self._get_client()
+        if signature is None or not client:
+            return []
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key in self._band_keys(user_id, signature):
+                pipe.smembers(key)
+            memory_ids = sorted(set().union(*await pipe.execute()))
+            if not memory_ids:
+                return []
+
+            values = await client.hmget(self._key(user_id, "signatures"), memory_ids)
+            candidates = []
+            for memory_id, value in zip(memory_ids, values):
+                if value is None:
+                    continue
+                distance = hamming_distance(signature, int(value, 16))
+                if distance <= self.max_distance:
+                    candidates.append((memory_id, distance))
+
+            return sorted(candidates, key=lambda candidate: candidate[1])
+
+        except Exception as e:
+            logger.warning(f"Dedup lookup failed for user {user_id}: {e}")
+            return []
+
+    async def record_outcomes(self, user_id: str, *outcomes: str) -> None:
+        """Count dedup outcomes for a user and for this process."""
+        for outcome in outcomes:
+            self._stats[outcome] += 1
+
+        client = await self._get_client()
+        if not client or not outcomes:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for outcome in outcomes:
+                pipe.hincrby(self._key(user_id, "stats"), outcome, 1)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Failed to record dedup outcomes for user {user_id}: {e}")
+
+    async def get_user_stats(self, user_id: str) -> Dict[str, int]:
+        """Dedup outcome counters for a user."""
+        counters = {outcome: 0 for outcome in DEDUP_OUTCOMES}
+        client = await self._get_client()
+        if not client:
+            return counters
+
+        try:
+            values = await client.hgetall(self._key(user_id, "stats"))
+            for outcome, value in values.items():
+                if outcome in counters:
+                    counters[outcome] = int(value)
+        except Exception as e:
+            logger.debug(f"Failed to read dedup stats for user {user_id}: {e}")
+        return counters
+
+    async def rebuild_user(self, user_id: str, entries: List[Tuple[str, str]]) -> None:
+        """
+        Replace a user's signatures with entries for every stored memory.
+
+        Args:
+            user_id: Validated user ID from JWT
+            entries: (memory_id, content) for every long-term memory stored
+        """
+        await self.clear_user(user_id)
+        for start in range(0, len(entries), 500):
+            await self.add_memories(user_id, entries[start : start + 500])
+
+    def get_stats(self) -> Dict[str, int]:
+        """Dedup outcome counters for this process."""
+        return {**self._stats, "max_distance": self.max_distance}
+
+
+# Create global instance (shared by every store in the process)
+memory_dedup_index = MemoryDedupIndex()
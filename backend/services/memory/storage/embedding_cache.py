@@ -0,0 +1,145 @@
+"""
+Embedding Cache for Vector Storage.
+
+Content-addressed, two-tier cache for text embeddings:
+1. In-process LRU (bounded by EMBEDDING_CACHE_SIZE entries), holding NumPy
+   vectors quantized to EMBEDDING_CACHE_DTYPE (float16 by default)
+2. Redis (shared across workers, expires after EMBEDDING_CACHE_TTL_SECONDS),
+   holding exact float32 vectors
+
+Entries are keyed by (model, task_type, normalized-text hash), so the same
+text embedded by the search path and by the storage path is only sent to the
+embedding API once. Lookups for vectors that will be written to a vector
+store ask for exact embeddings, which skip a quantized LRU and are served
+from Redis (or re-embedded). Per-user tracking for GDPR purges is inherited
+from TwoTierCache.
+"""
+
+import base64
+import hashlib
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from utils.two_tier_cache import TwoTierCache
+
+from ..config import Config
+from .quantization import as_matrix, dequantize, quantize, resolve_dtype
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache(TwoTierCache):
+    """Two-tier (in-process LRU + Redis) cache for text embeddings."""
+
+    KEY_PREFIX = "embedding_cache"
+    ITEM_NAME = "embeddings"
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        dtype: Optional[str] = None,
+    ):
+        super().__init__(
+            max_entries if max_entries is not None else Config.EMBEDDING_CACHE_SIZE,
+            (
+                ttl_seconds
+                if ttl_seconds is not None
+                else Config.EMBEDDING_CACHE_TTL_SECONDS
+            ),
+        )
+        self.dtype = resolve_dtype(dtype or Config.EMBEDDING_CACHE_DTYPE)
+
+    def _content_hash(self, text: str, task_type: str, model: str) -> str:
+        """Hash (model, task_type, normalized text) into a cache id."""
+        payload = f"{model}\x1f{task_type}\x1f{self._normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _encode(self, embedding: np.ndarray) -> str:
+        """Pack an embedding as base64 float32 (much smaller than JSON)."""
+        return base64.b64encode(
+            np.asarray(embedding, dtype=np.float32).tobytes()
+        ).decode("ascii")
+
+    def _decode(self, value: str) -> np.ndarray:
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+
+    def _to_lru(
+        self, embedding: np.ndarray
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Quantize an embedding to (codes, int8 scale or None)."""
+        return quantize(as_matrix(embedding), self.dtype)
+
+    def _from_lru(self, entry: Tuple[np.ndarray, Optional[np.ndarray]]) -> np.ndarray:
+        codes, scales = entry
+        return dequantize(codes, scales).reshape(-1)
+
+    async def get_many(
+        self,
+        texts: List[str],
+        task_type: str,
+        model: Optional[str] = None,
+        user_id: Optional[str] = None,
+        exact: bool = False,
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+            task_type: Embedding task type
+            model: Embedding model (defaults to Config.EMBEDDING_MODEL)
+            user_id: Owner of the texts; hits are tracked for per-user deletion
+            exact: Only return unquantized float32 embeddings (for vectors
+                that will be stored), bypassing a quantized in-process LRU
+
+        Returns:
+            One entry per text: the cached float32 embedding, or None on a miss
+        """
+        model = model or Config.EMBEDDING_MODEL
+        hashes = [self._content_hash(text, task_type, model) for text in texts]
+        return await self._lookup(
+            hashes,
+            [user_id] * len(hashes),
+            use_lru=not exact or self.dtype == "float32",
+        )
+
+    async def set_many(
+        self,
+        texts: List[str],
+        task_type: str,
+        embeddings: np.ndarray,
+        user_id: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        """
+        Cache embeddings in both tiers.
+
+        Args:
+            texts: Texts that were embedded
+            task_type: Embedding task type
+            embeddings: Embeddings, aligned with texts
+            user_id: Owner of the texts, tracked for per-user deletion
+            model: Embedding model (defaults to Config.EMBEDDING_MODEL)
+        """
+        model = model or Config.EMBEDDING_MODEL
+        hashes = [self._content_hash(text, task_type, model) for text in texts]
+        await self._store(hashes, list(embeddings), [user_id] * len(hashes))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and LRU size for the cache."""
+        return {
+            **super().get_stats(),
+            "memory_bytes": sum(
+                codes.nbytes + (scales.nbytes if scales is not None else 0)
+                for codes, scales in self._lru.values()
+            ),
+            "dtype": self.dtype,
+        }
+
+
+# Create global instance (shared by every VectorStore in the process)
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,307 @@
+"""
+Lexical (BM25) Index for Long-term Memory Search.
+
+Per-user inverted index kept in Redis and updated incrementally whenever the
+vector store writes or deletes memories:
+
+- user:{uid}:lexical:postings:{term} - hash of memory_id -> term frequency
+- user:{uid}:lexical:lengths         - hash of memory_id -> document length
+- user:{uid}:lexical:doc:{memory_id} - hash with content, metadata and terms
+- user:{uid}:lexical:stats           - hash with doc_count and total_length
+
+Searches score candidates with Okapi BM25 and need no embedding call.
+"""
+
+import json
+import math
+import re
+import logging
+from typing import Dict, Any, List, Tuple
+
+from utils.redis_client import get_redis_client
+
+from ..config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+_STOPWORDS = frozenset("""
+    a about after again all also am an and any are as at be because been before
+    being but by can could did do does doing don't for from had has have having
+    he her here hers him his how i i'm if in into is it it's its just me more
+    most my no not now of on once only or other our ours out over own same she
+    should so some such than that the their them then there these they this
+    those through to too under until up very was we were what when where which
+    while who whom why will with would you your yours
+    """.split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase index terms, dropping stopwords."""
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall((text or "").lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+class LexicalIndex:
+    """Per-user BM25 inverted index stored in Redis."""
+
+    KEY_PREFIX = "lexical"
+
+    # Okapi BM25 parameters
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    def __init__(self):
+        self.max_query_terms = Config.LEXICAL_MAX_QUERY_TERMS
+
+    def _key(self, user_id: str, suffix: str) -> str:
+        return f"user:{user_id}:{self.KEY_PREFIX}:{suffix}"
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Lexical index running without Redis: {e}")
+            return None
+
+    async def add_documents(
+        self, user_id: str, documents: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> bool:
+        """
+        Index (or re-index) memories for a user.
+
+        Args:
+            user_id: Validated user ID from JWT
+            documents: (memory_id, content, metadata) tuples
+
+        Returns:
+            Success status
+        """
+        client = await self._get_client()
+        if not client or not documents:
+            return False
+
+        try:
+            # Re-indexing a memory replaces its previous postings
+            await self.remove_documents(
+                user_id, [memory_id for memory_id, _, _ in documents]
+            )
+
+            pipe = client.pipeline(transaction=True)
+            total_length = 0
+
+            for memory_id, content, metadata in documents:
+                terms = tokenize(content)
+                frequencies: Dict[str, int] = {}
+                for term in terms:
+                    frequencies[term] = frequencies.get(term, 0) + 1
+
+                for term, frequency in frequencies.items():
+                    pipe.hset(
+                        self._key(user_id, f"postings:{term}"), memory_id, frequency
+                    )
+
+                pipe.hset(self._key(user_id, "lengths"), memory_id, len(terms))
+                pipe.hset(
+                    self._key(user_id, f"doc:{memory_id}"),
+                    mapping={
+                        "content": content,
+                        "metadata": json.dumps(metadata, default=str),
+                        "terms": " ".join(frequencies),
+                        "length": len(terms),
+                    },
+                )
+                total_length += len(terms)
+
+            stats_key = self._key(user_id, "stats")
+            pipe.hincrby(stats_key, "doc_count", len(documents))
+            pipe.hincrby(stats_key, "total_length", total_length)
+            await pipe.execute()
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to update lexical index for user {user_id}: {e}")
+            return False
+
+    async def remove_documents(self, user_id: str, memory_ids: List[str]) -> int:
+        """
+        Remove memories from a user's index.
+
+        Args:
+            user_id: Validated user ID from JWT
+            memory_ids: Memory IDs to remove
+
+        Returns:
+            Number of indexed memories removed
+        """
+        client = await self._get_client()
+        if not client or not memory_ids:
+            return 0
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for memory_id in memory_ids:
+                pipe.hmget(self._key(user_id, f"doc:{memory_id}"), "terms", "length")
+            indexed = await pipe.execute()
+
+            pipe = client.pipeline(transaction=True)
+            removed = 0
+            removed_length = 0
+
+            for memory_id, (terms, length) in zip(memory_ids, indexed):
+                if terms is None and length is None:
+                    continue
+                for term in (terms or "").split():
+                    pipe.hdel(self._key(user_id, f"postings:{term}"), memory_id)
+                pipe.hdel(self._key(user_id, "lengths"), memory_id)
+                pipe.delete(self._key(user_id, f"doc:{memory_id}"))
+                removed += 1
+                removed_length += int(length or 0)
+
+            if removed:
+                stats_key = self._key(user_id, "stats")
+                pipe.hincrby(stats_key, "doc_count", -removed)
+                pipe.hincrby(stats_key, "total_length", -removed_length)
+                await pipe.execute()
+
+            return removed
+
+        except Exception as e:
+            logger.warning(f"Failed to remove lexical entries for user {user_id}: {e}")
+            return 0
+
+    async def clear_user(self, user_id: str) -> bool:
+        """Drop a user's entire lexical index."""
+        client = await self._get_client()
+        if not client:
+            return False
+
+        try:
+            keys = [
+                key
+                async for key in client.scan_iter(
+                    match=self._key(user_id, "*"), count=500
+                )
+            ]
+            for i in range(0, len(keys), 500):
+                await client.delete(*keys[i : i + 500])
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to clear lexical index for user {user_id}: {e}")
+            return False
+
+    async def search(
+        self, user_id: str, query: str, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 search over a user's memories.
+
+        Args:
+            user_id: Validated user ID from JWT
+            query: Search query
+            k: Number of results
+
+        Returns:
+            Results shaped like VectorStore.similarity_search results, plus
+            "term_coverage" (fraction of query terms the memory contains)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))[: self.max_query_terms]
+        client = await self._get_client()
+        if not client or not terms or k <= 0:
+            return []
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for term in terms:
+                pipe.hgetall(self._key(user_id, f"postings:{term}"))
+            pipe.hmget(self._key(user_id, "stats"), "doc_count", "total_length")
+            *postings, (doc_count, total_length) = await pipe.execute()
+
+            doc_count = int(doc_count or 0)
+            if doc_count <= 0:
+                return []
+            average_length = max(1.0, int(total_length or 0) / doc_count)
+
+            candidates = list({memory_id for p in postings for memory_id in p})
+            if not candidates:
+                return []
+            lengths = await client.hmget(self._key(user_id, "lengths"), candidates)
+            doc_lengths = {
+                memory_id: int(length or 0)
+                for memory_id, length in zip(candidates, lengths)
+            }
+
+            scores: Dict[str, float] = {}
+            matched: Dict[str, int] = {}
+            for term_postings in postings:
+                if not term_postings:
+                    continue
+                df = len(term_postings)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+                for memory_id, tf in term_postings.items():
+                    tf = int(tf)
+                    norm = (
+                        1
+                        - self.BM25_B
+                        + self.BM25_B * (doc_lengths.get(memory_id, 0) / average_length)
+                    )
+                    scores[memory_id] = scores.get(memory_id, 0.0) + idf * (
+                        tf * (self.BM25_K1 + 1) / (tf + self.BM25_K1 * norm)
+                    )
+                    matched[memory_id] = matched.get(memory_id, 0) + 1
+
+            top = sorted(scores, key=scores.get, reverse=True)[:k]
+
+            pipe = client.pipeline(transaction=False)
+            for memory_id in top:
+                pipe.hmget(
+                    self._key(user_id, f"doc:{memory_id}"), "content", "metadata"
+                )
+            docs = await pipe.execute()
+
+            results = []
+            for memory_id, (content, metadata) in zip(top, docs):
+                if content is None:
+                    continue  # Removed while searching
+                results.append(
+                    {
+                        "content": content,
+                        "score": scores[memory_id],
+                        "metadata": json.loads(metadata) if metadata else {},
+                        "memory_id": memory_id,
+                        "term_coverage": matched[memory_id] / len(terms),
+                    }
+                )
+            return results
+
+        except Exception as e:
+            logger.warning(f"Lexical search failed for user {user_id}: {e}")
+            return []
+
+    async def is_built(self, user_id: str) -> bool:
+        """Whether the user's index has been backfilled from the vector store."""
+        client = await self._get_client()
+        if not client:
+            return False
+        try:
+            return bool(await client.hget(self._key(user_id, "stats"), "built"))
+        except Exception:
+            return False
+
+    async def mark_built(self, user_id: str) -> None:
+        """Record that every existing memory for the user has been indexed."""
+        client = await self._get_client()
+        if client:
+            await client.hset(self._key(user_id, "stats"), "built", 1)
+
+
+# Create global instance (shared by every VectorStore in the process)
+lexical_index = LexicalIndex()
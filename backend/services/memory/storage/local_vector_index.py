@@ -0,0 +1,776 @@
+"""
+Local Vector Index for Long-term Memory Storage.
+
+Network-free vector backend used when VECTOR_DB_TYPE=local. Every user gets
+their own approximate-nearest-neighbour index, persisted under
+LOCAL_VECTOR_DIR:
+
+- vectors.f32   - memory-mapped matrix of normalized embeddings (vectors.f16
+                  or vectors.i8 when LOCAL_VECTOR_DTYPE quantizes storage)
+- scales.f32    - per-vector scales, for int8 storage only
+- records.jsonl - append-only log of documents/metadata and deletions
+- hnsw.bin      - HNSW graph snapshot (rebuilt from the vectors if stale)
+
+The storage dtype is recorded in meta.json, so existing indexes keep the
+dtype they were created with.
+
+Deletes only append tombstones, so once deleted labels make up
+COMPACT_DEAD_FRACTION of an index it is compacted: the live vectors and
+records are rewritten into a sibling ".compact" directory, which is then
+swapped in for the old one.
+
+User indexes are loaded lazily on first access and the least recently used
+ones are closed once more than LOCAL_VECTOR_MAX_LOADED_USERS are open.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Optional, Dict, Any, Callable, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from .quantization import (
+    DTYPE_SUFFIXES,
+    as_matrix,
+    dequantize,
+    dot_scores,
+    normalize_rows,
+    quantize,
+)
+
+# Import hnswlib (shipped with chroma-hnswlib)
+try:
+    import hnswlib
+
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+    logging.warning(
+        "hnswlib not available - local vector search will use exact (brute-force) "
+        "search. Install with: pip install chroma-hnswlib"
+    )
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class IndexClosedError(RuntimeError):
+    """Raised when an operation reaches a user index that was already closed."""
+
+
+class UserVectorIndex:
+    """Persistent vector index holding a single user's memories."""
+
+    INITIAL_CAPACITY = 256
+    HNSW_M = 16
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64
+    # Snapshot the HNSW graph after this many unsaved writes
+    HNSW_SAVE_INTERVAL = 64
+    # Compact once deleted labels reach this fraction of all labels...
+    COMPACT_DEAD_FRACTION = 0.5
+    # ...and there are at least this many of them
+    COMPACT_MIN_DEAD = 256
+
+    def __init__(self, directory: str, dtype: str = "float32"):
+        self.directory = directory
+        self.scales_path = os.path.join(directory, "scales.f32")
+        self.records_path = os.path.join(directory, "records.jsonl")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.hnsw_path = os.path.join(directory, "hnsw.bin")
+
+        self.lock = threading.RLock()
+        self.dtype = dtype  # Replaced by the recorded dtype of an existing index
+        self.dim: Optional[int] = None
+        self.capacity = 0
+        self.count = 0  # Labels allocated so far (live + deleted)
+        self.vectors: Optional[np.memmap] = None
+        self.scales: Optional[np.memmap] = None
+        self.records: Dict[int, Dict[str, Any]] = {}
+        self.id_to_label: Dict[str, int] = {}
+        self.hnsw = None
+        self._unsaved_writes = 0
+        self.closed = False
+        # Operations currently using this index (guarded by LocalVectorIndex)
+        self.pins = 0
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Load vectors, records and HNSW graph from disk if present."""
+        self._recover_compaction()
+        if not os.path.exists(self.meta_path):
+            return
+
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.dim = meta["dim"]
+        self.capacity = meta["capacity"]
+        self.dtype = meta.get("dtype", "float32")
+
+        self._map_storage("r+")
+
+        if os.path.exists(self.records_path):
+            with open(self.records_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-write
+                        logger.warning(
+                            f"Skipping corrupt record in {self.records_path}"
+                        )
+                        continue
+                    self._apply_record(entry)
+
+        if self._needs_compaction():
+            self.compact()
+        else:
+            self._load_hnsw()
+
+    def _apply_record(self, entry: Dict[str, Any]):
+        """Apply one record-log entry to the in-memory state."""
+        label = entry["label"]
+        if entry.get("deleted"):
+            record = self.records.pop(label, None)
+            if record and self.id_to_label.get(record["id"]) == label:
+                del self.id_to_label[record["id"]]
+            return
+
+        self.records[label] = entry
+        self.id_to_label[entry["id"]] = label
+        self.count = max(self.count, label + 1)
+
+    def _append_records(self, entries: List[Dict[str, Any]]):
+        """Durably append entries to the record log."""
+        with open(self.records_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_meta(
+        self, meta_path: Optional[str] = None, capacity: Optional[int] = None
+    ):
+        meta_path = meta_path or self.meta_path
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "capacity": capacity or self.capacity,
+                    "dtype": self.dtype,
+                },
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.directory, f"vectors.{DTYPE_SUFFIXES[self.dtype]}")
+
+    def _map_storage(self, mode: str):
+        """Memory-map the vector (and int8 scale) files at the current capacity."""
+        self.vectors = np.memmap(
+            self.vectors_path,
+            dtype=np.dtype(self.dtype),
+            mode=mode,
+            shape=(self.capacity, self.dim),
+        )
+        self.scales = (
+            np.memmap(
+                self.scales_path, dtype=np.float32, mode=mode, shape=(self.capacity,)
+            )
+            if self.dtype == "int8"
+            else None
+        )
+
+    def _flush_storage(self):
+        self.vectors.flush()
+        if self.scales is not None:
+            self.scales.flush()
+
+    def _create_storage(self, dim: int):
+        """Create the on-disk layout for the first stored vector."""
+        if os.path.exists(self.meta_path):
+            # "w+" would truncate an existing store's vectors
+            raise RuntimeError(f"Vector index in {self.directory} already exists")
+        os.makedirs(self.directory, exist_ok=True)
+        self.dim = dim
+        self.capacity = self.INITIAL_CAPACITY
+        self._map_storage("w+")
+        self._write_meta()
+        self._new_hnsw()
+
+    def _grow(self, required: int):
+        """Grow the memory-mapped matrix (and HNSW graph) to hold `required` rows."""
+        new_capacity = self.capacity
+        while new_capacity < required:
+            new_capacity *= 2
+
+        self._flush_storage()
+        self.vectors = None
+        self.scales = None
+        with open(self.vectors_path, "r+b") as f:
+            f.truncate(new_capacity * self.dim * np.dtype(self.dtype).itemsize)
+        if self.dtype == "int8":
+            with open(self.scales_path, "r+b") as f:
+                f.truncate(new_capacity * np.dtype(np.float32).itemsize)
+        self.capacity = new_capacity
+        self._map_storage("r+")
+        self._write_meta()
+
+        if self.hnsw is not None:
+            self.hnsw.resize_index(self.capacity)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compact_directories(directory: str) -> Tuple[str, str]:
+        """The (new, retired) sibling directories used while compacting."""
+        return directory + ".compact", directory + ".old"
+
+    def _recover_compaction(self):
+        """Finish or roll back a compaction interrupted by a crash."""
+        new_directory, old_directory = self.compact_directories(self.directory)
+        if not os.path.exists(self.directory):
+            # meta.json is written last, so it marks a complete compacted copy
+            if os.path.exists(os.path.join(new_directory, "meta.json")):
+                os.replace(new_directory, self.directory)
+            elif os.path.exists(old_directory):
+                os.replace(old_directory, self.directory)
+        shutil.rmtree(new_directory, ignore_errors=True)
+        shutil.rmtree(old_directory, ignore_errors=True)
+
+    def _needs_compaction(self) -> bool:
+        """Whether enough labels are deleted to be worth rewriting the index."""
+        dead = self.count - self.size
+        return (
+            dead >= self.COMPACT_MIN_DEAD
+            and dead >= self.COMPACT_DEAD_FRACTION * self.count
+        )
+
+    def compact(self) -> int:
+        """
+        Rewrite the index with only its live vectors and records.
+
+        Live records keep their insertion order and are relabelled from 0,
+        and the HNSW graph is rebuilt without the deleted labels.
+
+        Returns:
+            Number of deleted labels reclaimed
+        """
+        with self.lock:
+            self._check_open()
+            reclaimed = self.count - self.size
+            if self.dim is None or not reclaimed:
+                return 0
+
+            live = sorted(self.records)
+            capacity = self.INITIAL_CAPACITY
+            while capacity < len(live):
+                capacity *= 2
+
+            new_directory, old_directory = self.compact_directories(self.directory)
+            shutil.rmtree(new_directory, ignore_errors=True)
+            os.makedirs(new_directory)
+
+            vectors = np.memmap(
+                os.path.join(new_directory, os.path.basename(self.vectors_path)),
+                dtype=np.dtype(self.dtype),
+                mode="w+",
+                shape=(capacity, self.dim),
+            )
+            if live:
+                vectors[: len(live)] = self.vectors[live]
+            vectors.flush()
+            del vectors
+            if self.scales is not None:
+                scales = np.memmap(
+                    os.path.join(new_directory, os.path.basename(self.scales_path)),
+                    dtype=np.float32,
+                    mode="w+",
+                    shape=(capacity,),
+                )
+                if live:
+                    scales[: len(live)] = self.scales[live]
+                scales.flush()
+                del scales
+
+            entries = [
+                {**self.records[old_label], "label": new_label}
+                for new_label, old_label in enumerate(live)
+            ]
+            with open(
+                os.path.join(new_directory, os.path.basename(self.records_path)),
+                "w",
+                encoding="utf-8",
+            ) as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            # Written last: a compacted copy with meta.json is complete
+            self._write_meta(
+                os.path.join(new_directory, os.path.basename(self.meta_path)),
+                capacity,
+            )
+
+            # Swap the compacted copy in
+            if self.vectors is not None:
+                self._flush_storage()
+            self.vectors = None
+            self.scales = None
+            self.hnsw = None
+            shutil.rmtree(old_directory, ignore_errors=True)
+            os.replace(self.directory, old_directory)
+            os.replace(new_directory, self.directory)
+            shutil.rmtree(old_directory, ignore_errors=True)
+
+            self.capacity = capacity
+            self.count = 0
+            self.records = {}
+            self.id_to_label = {}
+            for entry in entries:
+                self._apply_record(entry)
+            self._map_storage("r+")
+
+            self._new_hnsw()
+            if self.hnsw is not None and self.count:
+                self.hnsw.add_items(self._rows(0, self.count), np.arange(self.count))
+            self._unsaved_writes = self.count
+            self._save_hnsw(force=True)
+
+            logger.info(
+                f"Compacted vector index in {self.directory}: reclaimed "
+                f"{reclaimed} deleted labels, {self.count} live"
+            )
+            return reclaimed
+
+    # ------------------------------------------------------------------
+    # HNSW graph
+    # ------------------------------------------------------------------
+
+    def _new_hnsw(self):
+        if not HNSWLIB_AVAILABLE:
+            return
+        self.hnsw = hnswlib.Index(space="cosine", dim=self.dim)
+        self.hnsw.init_index(
+            max_elements=self.capacity,
+            ef_construction=self.HNSW_EF_CONSTRUCTION,
+            M=self.HNSW_M,
+        )
+        self.hnsw.set_ef(self.HNSW_EF_SEARCH)
+
+    def _load_hnsw(self):
+        """Load the HNSW snapshot and catch it up with vectors written since."""
+        if not HNSWLIB_AVAILABLE:
+            return
+
+        indexed = 0
+        if os.path.exists(self.hnsw_path):
+            try:
+                self.hnsw = hnswlib.Index(space="cosine", dim=self.dim)
+                self.hnsw.load_index(self.hnsw_path, max_elements=self.capacity)
+                self.hnsw.set_ef(self.HNSW_EF_SEARCH)
+                indexed = self.hnsw.get_current_count()
+            except Exception as e:
+                logger.warning(f"Rebuilding HNSW index in {self.directory}: {e}")
+                self.hnsw = None
+                indexed = 0
+
+        if self.hnsw is None:
+            self._new_hnsw()
+
+        # Labels are allocated sequentially, so anything past the snapshot is new
+        if self.count > indexed:
+            labels = np.arange(indexed, self.count)
+            self.hnsw.add_items(self._rows(indexed, self.count), labels)
+            self._unsaved_writes += len(labels)
+
+        for label in range(self.count):
+            if label not in self.records:
+                try:
+                    self.hnsw.mark_deleted(label)
+                except RuntimeError:
+                    pass  # Already marked deleted in the snapshot
+
+    def _save_hnsw(self, force: bool = False):
+        if self.hnsw is None or not self._unsaved_writes:
+            return
+        if not force and self._unsaved_writes < self.HNSW_SAVE_INTERVAL:
+            return
+        tmp_path = self.hnsw_path + ".tmp"
+        self.hnsw.save_index(tmp_path)
+        os.replace(tmp_path, self.hnsw_path)
+        self._unsaved_writes = 0
+
+    def _check_open(self):
+        """Fail operations on a closed index (call with the lock held)."""
+        if self.closed:
+            raise IndexClosedError(f"Vector index in {self.directory} is closed")
+
+    def _rows(self, start: int, end: int) -> np.ndarray:
+        """Stored vectors for labels [start, end) as float32."""
+        scales = self.scales[start:end] if self.scales is not None else None
+        return dequantize(self.vectors[start:end], scales)
+
+    # ------------------------------------------------------------------
+    # Public operations
+    # ------------------------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        """Number of live (non-deleted) vectors."""
+        return len(self.records)
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ):
+        """Insert or replace vectors by id."""
+        if not ids:
+            return
+
+        matrix = normalize_rows(as_matrix(embeddings))
+
+        with self.lock:
+            self._check_open()
+            if self.dim is None:
+                self._create_storage(matrix.shape[1])
+            if matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match index dimension {self.dim}"
+                )
+
+            # Replacing an id retires its old label
+            replaced = [id_ for id_ in ids if id_ in self.id_to_label]
+            if replaced:
+                self.delete(replaced)
+
+            start = self.count
+            if start + len(ids) > self.capacity:
+                self._grow(start + len(ids))
+
+            labels = np.arange(start, start + len(ids))
+            codes, scales = quantize(matrix, self.dtype)
+            self.vectors[start : start + len(ids)] = codes
+            if scales is not None:
+                self.scales[start : start + len(ids)] = scales
+            self._flush_storage()
+
+            entries = [
+                {
+                    "label": int(label),
+                    "id": id_,
+                    "document": document,
+                    "metadata": metadata,
+                }
+                for label, id_, document, metadata in zip(
+                    labels, ids, documents, metadatas
+                )
+            ]
+            self._append_records(entries)
+            for entry in entries:
+                self._apply_record(entry)
+
+            if self.hnsw is not None:
+                self.hnsw.add_items(matrix, labels)
+                self._unsaved_writes += len(ids)
+                self._save_hnsw()
+
+    def delete(self, ids: List[str]) -> List[str]:
+        """Delete vectors by id, returning the ids that existed."""
+        with self.lock:
+            self._check_open()
+            labels = [
+                (id_, self.id_to_label[id_]) for id_ in ids if id_ in self.id_to_label
+            ]
+            if not labels:
+                return []
+
+            entries = [{"label": label, "deleted": True} for _, label in labels]
+            self._append_records(entries)
+            for entry in entries:
+                self._apply_record(entry)
+
+            if self.hnsw is not None:
+                for _, label in labels:
+                    self.hnsw.mark_deleted(label)
+                self._unsaved_writes += len(labels)
+                self._save_hnsw()
+
+            if self._needs_compaction():
+                self.compact()
+
+            return [id_ for id_, _ in labels]
+
+    def query(
+        self, embedding: Sequence[float], k: int
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to k (record, cosine similarity) pairs, best first."""
+        return self.query_many(as_matrix(embedding), k)[0]
+
+    def query_many(
+        self, embeddings: np.ndarray, k: int
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Search for every row of `embeddings` at once, one result list per row."""
+        queries = normalize_rows(as_matrix(embeddings))
+        with self.lock:
+            self._check_open()
+            live = self.size
+            if not live or k <= 0:
+                return [[] for _ in queries]
+            k = min(k, live)
+
+            if self.hnsw is not None:
+                try:
+                    labels, distances = self.hnsw.knn_query(queries, k=k)
+                    return [
+                        [
+                            (self.records[int(label)], 1.0 - float(distance))
+                            for label, distance in zip(row_labels, row_distances)
+                            if int(label) in self.records
+                        ]
+                        for row_labels, row_distances in zip(labels, distances)
+                    ]
+                except RuntimeError as e:
+                    # Sparse graphs with many deletions can fail to fill k results
+                    logger.debug(f"HNSW query failed, using exact search: {e}")
+
+            return self._exact_query(queries, k)
+
+    def _exact_query(
+        self, queries: np.ndarray, k: int
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Brute-force cosine search over live vectors, one list per query row."""
+        labels = np.fromiter(self.records.keys(), dtype=np.int64)
+        scores = dot_scores(
+            queries,
+            self.vectors[labels],
+            self.scales[labels] if self.scales is not None else None,
+        )
+
+        results = []
+        for column in scores.T:
+            top = (
+                np.argpartition(-column, k - 1)[:k]
+                if k < len(labels)
+                else np.arange(len(labels))
+            )
+            top = top[np.argsort(-column[top])]
+            results.append(
+                [(self.records[int(labels[i])], float(column[i])) for i in top]
+            )
+        return results
+
+    def get(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the live records for the given ids (unknown ids are skipped)."""
+        with self.lock:
+            self._check_open()
+            return [
+                self.records[self.id_to_label[id_]]
+                for id_ in ids
+                if id_ in self.id_to_label
+            ]
+
+    def list(
+        self, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List live records in insertion order."""
+        with self.lock:
+            self._check_open()
+            labels = sorted(self.records.keys())
+            end = None if limit is None else offset + limit
+            return [self.records[label] for label in labels[offset:end]]
+
+    def close(self):
+        """Persist the HNSW graph and release the memory map."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._save_hnsw(force=True)
+            if self.vectors is not None:
+                self._flush_storage()
+            self.vectors = None
+            self.scales = None
+            self.hnsw = None
+
+
+class LocalVectorIndex:
+    """Per-user local vector indexes with lazy loading and LRU eviction."""
+
+    def __init__(
+        self, base_directory: str, max_loaded_users: int = 256, dtype: str = "float32"
+    ):
+        self.base_directory = base_directory
+        self.max_loaded_users = max(1, max_loaded_users)
+        self.dtype = dtype
+        self._indexes: "OrderedDict[str, UserVectorIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.base_directory, exist_ok=True)
+
+    def _user_directory(self, user_id: str) -> str:
+        """Map a user ID to a filesystem-safe directory."""
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.base_directory, f"user_{digest}")
+
+    @contextmanager
+    def _use(self, user_id: str) -> Iterator[UserVectorIndex]:
+        """
+        Pin a user's index for one operation, loading it if needed.
+
+        Pinned indexes are never evicted, so an operation running in a worker
+        thread cannot have its index closed underneath it. Indexes left over
+        the limit by pins are evicted when the last operation finishes.
+        """
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                index = UserVectorIndex(self._user_directory(user_id), self.dtype)
+                self._indexes[user_id] = index
+            else:
+                self._indexes.move_to_end(user_id)
+            index.pins += 1
+            self._evict()
+
+        try:
+            yield index
+        finally:
+            with self._lock:
+                index.pins -= 1
+                self._evict()
+
+    def _evict(self):
+        """Close least recently used, unpinned indexes over the limit (lock held)."""
+        excess = len(self._indexes) - self.max_loaded_users
+        for cold_user_id in list(self._indexes):
+            if excess <= 0:
+                break
+            cold_index = self._indexes[cold_user_id]
+            if cold_index.pins:
+                continue
+            del self._indexes[cold_user_id]
+            cold_index.close()
+            excess -= 1
+            logger.debug(f"Evicted local vector index for user {cold_user_id}")
+
+    def _run(self, user_id: str, operation: Callable[[UserVectorIndex], Any]) -> Any:
+        """Run an operation on a user's index, retrying if it was cleared meanwhile."""
+        for attempt in range(3):
+            with self._use(user_id) as index:
+                try:
+                    return operation(index)
+                except IndexClosedError:
+                    # clear_user closed it after we pinned it; load it afresh
+                    if attempt == 2:
+                        raise
+
+    def add(
+        self,
+        user_id: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ):
+        """Insert or replace vectors in a user's index."""
+        self._run(
+            user_id, lambda index: index.add(ids, embeddings, documents, metadatas)
+        )
+
+    def query(
+        self, user_id: str, embedding: List[float], k: int
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Nearest-neighbour search within a user's index."""
+        return self._run(user_id, lambda index: index.query(embedding, k))
+
+    def query_many(
+        self, user_id: str, embeddings: np.ndarray, k: int
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Nearest-neighbour search for several embeddings within a user's index."""
+        return self._run(user_id, lambda index: index.query_many(embeddings, k))
+
+    def list(
+        self, user_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List a user's records in insertion order."""
+        return self._run(user_id, lambda index: index.list(offset, limit))
+
+    def get(self, user_id: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get records from a user's index by id."""
+        return self._run(user_id, lambda index: index.get(ids))
+
+    def count(self, user_id: str) -> int:
+        """Number of live vectors stored for a user."""
+        return self._run(user_id, lambda index: index.size)
+
+    def delete(self, user_id: str, ids: List[str]) -> List[str]:
+        """Delete vectors from a user's index, returning ids that existed."""
+        return self._run(user_id, lambda index: index.delete(ids))
+
+    def clear_user(self, user_id: str):
+        """Remove a user's index from memory and disk."""
+        with self._lock:
+            index = self._indexes.pop(user_id, None)
+            if index is not None:
+                index.close()
+            directory = self._user_directory(user_id)
+            for path in (directory, *UserVectorIndex.compact_directories(directory)):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def close(self):
+        """Persist and release every loaded index."""
+        with self._lock:
+            while self._indexes:
+                _, index = self._indexes.popitem(last=False)
+                index.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Describe the local index for health checks."""
+        return {
+            "base_directory": self.base_directory,
+            "loaded_users": len(self._indexes),
+            "max_loaded_users": self.max_loaded_users,
+            "dtype": self.dtype,
+            "hnsw_available": HNSWLIB_AVAILABLE,
+        }
+
+
+# Shared per directory, since VectorStore is created per MemoryService
+_local_indexes: Dict[str, LocalVectorIndex] = {}
+_local_indexes_lock = threading.Lock()
+
+
+def get_local_vector_index(
+    base_directory: str, max_loaded_users: int = 256, dtype: str = "float32"
+) -> LocalVectorIndex:
+    """Get the process-wide local index rooted at base_directory."""
+    base_directory = os.path.abspath(base_directory)
+    with _local_indexes_lock:
+        index = _local_indexes.get(base_directory)
+        if index is None:
+            index = LocalVectorIndex(base_directory, max_loaded_users, dtype)
+            _local_indexes[base_directory] = index
+        return index
@@ -0,0 +1,325 @@
+"""
+Memory Secondary Index.
+
+Per-user lookup of memory IDs by category and by conversation, kept in Redis
+and updated whenever the stores write or delete memories:
+
+- user:{uid}:memory_index:category:{category}         - sorted set of members
+- user:{uid}:memory_index:conversation:{conversation} - sorted set of members
+- user:{uid}:memory_index:members                     - hash of member -> JSON
+                                                        [category, conversation_id]
+- user:{uid}:memory_index:state                       - hash with the "built" flag
+
+Members are "{tier}:{memory_id}" scored by the memory's timestamp, so a user's
+emotional anchors or one conversation's memories can be read newest first
+without listing either store. Short-term entries can outlive the memory's
+Redis TTL; readers drop them when the memory is no longer found.
+
+Rebuilds are written under user:{uid}:memory_index_rebuild:{token}:* and
+renamed over the live keys in one transaction, so readers keep using the old
+index until the new one is complete.
+"""
+
+import json
+import uuid
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.redis_client import get_redis_client
+
+from .memory_stats import SHORT_TERM, LONG_TERM, REBUILD_KEY_TTL_SECONDS
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# (memory_id, metadata, ISO timestamp)
+IndexEntry = Tuple[str, Dict[str, Any], str]
+
+
+class MemoryIndex:
+    """Per-user (category, conversation) -> memory ID index stored in Redis."""
+
+    KEY_PREFIX = "memory_index"
+
+    def _key(self, user_id: str, suffix: str, build: Optional[str] = None) -> str:
+        """Key of the live index, or of the rebuild identified by `build`."""
+        if build:
+            return f"user:{user_id}:{self.KEY_PREFIX}_rebuild:{build}:{suffix}"
+        return f"user:{user_id}:{self.KEY_PREFIX}:{suffix}"
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Memory index running without Redis: {e}")
+            return None
+
+    @staticmethod
+    def _score(timestamp: str) -> float:
+        """Sort score for a memory (epoch seconds of its timestamp)."""
+        try:
+            return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+        except (AttributeError, ValueError):
+            return datetime.utcnow().timestamp()
+
+    def _unlink(
+        self, pipe, user_id: str, member: str, value: str, build: Optional[str] = None
+    ):
+        """Queue removal of a member from the sets named in its stored value."""
+        category, conversation_id = json.loads(value)
+        pipe.zrem(self._key(user_id, f"category:{category}", build), member)
+        if conversation_id:
+            pipe.zrem(
+                self._key(user_id, f"conversation:{conversation_id}", build), member
+            )
+
+    async def add_memories(
+        self, user_id: str, tier: str, entries: List[IndexEntry]
+    ) -> bool:
+        """
+        Index (or re-index) stored memories.
+
+        Args:
+            user_id: Validated user ID from JWT
+            tier: SHORT_TERM or LONG_TERM
+            entries: (memory_id, metadata, ISO timestamp) tuples
+
+        Returns:
+            Success status
+        """
+        client = await self._get_client()
+        if not client or not entries:
+            return False
+
+        try:
+            await self._add(client, user_id, tier, entries)
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to update memory index for user {user_id}: {e}")
+            return False
+
+    async def _add(
+        self,
+        client,
+        user_id: str,
+        tier: str,
+        entries: List[IndexEntry],
+        build: Optional[str] = None,
+    ):
+        """Write entries to the live index, or to the rebuild `build`."""
+        members_key = self._key(user_id, "members", build)
+        members = [f"{tier}:{memory_id}" for memory_id, _, _ in entries]
+        previous = await client.hmget(members_key, members)
+
+        pipe = client.pipeline(transaction=True)
+        written = {members_key}
+        for member, (_, metadata, timestamp), value in zip(members, entries, previous):
+            # Re-indexing a memory moves it out of its previous sets
+            if value:
+                self._unlink(pipe, user_id, member, value, build)
+
+            metadata = metadata or {}
+            category = metadata.get("memory_category") or "uncategorized"
+            conversation_id = metadata.get("conversation_id")
+            score = self._score(timestamp)
+
+            category_key = self._key(user_id, f"category:{category}", build)
+            pipe.zadd(category_key, {member: score})
+            written.add(category_key)
+            if conversation_id:
+                conversation_key = self._key(
+                    user_id, f"conversation:{conversation_id}", build
+                )
+                pipe.zadd(conversation_key, {member: score})
+                written.add(conversation_key)
+            pipe.hset(members_key, member, json.dumps([category, conversation_id]))
+
+        if build:
+            # Left behind if the rebuild dies before swapping them in
+            for key in written:
+                pipe.expire(key, REBUILD_KEY_TTL_SECONDS)
+
+        await pipe.execute()
+
+    async def remove_memories(
+        self, user_id: str, tier: str, memory_ids: List[str]
+    ) -> int:
+        """
+        Remove memories from a user's index.
+
+        Args:
+            user_id: Validated user ID from JWT
+            tier: SHORT_TERM or LONG_TERM
+            memory_ids: Memory IDs to remove
+
+        Returns:
+            Number of indexed memories removed
+        """
+        client = await self._get_client()
+        if not client or not memory_ids:
+            return 0
+
+        try:
+            members_key = self._key(user_id, "members")
+            members = [f"{tier}:{memory_id}" for memory_id in memory_ids]
+            values = await client.hmget(members_key, members)
+
+            pipe = client.pipeline(transaction=True)
+            removed = 0
+            for member, value in zip(members, values):
+                if value is None:
+                    continue
+                self._unlink(pipe, user_id, member, value)
+                pipe.hdel(members_key, member)
+                removed += 1
+
+            if removed:
+                await pipe.execute()
+            return removed
+
+        except Exception as e:
+            logger.warning(f"Failed to remove memory index entries for {user_id}: {e}")
+            return 0
+
+    async def clear_tier(self, user_id: str, tier: str) -> int:
+        """Remove every memory in one tier from a user's index."""
+        client = await self._get_client()
+        if not client:
+            return 0
+
+        try:
+            prefix = f"{tier}:"
+            members = await client.hkeys(self._key(user_id, "members"))
+            memory_ids = [
+                member[len(prefix) :] for member in members if member.startswith(prefix)
+            ]
+            return await self.remove_memories(user_id, tier, memory_ids)
+
+        except Exception as e:
+            logger.warning(f"Failed to clear {tier} index for user {user_id}: {e}")
+            return 0
+
+    async def get_memory_ids(
+        self,
+        user_id: str,
+        category: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        tier: Optional[str] = None,
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Look up memories by category and/or conversation, newest first.
+
+        Args:
+            user_id: Validated user ID from JWT
+            category: Only memories with this memory_category
+            conversation_id: Only memories from this conversation
+            tier: Only SHORT_TERM or LONG_TERM memories
+
+        Returns:
+            (tier, memory_id) pairs, or None if the user's index was never built
+        """
+        if not category and not conversation_id:
+            raise ValueError("category or conversation_id is required")
+
+        client = await self._get_client()
+        if not client or not await self.is_built(user_id):
+            return None
+
+        pipe = client.pipeline(transaction=False)
+        if category:
+            pipe.zrevrange(self._key(user_id, f"category:{category}"), 0, -1)
+        if conversation_id:
+            pipe.zrevrange(self._key(user_id, f"conversation:{conversation_id}"), 0, -1)
+        members, *others = await pipe.execute()
+
+        # Both filters: keep the category order, restricted to the conversation
+        for other in others:
+            allowed = set(other)
+            members = [member for member in members if member in allowed]
+
+        results = []
+        for member in members:
+            member_tier, _, memory_id = member.partition(":")
+            if tier is None or member_tier == tier:
+                results.append((member_tier, memory_id))
+        return results
+
+    async def is_built(self, user_id: str) -> bool:
+        """Whether the user's index has been backfilled from both stores."""
+        client = await self._get_client()
+        if not client:
+            return False
+        try:
+            return bool(await client.hget(self._key(user_id, "state"), "built"))
+        except Exception:
+            return False
+
+    async def rebuild_user(
+        self,
+        user_id: str,
+        short_term: List[IndexEntry],
+        long_term: List[IndexEntry],
+    ) -> None:
+        """
+        Replace a user's index with entries for every stored memory.
+
+        The new index is built under temporary keys and renamed over the live
+        keys in one transaction; the "built" marker is never removed, so
+        readers keep using the old index meanwhile.
+
+        Args:
+            user_id: Validated user ID from JWT
+            short_term: Every short-term memory currently stored
+            long_term: Every long-term memory currently stored
+        """
+        client = await self._get_client()
+        if not client:
+            return
+
+        build = uuid.uuid4().hex
+        build_prefix = self._key(user_id, "", build)
+        live_prefix = self._key(user_id, "")
+        state_key = self._key(user_id, "state")
+
+        try:
+            for tier, entries in ((SHORT_TERM, short_term), (LONG_TERM, long_term)):
+                for start in range(0, len(entries), 500):
+                    await self._add(
+                        client, user_id, tier, entries[start : start + 500], build
+                    )
+
+            new_keys = [
+                key
+                async for key in client.scan_iter(match=f"{build_prefix}*", count=500)
+            ]
+            old_keys = [
+                key
+                async for key in client.scan_iter(match=f"{live_prefix}*", count=500)
+                if key != state_key
+            ]
+
+            pipe = client.pipeline(transaction=True)
+            for i in range(0, len(old_keys), 500):
+                pipe.delete(*old_keys[i : i + 500])
+            for key in new_keys:
+                live_key = live_prefix + key[len(build_prefix) :]
+                pipe.rename(key, live_key)
+                pipe.persist(live_key)
+            pipe.hset(state_key, "built", 1)
+            await pipe.execute()
+
+        except Exception:
+            stale = [
+                key
+                async for key in client.scan_iter(match=f"{build_prefix}*", count=500)
+            ]
+            if stale:
+                await client.delete(*stale)
+            raise
+
+
+# Create global instance (shared by both stores in the process)
+memory_index = MemoryIndex()
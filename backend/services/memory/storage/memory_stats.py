@@ -0,0 +1,443 @@
+"""
+Incremental Memory Statistics.
+
+Per-user counters kept in Redis so memory stats can be read without listing
+any memories:
+
+- user:{uid}:memory_stats          - hash of counters, e.g. "long_term:total",
+                                     "short_term:category:emotional_anchor",
+                                     "short_term:sensitive", "day:2024-01-31"
+- user:{uid}:memory_stats:members  - hash of "{tier}:{memory_id}" -> the
+                                     attributes that were counted, so deletes
+                                     and updates decrement exactly what was added
+- user:{uid}:memory_stats:expiry   - sorted set of short-term members by the
+                                     time their Redis TTL runs out
+- user:{uid}:memory_stats:version  - bumped whenever a memory is counted,
+                                     recounted or uncounted
+
+Every update runs as a Lua script, so counters change atomically with the
+member bookkeeping. Day counters older than the week that get_stats reports
+are pruned when stats are read. Stores, updates (including consent transitions, which
+re-store a memory with new metadata) and deletes are all idempotent.
+Drift from anything the hooks cannot see is corrected by MemoryStatsReconciler.
+A recount only replaces the counters if the version is unchanged since the
+stores were read, so a memory stored or deleted during a recount is never
+lost.
+"""
+
+import time
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+
+from utils.redis_client import get_redis_client
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# (memory_id, metadata, ISO timestamp, seconds until the memory expires or None)
+StatsEntry = Tuple[str, Dict[str, Any], str, Optional[int]]
+
+SHORT_TERM = "short_term"
+LONG_TERM = "long_term"
+
+# Days of "day:*" counters kept (recent_activity reports the last 7)
+DAY_COUNTER_RETENTION_DAYS = 7
+
+# Seconds a rebuild's temporary keys survive if the rebuild dies midway
+REBUILD_KEY_TTL_SECONDS = 600
+
+# Shared Lua helpers: split a member payload and apply it to the counters
+_LUA_HELPERS = """
+local function split(value)
+    local parts = {}
+    for part in string.gmatch(value .. '|', '(.-)|') do
+        parts[#parts + 1] = part
+    end
+    return parts
+end
+
+local function apply(stats_key, payload, delta)
+    local p = split(payload)
+    local tier = p[1]
+    redis.call('HINCRBY', stats_key, tier .. ':total', delta)
+    redis.call('HINCRBY', stats_key, tier .. ':category:' .. p[2], delta)
+    if p[3] == '1' then redis.call('HINCRBY', stats_key, tier .. ':sensitive', delta) end
+    if p[4] == '1' then redis.call('HINCRBY', stats_key, tier .. ':anchors', delta) end
+    if p[5] == '1' then redis.call('HINCRBY', stats_key, tier .. ':pending_consent', delta) end
+    local day_field = 'day:' .. p[6]
+    -- Pruned day counters are not recreated by removals
+    if delta > 0 or redis.call('HEXISTS', stats_key, day_field) == 1 then
+        redis.call('HINCRBY', stats_key, day_field, delta)
+    end
+end
+
+local function remove(stats_key, members_key, expiry_key, member)
+    local payload = redis.call('HGET', members_key, member)
+    if not payload then return 0 end
+    apply(stats_key, payload, -1)
+    redis.call('HDEL', members_key, member)
+    redis.call('ZREM', expiry_key, member)
+    return 1
+end
+"""
+
+# KEYS: stats, members, expiry, version, users
+# ARGV: [member, payload, timestamp, expires_at]..., user_id
+_RECORD_SCRIPT = _LUA_HELPERS + """
+local added = 0
+for i = 1, #ARGV - 1, 4 do
+    local member, payload, timestamp, expires_at = ARGV[i], ARGV[i + 1], ARGV[i + 2], tonumber(ARGV[i + 3])
+    local previous = redis.call('HGET', KEYS[2], member)
+    if previous ~= payload then
+        if previous then
+            apply(KEYS[1], previous, -1)
+        else
+            added = added + 1
+        end
+        apply(KEYS[1], payload, 1)
+        redis.call('HSET', KEYS[2], member, payload)
+        redis.call('INCR', KEYS[4])
+    end
+    if expires_at > 0 then
+        redis.call('ZADD', KEYS[3], expires_at, member)
+    end
+    local last = redis.call('HGET', KEYS[1], 'last_memory_timestamp')
+    if timestamp ~= '' and ((not last) or timestamp > last) then
+        redis.call('HSET', KEYS[1], 'last_memory_timestamp', timestamp)
+    end
+end
+redis.call('ZADD', KEYS[5], 'NX', 0, ARGV[#ARGV])
+return added
+"""
+
+# KEYS: stats, members, expiry, version; ARGV: members to remove
+_REMOVE_SCRIPT = _LUA_HELPERS + """
+local removed = 0
+for i = 1, #ARGV do
+    removed = removed + remove(KEYS[1], KEYS[2], KEYS[3], ARGV[i])
+end
+if removed > 0 then redis.call('INCR', KEYS[4]) end
+return removed
+"""
+
+# KEYS: stats, members, expiry, version; ARGV: tier
+_CLEAR_TIER_SCRIPT = _LUA_HELPERS + """
+local prefix = ARGV[1] .. ':'
+local removed = 0
+local members = redis.call('HKEYS', KEYS[2])
+for i = 1, #members do
+    if string.sub(members[i], 1, #prefix) == prefix then
+        removed = removed + remove(KEYS[1], KEYS[2], KEYS[3], members[i])
+    end
+end
+if removed > 0 then redis.call('INCR', KEYS[4]) end
+return removed
+"""
+
+# KEYS: stats, members, expiry; ARGV: now (epoch seconds), oldest day kept
+_EXPIRE_SCRIPT = _LUA_HELPERS + """
+local removed = 0
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[1])
+for i = 1, #expired do
+    removed = removed + remove(KEYS[1], KEYS[2], KEYS[3], expired[i])
+end
+local oldest = 'day:' .. ARGV[2]
+local fields = redis.call('HKEYS', KEYS[1])
+for i = 1, #fields do
+    if string.sub(fields[i], 1, 4) == 'day:' and fields[i] < oldest then
+        redis.call('HDEL', KEYS[1], fields[i])
+    end
+end
+return removed
+"""
+
+
+class MemoryStatsIndex:
+    """Per-user memory counters maintained incrementally in Redis."""
+
+    KEY_PREFIX = "memory_stats"
+    USERS_KEY = "memory_stats:users"
+
+    def _stats_key(self, user_id: str) -> str:
+        return f"user:{user_id}:{self.KEY_PREFIX}"
+
+    def _keys(self, user_id: str) -> List[str]:
+        stats_key = self._stats_key(user_id)
+        return [stats_key, f"{stats_key}:members", f"{stats_key}:expiry"]
+
+    def _version_key(self, user_id: str) -> str:
+        return f"{self._stats_key(user_id)}:version"
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Memory stats running without Redis: {e}")
+            return None
+
+    @staticmethod
+    def _payload(tier: str, metadata: Dict[str, Any], timestamp: str) -> str:
+        """Encode the attributes a memory contributes to the counters."""
+        category = str(metadata.get("memory_category") or "uncategorized")
+        return "|".join(
+            [
+                tier,
+                category.replace("|", "_"),
+                "1" if metadata.get("has_pii") else "0",
+                "1" if category == "emotional_anchor" else "0",
+                "1" if metadata.get("pending_long_term_consent") else "0",
+                (timestamp or datetime.utcnow().isoformat())[:10],
+            ]
+        )
+
+    async def record_memories(
+        self, user_id: str, tier: str, entries: List[StatsEntry]
+    ) -> int:
+        """
+        Count stored (or re-stored) memories.
+
+        Args:
+            user_id: Validated user ID from JWT
+            tier: SHORT_TERM or LONG_TERM
+            entries: (memory_id, metadata, ISO timestamp, TTL seconds) tuples
+
+        Returns:
+            Number of memories that were not counted before
+        """
+        client = await self._get_client()
+        if not client or not entries:
+            return 0
+
+        try:
+            return await self._record(
+                client,
+                [*self._keys(user_id), self._version_key(user_id)],
+                user_id,
+                tier,
+                entries,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record memory stats for user {user_id}: {e}")
+            return 0
+
+    async def _record(
+        self,
+        client,
+        keys: List[str],
+        user_id: str,
+        tier: str,
+        entries: List[StatsEntry],
+    ) -> int:
+        """Run the record script against the given stats, members, expiry and version keys."""
+        now = time.time()
+        args = []
+        for memory_id, metadata, timestamp, ttl_seconds in entries:
+            args.extend(
+                [
+                    f"{tier}:{memory_id}",
+                    self._payload(tier, metadata or {}, timestamp),
+                    timestamp or "",
+                    now + ttl_seconds if ttl_seconds else 0,
+                ]
+            )
+        args.append(user_id)
+
+        return await client.eval(_RECORD_SCRIPT, 5, *keys, self.USERS_KEY, *args)
+
+    async def remove_memories(
+        self, user_id: str, tier: str, memory_ids: List[str]
+    ) -> int:
+        """Stop counting deleted memories (unknown IDs are ignored)."""
+        client = await self._get_client()
+        if not client or not memory_ids:
+            return 0
+
+        try:
+            return await client.eval(
+                _REMOVE_SCRIPT,
+                4,
+                *self._keys(user_id),
+                self._version_key(user_id),
+                *[f"{tier}:{memory_id}" for memory_id in memory_ids],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to remove memory stats for user {user_id}: {e}")
+            return 0
+
+    async def clear_tier(self, user_id: str, tier: str) -> int:
+        """Stop counting every memory in one tier for a user."""
+        client = await self._get_client()
+        if not client:
+            return 0
+
+        try:
+            return await client.eval(
+                _CLEAR_TIER_SCRIPT,
+                4,
+                *self._keys(user_id),
+                self._version_key(user_id),
+                tier,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to clear {tier} stats for user {user_id}: {e}")
+            return 0
+
+    async def get_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a user's counters.
+
+        Short-term memories whose Redis TTL has passed are uncounted first.
+
+        Args:
+            user_id: Validated user ID from JWT
+
+        Returns:
+            Counter summary, or None if the user's stats were never built
+        """
+        client = await self._get_client()
+        if not client:
+            return None
+
+        today = datetime.utcnow().date()
+        oldest_day = today - timedelta(days=DAY_COUNTER_RETENTION_DAYS)
+
+        keys = self._keys(user_id)
+        try:
+            await client.eval(
+                _EXPIRE_SCRIPT, 3, *keys, time.time(), oldest_day.isoformat()
+            )
+            counters = await client.hgetall(keys[0])
+        except Exception as e:
+            logger.warning(f"Failed to read memory stats for user {user_id}: {e}")
+            return None
+        if not counters.get("built"):
+            return None
+
+        def count(field: str) -> int:
+            return max(0, int(counters.get(field, 0)))
+
+        categories: Dict[str, int] = {}
+        for field, value in counters.items():
+            tier, _, rest = field.partition(":category:")
+            if rest and int(value) > 0:
+                categories[rest] = categories.get(rest, 0) + int(value)
+
+        days = [(today - timedelta(days=offset)).isoformat() for offset in range(7)]
+
+        return {
+            SHORT_TERM: count(f"{SHORT_TERM}:total"),
+            LONG_TERM: count(f"{LONG_TERM}:total"),
+            "sensitive": count(f"{SHORT_TERM}:sensitive"),
+            "emotional_anchors": count(f"{SHORT_TERM}:anchors")
+            + count(f"{LONG_TERM}:anchors"),
+            "pending_consent": count(f"{SHORT_TERM}:pending_consent"),
+            "categories": categories,
+            "recent_activity": {
+                "memories_added_today": count(f"day:{days[0]}"),
+                "memories_added_this_week": sum(count(f"day:{day}") for day in days),
+                "last_memory_timestamp": counters.get("last_memory_timestamp"),
+            },
+        }
+
+    async def get_version(self, user_id: str) -> Optional[str]:
+        """
+        Read the version a recount is checked against.
+
+        Read it before reading the stores, and pass it to rebuild_user.
+        """
+        client = await self._get_client()
+        if not client:
+            return None
+        return await client.get(self._version_key(user_id)) or "0"
+
+    async def rebuild_user(
+        self,
+        user_id: str,
+        short_term: List[StatsEntry],
+        long_term: List[StatsEntry],
+        version: Optional[str] = None,
+    ) -> bool:
+        """
+        Replace a user's counters with a full recount.
+
+        The recount is built under temporary keys and swapped in atomically,
+        so readers keep seeing the previous counters (and the "built" marker)
+        until the new ones are complete.
+
+        Args:
+            user_id: Validated user ID from JWT
+            short_term: Every short-term memory currently stored
+            long_term: Every long-term memory currently stored
+            version: get_version() from before the stores were read; if
+                memories were counted or uncounted since, the recount is
+                discarded
+
+        Returns:
+            False if the recount was discarded as out of date
+        """
+        client = await self._get_client()
+        if not client:
+            return True
+
+        keys = self._keys(user_id)
+        version_key = self._version_key(user_id)
+        token = uuid.uuid4().hex
+        temp_keys = [f"{key}:rebuild:{token}" for key in [*keys, version_key]]
+
+        try:
+            await client.hset(temp_keys[0], "built", 1)
+            await client.expire(temp_keys[0], REBUILD_KEY_TTL_SECONDS)
+            for tier, entries in ((SHORT_TERM, short_term), (LONG_TERM, long_term)):
+                for start in range(0, len(entries), 500):
+                    await self._record(
+                        client, temp_keys, user_id, tier, entries[start : start + 500]
+                    )
+                    for temp_key in temp_keys[1:]:
+                        await client.expire(temp_key, REBUILD_KEY_TTL_SECONDS)
+
+            existing = [bool(await client.exists(temp_key)) for temp_key in temp_keys]
+            async with client.pipeline(transaction=True) as pipe:
+                if version is not None:
+                    await pipe.watch(version_key)
+                    if (await pipe.get(version_key) or "0") != version:
+                        await client.delete(*temp_keys)
+                        return False
+                    pipe.multi()
+                pipe.delete(*keys)
+                for key, temp_key, exists in zip(keys, temp_keys, existing):
+                    if exists:
+                        pipe.rename(temp_key, key)
+                        pipe.persist(key)
+                pipe.delete(temp_keys[-1])
+                await pipe.execute()
+        except WatchError:
+            await client.delete(*temp_keys)
+            return False
+        except Exception:
+            await client.delete(*temp_keys)
+            raise
+
+        if short_term or long_term:
+            await client.zadd(self.USERS_KEY, {user_id: time.time()})
+        else:
+            # Nothing to keep reconciling until the user stores a memory again
+            await client.zrem(self.USERS_KEY, user_id)
+        return True
+
+    async def users_due_for_reconcile(self, older_than: float, limit: int) -> List[str]:
+        """Users whose counters were last reconciled before `older_than` (epoch)."""
+        client = await self._get_client()
+        if not client:
+            return []
+        return await client.zrangebyscore(
+            self.USERS_KEY, "-inf", older_than, start=0, num=limit
+        )
+
+
+# Create global instance
+memory_stats_index = MemoryStatsIndex()
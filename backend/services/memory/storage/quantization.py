@@ -0,0 +1,109 @@
+"""
+Compact Embedding Representations.
+
+Embeddings are held as NumPy float32 arrays rather than lists of Python
+floats (4 bytes per dimension instead of roughly 28). Vectors held locally,
+in the in-process embedding cache and the local vector index, can also be
+scalar-quantized:
+
+- float32 - exact, 4 bytes per dimension
+- float16 - half precision, 2 bytes per dimension
+- int8    - symmetric per-vector scale, 1 byte per dimension (+4 bytes/vector)
+
+Similarity is computed with one matrix-vector product over all candidates.
+"""
+
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+# File suffix for each storage dtype (e.g. vectors.f16)
+DTYPE_SUFFIXES = {"float32": "f32", "float16": "f16", "int8": "i8"}
+
+_INT8_MAX = 127.0
+
+
+def resolve_dtype(dtype: Optional[str], default: str = "float32") -> str:
+    """Validate a configured dtype name, falling back to `default`."""
+    dtype = (dtype or default).lower()
+    if dtype not in VECTOR_DTYPES:
+        logger.warning(
+            f"Unknown vector dtype '{dtype}' (expected one of {VECTOR_DTYPES}), "
+            f"using {default}"
+        )
+        return default
+    return dtype
+
+
+def as_matrix(embeddings) -> np.ndarray:
+    """Convert one or more embeddings to a 2-D float32 matrix."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    return matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (zero rows are left as they are)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def quantize(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantize a float32 matrix.
+
+    Args:
+        matrix: Vectors to quantize, one per row
+        dtype: One of VECTOR_DTYPES
+
+    Returns:
+        Tuple of (codes, per-row float32 scales for int8, otherwise None)
+    """
+    matrix = as_matrix(matrix)
+
+    if dtype == "float16":
+        return matrix.astype(np.float16), None
+
+    if dtype == "int8":
+        scales = np.abs(matrix).max(axis=1) / _INT8_MAX
+        scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127)
+        return codes.astype(np.int8), scales
+
+    return matrix, None
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Recover a float32 matrix from quantize() output."""
+    matrix = codes.astype(np.float32)
+    if scales is not None:
+        matrix *= np.asarray(scales, dtype=np.float32).reshape(-1, 1)
+    return matrix
+
+
+def dot_scores(
+    query: Sequence[float],
+    codes: np.ndarray,
+    scales: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Dot product of a query, or of each row of a query matrix, with every
+    (possibly quantized) row.
+
+    For unit-length rows and queries this is the cosine similarity. The int8
+    scale is applied after the product, so rows are never dequantized.
+
+    Returns:
+        Scores of shape (rows,) for one query, or (rows, queries) for a matrix
+    """
+    query = np.asarray(query, dtype=np.float32)
+    scores = codes.astype(np.float32, copy=False) @ query.T
+    if scales is not None:
+        scales = np.asarray(scales, dtype=np.float32)
+        scores *= scales.reshape(-1, 1) if scores.ndim == 2 else scales
+    return scores
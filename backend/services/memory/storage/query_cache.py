@@ -0,0 +1,188 @@
+"""
+Semantic Query Cache.
+
+Caches similarity search results per user, keyed by the query's embedding
+rather than its text, so paraphrases of a recent query reuse its results:
+
+- user:{uid}:query_cache - list of recent searches, newest first, each holding
+                           the query embedding (float16), top-k results, the
+                           search latency and the memory version searched
+
+A search is served from the cache when a recent query's embedding is within
+SEMANTIC_QUERY_CACHE_THRESHOLD cosine similarity of the new one and the
+user's memory version (bumped by every memory write, see
+MemoryContextCache) still matches.
+"""
+
+import json
+import base64
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from utils.redis_client import get_redis_client
+
+from ..config import Config
+from .context_cache import MemoryContextCache, memory_context_cache
+from .quantization import normalize_rows
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class SemanticQueryCache:
+    """Per-user cache of similarity search results, matched by query embedding."""
+
+    KEY_PREFIX = "query_cache"
+
+    def __init__(self, versions: Optional[MemoryContextCache] = None):
+        self.versions = versions or memory_context_cache
+        self.threshold = Config.SEMANTIC_QUERY_CACHE_THRESHOLD
+        self.max_entries = Config.SEMANTIC_QUERY_CACHE_MAX_ENTRIES
+        self.ttl_seconds = Config.SEMANTIC_QUERY_CACHE_TTL_SECONDS
+        self._stats = {
+            "lookups": 0,
+            "hits": 0,
+            "stale": 0,
+            "saved_ms": 0.0,
+        }
+
+    def _key(self, user_id: str) -> str:
+        return f"user:{user_id}:{self.KEY_PREFIX}"
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"Semantic query cache running without Redis: {e}")
+            return None
+
+    @staticmethod
+    def _encode(embedding: np.ndarray) -> str:
+        return base64.b64encode(embedding.astype(np.float16).tobytes()).decode()
+
+    @staticmethod
+    def _decode(value: str) -> np.ndarray:
+        return np.frombuffer(base64.b64decode(value), dtype=np.float16)
+
+    async def get(
+        self, user_id: str, query_embedding: np.ndarray, k: int
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        Look up results of a recent, similar query.
+
+        Args:
+            user_id: Validated user ID from JWT
+            query_embedding: Embedding of the new query
+            k: Number of results wanted
+
+        Returns:
+            Tuple of (cached results or None, current memory version to store
+            fresh results under, or None when Redis is unavailable)
+        """
+        client = await self._get_client()
+        if not client:
+            return None, None
+
+        self._stats["lookups"] += 1
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(self.versions.user_version_key(user_id))
+            pipe.lrange(self._key(user_id), 0, -1)
+            version, values = await pipe.execute()
+            version = str(version or 0)
+
+            entries = [json.loads(value) for value in values]
+            if entries and entries[0]["version"] != version:
+                # Newest entry predates a write, so every entry does
+                self._stats["stale"] += 1
+                await client.delete(self._key(user_id))
+                return None, version
+
+            entries = [
+                entry
+                for entry in entries
+                if entry["version"] == version and entry["k"] >= k
+            ]
+            if not entries:
+                return None, version
+
+            cached = normalize_rows(
+                np.stack([self._decode(entry["embedding"]) for entry in entries])
+            ).astype(np.float32)
+            query = normalize_rows(query_embedding.astype(np.float32))
+            similarities = cached @ query
+            best = int(similarities.argmax())
+            if similarities[best] < self.threshold:
+                return None, version
+
+            entry = entries[best]
+            self._stats["hits"] += 1
+            self._stats["saved_ms"] += entry["latency_ms"]
+            return entry["results"][:k], version
+
+        except Exception as e:
+            logger.warning(f"Semantic query cache read failed for {user_id}: {e}")
+            return None, None
+
+    async def set(
+        self,
+        user_id: str,
+        query_embedding: np.ndarray,
+        k: int,
+        results: List[Dict[str, Any]],
+        version: str,
+        latency_ms: float,
+    ) -> None:
+        """Cache results of a search made while memories were at `version`."""
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            entry = json.dumps(
+                {
+                    "version": version,
+                    "k": k,
+                    "embedding": self._encode(query_embedding),
+                    "results": results,
+                    "latency_ms": round(latency_ms, 3),
+                },
+                default=str,
+            )
+            pipe = client.pipeline(transaction=True)
+            pipe.lpush(self._key(user_id), entry)
+            pipe.ltrim(self._key(user_id), 0, self.max_entries - 1)
+            pipe.expire(self._key(user_id), self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Semantic query cache write failed for {user_id}: {e}")
+
+    async def clear_user(self, user_id: str) -> None:
+        """Drop a user's cached searches."""
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            await client.delete(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Failed to clear semantic query cache for {user_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and search time saved in this process."""
+        lookups = self._stats["lookups"]
+        hits = self._stats["hits"]
+        return {
+            **self._stats,
+            "saved_ms": round(self._stats["saved_ms"], 3),
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "threshold": self.threshold,
+        }
+
+
+# Create global instance (shared by every store in the process)
+semantic_query_cache = SemanticQueryCache()
@@ -10,7 +10,7 @@ SECURE: Works with validated user_id from JWT session tokens.
 import redis
 import json
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 from datetime import datetime, timedelta
 from dataclasses import asdict
 
@@ -24,6 +24,9 @@ from utils.redis_client import (
 )
 
 from ..types import MemoryItem
+from .memory_stats import MemoryStatsIndex, memory_stats_index, SHORT_TERM
+from .memory_index import MemoryIndex, memory_index
+from .context_cache import MemoryContextCache, memory_context_cache
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -35,10 +38,21 @@ class RedisStore:
     All operations are secure by default since user_id comes from validated JWT.
     """
 
-    def __init__(self):
+    # TTL for user-scoped (non-conversation) memories
+    USER_MEMORY_TTL_HOURS = 24
+
+    def __init__(
+        self,
+        stats: Optional[MemoryStatsIndex] = None,
+        index: Optional[MemoryIndex] = None,
+        context_cache: Optional[MemoryContextCache] = None,
+    ):
         self.client = None
         self.redis_available = True
         self._initialized = False
+        self.stats_index = stats or memory_stats_index
+        self.memory_index = index or memory_index
+        self.context_cache = context_cache or memory_context_cache
 
     async def _ensure_initialized(self):
         """Ensure Redis connection is initialized (lazy initialization)."""
@@ -119,7 +133,7 @@ class RedisStore:
                 # Fallback to user-scoped for non-chat memories
                 memory_key = self._get_user_key(user_id, f"memory:{memory.id}")
                 list_key = self._get_user_key(user_id, "list")
-                ttl_hours = 24
+                ttl_hours = self.USER_MEMORY_TTL_HOURS
 
             memory_data = {
                 "id": memory.id,
@@ -138,10 +152,37 @@ class RedisStore:
                 json.dumps(memory_data),
             )
 
-            # Add to conversation's memory list
+            # Add to conversation's memory list (once, if stored again)
+            await self.client.lrem(list_key, 0, memory.id)
             await self.client.lpush(list_key, memory.id)
             await self.client.expire(list_key, timedelta(hours=ttl_hours))
 
+            # Cached contexts built without this memory are now stale
+            if conversation_id:
+                await self.context_cache.invalidate_conversation(conversation_id)
+            else:
+                await self.context_cache.invalidate_user(user_id)
+
+            # User-scoped memories count towards the user's stats and index
+            if not conversation_id:
+                await self.stats_index.record_memories(
+                    user_id,
+                    SHORT_TERM,
+                    [
+                        (
+                            memory.id,
+                            memory.metadata,
+                            memory_data["timestamp"],
+                            ttl_hours * 3600,
+                        )
+                    ],
+                )
+                await self.memory_index.add_memories(
+                    user_id,
+                    SHORT_TERM,
+                    [(memory.id, memory.metadata, memory_data["timestamp"])],
+                )
+
             logger.debug(
                 f"Stored memory {memory.id} for {'conversation ' + conversation_id if conversation_id else 'user ' + user_id}"
             )
@@ -175,16 +216,22 @@ class RedisStore:
             list_key = self._get_conversation_key(conversation_id, "list")
             memory_ids = await self.client.lrange(list_key, 0, limit - 1)
 
-            memories = []
-            for memory_id in memory_ids:
-                memory_id = (
-                    memory_id.decode() if isinstance(memory_id, bytes) else memory_id
-                )
-                memory_key = self._get_conversation_key(
-                    conversation_id, f"memory:{memory_id}"
+            # Fetch every memory in one round trip
+            values = (
+                await self.client.mget(
+                    [
+                        self._get_conversation_key(
+                            conversation_id, f"memory:{memory_id}"
+                        )
+                        for memory_id in memory_ids
+                    ]
                 )
+                if memory_ids
+                else []
+            )
 
-                memory_data = await self.client.get(memory_key)
+            memories = []
+            for memory_id, memory_data in zip(memory_ids, values):
                 if memory_data:
                     try:
                         data = json.loads(memory_data)
@@ -234,29 +281,11 @@ class RedisStore:
             user_list_key = self._get_user_key(user_id, "list")
             memory_ids = await self.client.lrange(user_list_key, 0, limit - 1)
 
-            memories = []
-            for memory_id in memory_ids:
-                memory_id = (
-                    memory_id.decode() if isinstance(memory_id, bytes) else memory_id
-                )
-                memory_key = self._get_user_key(user_id, f"memory:{memory_id}")
-
-                memory_data = await self.client.get(memory_key)
-                if memory_data:
-                    try:
-                        data = json.loads(memory_data)
-                        # Verify memory belongs to user (security check)
-                        if data.get("user_id") == user_id:
-                            memory = MemoryItem(
-                                id=data["id"],
-                                content=data["content"],
-                                type=data["type"],
-                                timestamp=datetime.fromisoformat(data["timestamp"]),
-                                metadata=data.get("metadata", {}),
-                            )
-                            memories.append(memory)
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.warning(f"Invalid memory data for {memory_id}: {e}")
+            # Fetch every memory in one round trip (ownership is verified there)
+            found = await self.get_memories(user_id, list(dict.fromkeys(memory_ids)))
+            memories = [
+                found[memory_id] for memory_id in memory_ids if memory_id in found
+            ]
 
             logger.debug(f"Retrieved {len(memories)} user memories for user {user_id}")
             return memories
@@ -265,6 +294,46 @@ class RedisStore:
             logger.error(f"Failed to get memories for user {user_id}: {e}")
             return []
 
+    async def iter_user_memories(
+        self, user_id: str, page_size: int = 100
+    ) -> AsyncIterator[MemoryItem]:
+        """
+        Stream every user-scoped memory, newest first, one page at a time.
+
+        Args:
+            user_id: Validated user ID from JWT
+            page_size: Memory IDs read (and memories fetched) per round trip
+
+        Yields:
+            User's non-conversation memories
+        """
+        await self._ensure_initialized()
+
+        if not self.redis_available or not self.client:
+            logger.warning("Redis not available for memory retrieval")
+            return
+
+        user_list_key = self._get_user_key(user_id, "list")
+        seen = set()
+        start = 0
+
+        while True:
+            memory_ids = await self.client.lrange(
+                user_list_key, start, start + page_size - 1
+            )
+            # Re-stored memories appear in the list more than once
+            page_ids = [memory_id for memory_id in memory_ids if memory_id not in seen]
+            seen.update(page_ids)
+
+            memories = await self.get_memories(user_id, page_ids)
+            for memory_id in page_ids:
+                if memory_id in memories:
+                    yield memories[memory_id]
+
+            if len(memory_ids) < page_size:
+                return
+            start += page_size
+
     async def get_memory(self, user_id: str, memory_id: str) -> Optional[MemoryItem]:
         """
         Get a specific memory for a user.
@@ -301,6 +370,57 @@ class RedisStore:
             logger.error(f"Failed to get memory {memory_id} for user {user_id}: {e}")
             return None
 
+    async def get_memories(
+        self, user_id: str, memory_ids: List[str]
+    ) -> Dict[str, MemoryItem]:
+        """
+        Get many user-scoped memories in a single round trip.
+
+        Args:
+            user_id: Validated user ID from JWT
+            memory_ids: Memory IDs to retrieve
+
+        Returns:
+            Mapping of memory ID to memory, for memories found and owned by user
+
+        Raises:
+            ConnectionError: If Redis is unavailable; read errors are raised
+                too, so a memory left out of the result is known to be gone
+        """
+        memories = {}
+        if not memory_ids:
+            return memories
+
+        await self._ensure_initialized()
+        if not self.redis_available or not self.client:
+            raise ConnectionError("Redis not available for memory retrieval")
+
+        values = await self.client.mget(
+            [
+                self._get_user_key(user_id, f"memory:{memory_id}")
+                for memory_id in memory_ids
+            ]
+        )
+
+        for memory_id, memory_data in zip(memory_ids, values):
+            if not memory_data:
+                continue
+            try:
+                data = json.loads(memory_data)
+                # Verify memory belongs to user (security check)
+                if data.get("user_id") == user_id:
+                    memories[memory_id] = MemoryItem(
+                        id=data["id"],
+                        content=data["content"],
+                        type=data["type"],
+                        timestamp=datetime.fromisoformat(data["timestamp"]),
+                        metadata=data.get("metadata", {}),
+                    )
+            except (json.JSONDecodeError, KeyError) as e:
+                logger.warning(f"Invalid memory data for {memory_id}: {e}")
+
+        return memories
+
     async def delete_memory(self, user_id: str, memory_id: str) -> bool:
         """
         Delete a specific memory for a user.
@@ -323,6 +443,9 @@ class RedisStore:
             # Delete individual memory
             memory_key = self._get_user_key(user_id, f"memory:{memory_id}")
             deleted = await self.client.delete(memory_key)
+            await self.stats_index.remove_memories(user_id, SHORT_TERM, [memory_id])
+            await self.memory_index.remove_memories(user_id, SHORT_TERM, [memory_id])
+            await self.context_cache.invalidate_user(user_id)
 
             logger.debug(f"Deleted memory {memory_id} for user {user_id}")
             return deleted > 0
@@ -331,6 +454,75 @@ class RedisStore:
             logger.error(f"Failed to delete memory {memory_id} for user {user_id}: {e}")
             return False
 
+    async def delete_memories(
+        self, user_id: str, memory_ids: List[str]
+    ) -> Dict[str, bool]:
+        """
+        Delete many memories for a user in a single round trip.
+
+        Args:
+            user_id: Validated user ID from JWT
+            memory_ids: Memory IDs to delete
+
+        Returns:
+            Mapping of memory ID to whether it existed and was deleted
+        """
+        results = {memory_id: False for memory_id in memory_ids}
+
+        try:
+            if not self.redis_available or not self.client or not results:
+                return results
+
+            user_list_key = self._get_user_key(user_id, "list")
+            pipe = self.client.pipeline(transaction=False)
+            for memory_id in results:
+                pipe.lrem(user_list_key, 0, memory_id)
+                pipe.delete(self._get_user_key(user_id, f"memory:{memory_id}"))
+            responses = await pipe.execute()
+
+            # Every memory queued an LREM then a DELETE; the DELETE count matters
+            for memory_id, deleted in zip(results, responses[1::2]):
+                results[memory_id] = deleted > 0
+
+            await self.stats_index.remove_memories(user_id, SHORT_TERM, list(results))
+            await self.memory_index.remove_memories(user_id, SHORT_TERM, list(results))
+            await self.context_cache.invalidate_user(user_id)
+
+            logger.debug(
+                f"Deleted {sum(results.values())}/{len(results)} memories for user {user_id}"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to delete memories for user {user_id}: {e}")
+            return results
+
+    async def get_memory_ttls(
+        self, user_id: str, memory_ids: List[str]
+    ) -> Dict[str, Optional[int]]:
+        """
+        Get the remaining TTL of user-scoped memories.
+
+        Args:
+            user_id: Validated user ID from JWT
+            memory_ids: Memory IDs to check
+
+        Returns:
+            Mapping of memory ID to seconds left (None if missing or persistent)
+        """
+        if not self.redis_available or not self.client or not memory_ids:
+            return {}
+
+        pipe = self.client.pipeline(transaction=False)
+        for memory_id in memory_ids:
+            pipe.ttl(self._get_user_key(user_id, f"memory:{memory_id}"))
+        ttls = await pipe.execute()
+
+        return {
+            memory_id: ttl if ttl and ttl > 0 else None
+            for memory_id, ttl in zip(memory_ids, ttls)
+        }
+
     async def clear_conversation_memories(self, conversation_id: str) -> bool:
         """
         Clear all memories for a specific conversation.
@@ -363,6 +555,7 @@ class RedisStore:
 
             # Delete the list
             await self.client.delete(list_key)
+            await self.context_cache.invalidate_conversation(conversation_id)
 
             logger.info(
                 f"Cleared {deleted_count} memories for conversation {conversation_id}"
@@ -463,6 +656,9 @@ class RedisStore:
                 await self.client.delete(*keys)
                 logger.info(f"Cleared {len(keys)} Redis keys for user {user_id}")
 
+            await self.stats_index.clear_tier(user_id, SHORT_TERM)
+            await self.memory_index.clear_tier(user_id, SHORT_TERM)
+            await self.context_cache.clear_user(user_id)
             return True
 
         except Exception as e:
@@ -7,15 +7,19 @@ for semantic search and long-term retention.
 
 import os
 import json
+import asyncio
 import logging
 import sys
-from typing import List, Optional, Dict, Any, Tuple
+import time
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator
 from datetime import datetime
 import chromadb
 from chromadb.config import Settings
 import uuid
 from dataclasses import asdict
+import numpy as np
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
 # Import Pinecone
 try:
@@ -30,6 +34,17 @@ except ImportError:
 
 from ..types import MemoryItem
 from ..config import Config
+from .embedding_cache import EmbeddingCache, embedding_cache
+from .local_vector_index import LocalVectorIndex, get_local_vector_index
+from .quantization import as_matrix, resolve_dtype
+from .lexical_index import LexicalIndex, lexical_index
+from .memory_stats import MemoryStatsIndex, memory_stats_index, LONG_TERM
+from .memory_index import MemoryIndex, memory_index
+from .context_cache import MemoryContextCache, memory_context_cache
+from .dedup_index import MemoryDedupIndex, memory_dedup_index
+from .query_cache import SemanticQueryCache, semantic_query_cache
+from utils.scoring.score_cache import scoring_cache
+from utils.single_flight import single_flight
 
 # Import authentication systems - SIMPLIFIED for session-based auth
 from ..types import MemoryItem
@@ -38,6 +53,12 @@ from ..config import Config
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Shared by every VectorStore instance so the concurrency bound is process-wide
+_embedding_semaphore = asyncio.Semaphore(max(1, Config.EMBEDDING_MAX_CONCURRENCY))
+
+# Texts already being embedded for a user are awaited rather than re-sent
+_embedding_flight = single_flight("embeddings")
+
 
 class VectorStore:
     """
@@ -45,15 +66,32 @@ class VectorStore:
     All operations are secure by default since user_id comes from validated JWT.
     """
 
+    # Pinecone's recommended upsert size and maximum ids per delete/fetch
+    PINECONE_UPSERT_BATCH_SIZE = 100
+    PINECONE_DELETE_BATCH_SIZE = 1000
+    # Pinecone returns at most 100 ids per list call
+    PINECONE_LIST_PAGE_SIZE = 100
+    DEFAULT_PAGE_SIZE = 100
+
     def __init__(
         self,
         persist_directory: str = None,
         use_pinecone: bool = False,
         vector_db_type: str = "chroma",
+        cache: Optional[EmbeddingCache] = None,
+        lexical: Optional[LexicalIndex] = None,
+        stats: Optional[MemoryStatsIndex] = None,
+        index: Optional[MemoryIndex] = None,
+        context_cache: Optional[MemoryContextCache] = None,
+        dedup: Optional[MemoryDedupIndex] = None,
+        query_cache: Optional[SemanticQueryCache] = None,
     ):
         # Determine which vector database to use
         self.vector_db_type = vector_db_type.lower()
-        self.use_pinecone = use_pinecone or (self.vector_db_type == "pinecone")
+        self.use_local = self.vector_db_type == "local"
+        self.use_pinecone = not self.use_local and (
+            use_pinecone or (self.vector_db_type == "pinecone")
+        )
         self.persist_directory = persist_directory or "chroma"
 
         # Initialize storage system
@@ -61,6 +99,29 @@ class VectorStore:
         self.collection = None
         self.pinecone_client = None
         self.pinecone_index = None
+        self.local_index: Optional[LocalVectorIndex] = None
+
+        # Embeddings are shared with every other VectorStore in the process
+        self.embedding_cache = cache or embedding_cache
+        self._embeddings_configured = False
+
+        # BM25 index kept in step with writes for hybrid retrieval
+        self.lexical_index = lexical or lexical_index
+
+        # Per-user counters kept in step with writes
+        self.stats_index = stats or memory_stats_index
+
+        # Category / conversation lookup kept in step with writes
+        self.memory_index = index or memory_index
+
+        # Cached memory contexts, invalidated by every write
+        self.context_cache = context_cache or memory_context_cache
+
+        # Near-duplicate signatures kept in step with writes
+        self.dedup_index = dedup or memory_dedup_index
+
+        # Recent search results, reused for similar queries until a write
+        self.query_cache = query_cache or semantic_query_cache
 
         logger.info(f"Initialized VectorStore with {self.vector_db_type} backend")
 
@@ -75,7 +136,9 @@ class VectorStore:
     async def initialize(self):
         """Initialize the vector database connection."""
         try:
-            if self.use_pinecone and PINECONE_AVAILABLE:
+            if self.use_local:
+                await self._initialize_local()
+            elif self.use_pinecone and PINECONE_AVAILABLE:
                 await self._initialize_pinecone()
             else:
                 await self._initialize_chroma()
@@ -88,6 +151,32 @@ class VectorStore:
             logger.error(f"Failed to initialize vector store: {e}")
             raise
 
+    @property
+    def is_initialized(self) -> bool:
+        """Whether a backend connection has been established."""
+        return bool(self.client or self.pinecone_index or self.local_index)
+
+    async def _ensure_initialized(self):
+        """Initialize the backend on first use."""
+        if not self.is_initialized:
+            await self.initialize()
+
+    async def _initialize_local(self):
+        """Initialize the local on-disk ANN index."""
+        try:
+            self.local_index = get_local_vector_index(
+                Config.LOCAL_VECTOR_DIR,
+                max_loaded_users=Config.LOCAL_VECTOR_MAX_LOADED_USERS,
+                dtype=resolve_dtype(Config.LOCAL_VECTOR_DTYPE),
+            )
+            logger.info(
+                f"Using local vector index at {self.local_index.base_directory}"
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to initialize local vector index: {e}")
+            raise
+
     async def _initialize_pinecone(self):
         """Initialize Pinecone client and index."""
         try:
@@ -146,29 +235,179 @@ class VectorStore:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
 
-    async def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for texts using Google AI."""
+    async def _get_embeddings(
+        self,
+        texts: List[str],
+        task_type: str = "retrieval_document",
+        user_id: Optional[str] = None,
+        exact: bool = False,
+    ) -> np.ndarray:
+        """
+        Generate embeddings for texts using Google AI.
+
+        Cached embeddings are served from the embedding cache. Remaining texts
+        are deduplicated, texts a concurrent call is already embedding for the
+        same user are awaited, and the rest are sent in batches of
+        EMBEDDING_BATCH_SIZE per request. Batches run in worker threads so the event loop is never
+        blocked, with at most EMBEDDING_MAX_CONCURRENCY requests in flight.
+
+        Args:
+            texts: Texts to embed
+            task_type: Embedding task type passed to the model
+            user_id: Owner of the texts, so cached entries can be purged (GDPR)
+            exact: Skip quantized cache entries (vectors that will be stored)
+
+        Returns:
+            float32 matrix with one embedding row per input text, in input order
+        """
         try:
-            if not Config.GOOGLE_API_KEY:
-                raise ValueError("GOOGLE_API_KEY not configured for embeddings")
+            if not texts:
+                return np.empty((0, 0), dtype=np.float32)
 
-            genai.configure(api_key=Config.GOOGLE_API_KEY)
+            embeddings = await self.embedding_cache.get_many(
+                texts, task_type, user_id=user_id, exact=exact
+            )
 
-            embeddings = []
-            for text in texts:
-                result = genai.embed_content(
-                    model="models/embedding-001",
-                    content=text,
-                    task_type="retrieval_document",
+            # Embed each distinct uncached text once
+            missing_texts = list(
+                dict.fromkeys(
+                    text for text, cached in zip(texts, embeddings) if cached is None
                 )
-                embeddings.append(result["embedding"])
+            )
+
+            if missing_texts:
+                self._configure_embeddings()
 
-            return embeddings
+                async def embed_missing(keys: List[Tuple]) -> List[np.ndarray]:
+                    batch_texts = [text for _, _, text in keys]
+                    batch_size = max(1, Config.EMBEDDING_BATCH_SIZE)
+                    batches = [
+                        batch_texts[i : i + batch_size]
+                        for i in range(0, len(batch_texts), batch_size)
+                    ]
+
+                    batch_results = await asyncio.gather(
+                        *(self._embed_batch(batch, task_type) for batch in batches)
+                    )
+                    new_embeddings = np.vstack(batch_results)
+
+                    await self.embedding_cache.set_many(
+                        batch_texts, task_type, new_embeddings, user_id=user_id
+                    )
+                    return list(new_embeddings)
+
+                # Keyed per user so cache ownership (GDPR purges) stays exact
+                new_embeddings = await _embedding_flight.do_many(
+                    [(user_id, task_type, text) for text in missing_texts],
+                    embed_missing,
+                )
+
+                embedded = dict(zip(missing_texts, new_embeddings))
+                embeddings = [
+                    cached if cached is not None else embedded[text]
+                    for text, cached in zip(texts, embeddings)
+                ]
+
+            return np.vstack(embeddings)
 
         except Exception as e:
             logger.error(f"Failed to generate embeddings: {e}")
             raise
 
+    def _configure_embeddings(self):
+        """Configure the Google AI client once per process."""
+        if self._embeddings_configured:
+            return
+
+        if not Config.GOOGLE_API_KEY:
+            raise ValueError("GOOGLE_API_KEY not configured for embeddings")
+
+        genai.configure(api_key=Config.GOOGLE_API_KEY)
+        self._embeddings_configured = True
+
+    async def _embed_batch(self, texts: List[str], task_type: str) -> np.ndarray:
+        """
+        Embed one batch off the event loop.
+
+        If the request is rejected because the payload is too large, the batch
+        is split in half and each half is retried. Other errors (auth, quota,
+        network) are re-raised right away, as is a single text that is still
+        too large.
+        """
+        try:
+            async with _embedding_semaphore:
+                return await asyncio.to_thread(self._embed_batch_sync, texts, task_type)
+
+        except Exception as e:
+            if len(texts) <= 1 or not self._is_payload_error(e):
+                raise
+
+            middle = len(texts) // 2
+            logger.warning(
+                f"Embedding batch of {len(texts)} texts was too large ({e}), "
+                f"retrying as batches of {middle} and {len(texts) - middle}"
+            )
+            first, second = await asyncio.gather(
+                self._embed_batch(texts[:middle], task_type),
+                self._embed_batch(texts[middle:], task_type),
+            )
+            return np.vstack([first, second])
+
+    @staticmethod
+    def _is_payload_error(error: Exception) -> bool:
+        """Whether an embedding request failed because its payload was too large."""
+        if isinstance(error, google_exceptions.InvalidArgument):
+            return True
+        # 413 Request Entity Too Large has no dedicated exception class
+        return getattr(error, "code", None) == 413
+
+    def _embed_batch_sync(self, texts: List[str], task_type: str) -> np.ndarray:
+        """Blocking batch embedding call (runs in a worker thread)."""
+        result = genai.embed_content(
+            model=Config.EMBEDDING_MODEL,
+            content=texts,
+            task_type=task_type,
+        )
+        embeddings = result["embedding"]
+
+        # Guard against a flat vector being returned for a single text
+        if embeddings and not isinstance(embeddings[0], (list, tuple)):
+            embeddings = [embeddings]
+
+        if len(embeddings) != len(texts):
+            raise ValueError(
+                f"Embedding count mismatch: sent {len(texts)}, got {len(embeddings)}"
+            )
+
+        return as_matrix(embeddings)
+
+    async def embed_texts(
+        self, texts: List[str], user_id: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Embed texts the same way stored memories are embedded.
+
+        Results go through the shared embedding cache, so embedding a memory
+        before storing it costs no extra embedding call.
+
+        Args:
+            texts: Texts to embed
+            user_id: Owner of the texts, for per-user cache purging
+
+        Returns:
+            float32 matrix with one embedding row per input text
+        """
+        await self._ensure_initialized()
+        return await self._get_embeddings(texts, user_id=user_id)
+
+    def _vector_id(self, user_id: str, memory_id: str) -> str:
+        """Get the backend vector ID for a user's memory."""
+        return f"{user_id}_{memory_id}"
+
+    def _chroma_batch_size(self) -> int:
+        """Largest batch the Chroma client accepts in a single call."""
+        return getattr(self.client, "max_batch_size", None) or 5000
+
     async def store_memory(self, user_id: str, memory: MemoryItem) -> bool:
         """
         Store a memory with user isolation.
@@ -180,16 +419,50 @@ class VectorStore:
         Returns:
             Success status
         """
+        results = await self.store_memories(user_id, [memory])
+        return results.get(memory.id, False)
+
+    async def store_memories(
+        self, user_id: str, memories: List[MemoryItem]
+    ) -> Dict[str, bool]:
+        """
+        Store many memories with user isolation.
+
+        Embeddings are generated in batches, and vectors are written in chunks
+        sized for the backend (one Pinecone upsert per PINECONE_UPSERT_BATCH_SIZE
+        vectors, one Chroma upsert per max_batch_size vectors). Re-storing an
+        existing memory ID replaces it on every backend. A failed chunk only
+        fails the memories in that chunk.
+
+        Args:
+            user_id: Validated user ID from JWT
+            memories: Memories to store
+
+        Returns:
+            Mapping of memory ID to success status
+        """
+        results = {memory.id: False for memory in memories}
+        if not memories:
+            return results
+
         try:
-            if not self.client and not self.pinecone_index:
-                await self.initialize()
+            await self._ensure_initialized()
 
-            # Generate embedding
-            embeddings = await self._get_embeddings([memory.content])
-            embedding = embeddings[0]
+            # Generate embeddings (exact float32, never dequantized cache entries)
+            embeddings = await self._get_embeddings(
+                [memory.content for memory in memories], user_id=user_id, exact=True
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to embed memories for user {user_id}: {e}")
+            return results
 
-            # Create metadata with user ownership
-            metadata = {
+        ids = [self._vector_id(user_id, memory.id) for memory in memories]
+        documents = [memory.content for memory in memories]
+
+        # Create metadata with user ownership
+        metadatas = [
+            {
                 **memory.metadata,
                 "user_id": user_id,
                 "memory_id": memory.id,
@@ -197,33 +470,110 @@ class VectorStore:
                 "timestamp": memory.timestamp.isoformat(),
                 "content_preview": memory.content[:100],
             }
+            for memory in memories
+        ]
 
-            if self.use_pinecone and self.pinecone_index:
-                # Store in Pinecone with user namespace
-                vector_data = {
-                    "id": f"{user_id}_{memory.id}",
-                    "values": embedding,
-                    "metadata": metadata,
-                }
+        if self.use_local:
+            batch_size = len(memories)
+        elif self.use_pinecone and self.pinecone_index:
+            batch_size = self.PINECONE_UPSERT_BATCH_SIZE
+        else:
+            batch_size = self._chroma_batch_size()
 
-                namespace = self._get_user_namespace(user_id)
-                self.pinecone_index.upsert(vectors=[vector_data], namespace=namespace)
+        namespace = self._get_user_namespace(user_id)
 
-            else:
-                # Store in ChromaDB with user metadata filter
-                self.collection.add(
-                    ids=[f"{user_id}_{memory.id}"],
-                    embeddings=[embedding],
-                    documents=[memory.content],
-                    metadatas=[metadata],
+        for start in range(0, len(memories), batch_size):
+            end = start + batch_size
+
+            try:
+                if self.use_local:
+                    # Store in the user's own local index
+                    await asyncio.to_thread(
+                        self.local_index.add,
+                        user_id,
+                        ids[start:end],
+                        embeddings[start:end],
+                        documents[start:end],
+                        metadatas[start:end],
+                    )
+
+                elif self.use_pinecone and self.pinecone_index:
+                    # Store in Pinecone with user namespace
+                    vectors = [
+                        {
+                            "id": vector_id,
+                            "values": embedding.tolist(),
+                            "metadata": metadata,
+                        }
+                        for vector_id, embedding, metadata in zip(
+                            ids[start:end], embeddings[start:end], metadatas[start:end]
+                        )
+                    ]
+                    self.pinecone_index.upsert(vectors=vectors, namespace=namespace)
+
+                else:
+                    # Store in ChromaDB with user metadata filter. Upsert, since
+                    # add() keeps the old row when an ID is re-stored (dedup
+                    # merges, consent transitions, consolidation summaries)
+                    self.collection.upsert(
+                        ids=ids[start:end],
+                        embeddings=embeddings[start:end].tolist(),
+                        documents=documents[start:end],
+                        metadatas=metadatas[start:end],
+                    )
+
+                for memory in memories[start:end]:
+                    results[memory.id] = True
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to store {len(ids[start:end])} memories for user {user_id}: {e}"
                 )
 
-            logger.debug(f"Stored memory {memory.id} for user {user_id}")
-            return True
+        await self.stats_index.record_memories(
+            user_id,
+            LONG_TERM,
+            [
+                (memory.id, metadata, metadata["timestamp"], None)
+                for memory, metadata in zip(memories, metadatas)
+                if results[memory.id]
+            ],
+        )
+        await self.context_cache.invalidate_user(user_id)
+        await self.memory_index.add_memories(
+            user_id,
+            LONG_TERM,
+            [
+                (memory.id, metadata, metadata["timestamp"])
+                for memory, metadata in zip(memories, metadatas)
+                if results[memory.id]
+            ],
+        )
+
+        if Config.HYBRID_SEARCH_ENABLED:
+            await self.lexical_index.add_documents(
+                user_id,
+                [
+                    (memory.id, memory.content, metadata)
+                    for memory, metadata in zip(memories, metadatas)
+                    if results[memory.id]
+                ],
+            )
 
-        except Exception as e:
-            logger.error(f"Failed to store memory for user {user_id}: {e}")
-            return False
+        if Config.MEMORY_DEDUP_ENABLED:
+            await self.dedup_index.add_memories(
+                user_id,
+                [
+                    (memory.id, memory.content)
+                    for memory in memories
+                    if results[memory.id]
+                ],
+            )
+
+        logger.debug(
+            f"Stored {sum(results.values())}/{len(memories)} memories for user {user_id}"
+        )
+        return results
 
     async def similarity_search(
         self, query: str, user_id: str, k: int = 5
@@ -231,6 +581,9 @@ class VectorStore:
         """
         Search user's memories by similarity.
 
+        Results of a recent query whose embedding is close enough to this
+        one are served from the semantic query cache.
+
         Args:
             query: Search query
             user_id: Validated user ID from JWT
@@ -239,71 +592,164 @@ class VectorStore:
         Returns:
             List of similar memories with scores
         """
-        try:
-            if not self.client and not self.pinecone_index:
-                await self.initialize()
+        results = await self.similarity_search_many(user_id, [query], k)
+        return results[0]
 
-            # Generate query embedding
-            query_embeddings = await self._get_embeddings([query])
-            query_embedding = query_embeddings[0]
+    async def similarity_search_many(
+        self, user_id: str, queries: List[str], k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search user's memories for several queries at once.
 
-            results = []
+        All queries are embedded in one batch. Queries not answered by the
+        semantic query cache are searched together: one multi-vector query
+        for Chroma and the local index, one query per vector for Pinecone,
+        which has no multi-vector query.
 
-            if self.use_pinecone and self.pinecone_index:
-                # Search in user's Pinecone namespace
-                namespace = self._get_user_namespace(user_id)
+        Args:
+            user_id: Validated user ID from JWT
+            queries: Search queries
+            k: Number of results per query
+
+        Returns:
+            One list of similar memories with scores per query, in query order
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if not queries:
+            return results
+
+        try:
+            await self._ensure_initialized()
+
+            # Generate every query embedding in one batch
+            query_embeddings = await self._get_embeddings(queries, user_id=user_id)
+
+            versions: List[Optional[str]] = [None] * len(queries)
+            pending = list(range(len(queries)))
+            if Config.SEMANTIC_QUERY_CACHE_ENABLED:
+                lookups = await asyncio.gather(
+                    *(
+                        self.query_cache.get(user_id, embedding, k)
+                        for embedding in query_embeddings
+                    )
+                )
+                pending = []
+                for i, (cached, version) in enumerate(lookups):
+                    versions[i] = version
+                    if cached is not None:
+                        results[i] = cached
+                    else:
+                        pending.append(i)
+                if len(pending) < len(queries):
+                    logger.debug(
+                        f"Semantic query cache answered {len(queries) - len(pending)}"
+                        f"/{len(queries)} searches for user {user_id}"
+                    )
+
+            if not pending:
+                return results
+
+            search_start = time.perf_counter()
+            found = await self._search_embeddings(user_id, query_embeddings[pending], k)
+            latency_ms = (time.perf_counter() - search_start) * 1000 / len(pending)
+
+            for i, query_results in zip(pending, found):
+                # Sort by score (highest first)
+                query_results.sort(key=lambda x: x["score"], reverse=True)
+                results[i] = query_results
+
+                if versions[i] is not None:
+                    await self.query_cache.set(
+                        user_id,
+                        query_embeddings[i],
+                        k,
+                        query_results,
+                        versions[i],
+                        latency_ms,
+                    )
+
+            logger.debug(
+                f"Found {sum(len(r) for r in results)} similar memories for "
+                f"{len(queries)} queries for user {user_id}"
+            )
+            return results
 
+        except Exception as e:
+            logger.error(f"Failed to search memories for user {user_id}: {e}")
+            return [[] for _ in queries]
+
+    async def _search_embeddings(
+        self, user_id: str, query_embeddings: np.ndarray, k: int
+    ) -> List[List[Dict[str, Any]]]:
+        """Query the backend with every row of `query_embeddings`."""
+        if self.use_local:
+            # Search the user's own local index (no metadata filter needed)
+            # A cold user index is loaded from disk, so keep it off the loop
+            found = await asyncio.to_thread(
+                self.local_index.query_many, user_id, query_embeddings, k
+            )
+            return [
+                [
+                    {
+                        "content": record["document"],
+                        "score": score,
+                        "metadata": record["metadata"],
+                        "memory_id": record["metadata"].get("memory_id"),
+                    }
+                    for record, score in matches
+                ]
+                for matches in found
+            ]
+
+        if self.use_pinecone and self.pinecone_index:
+            # Search in user's Pinecone namespace
+            namespace = self._get_user_namespace(user_id)
+            results = []
+            for query_embedding in query_embeddings:
                 search_results = self.pinecone_index.query(
-                    vector=query_embedding,
+                    vector=query_embedding.tolist(),
                     top_k=k,
                     namespace=namespace,
                     include_metadata=True,
                 )
-
-                for match in search_results.matches:
-                    results.append(
+                results.append(
+                    [
                         {
                             "content": match.metadata.get("content_preview", ""),
                             "score": float(match.score),
                             "metadata": match.metadata,
                             "memory_id": match.metadata.get("memory_id"),
                         }
-                    )
-
-            else:
-                # Search in ChromaDB with user filter
-                search_results = self.collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=k,
-                    where=self._get_user_metadata_filter(user_id),
+                        for match in search_results.matches
+                    ]
                 )
-
-                if search_results["documents"]:
-                    for i, doc in enumerate(search_results["documents"][0]):
-                        metadata = search_results["metadatas"][0][i]
-                        distance = search_results["distances"][0][i]
-
-                        # Convert distance to similarity score (higher = more similar)
-                        score = 1.0 - distance
-
-                        results.append(
-                            {
-                                "content": doc,
-                                "score": score,
-                                "metadata": metadata,
-                                "memory_id": metadata.get("memory_id"),
-                            }
-                        )
-
-            # Sort by score (highest first)
-            results.sort(key=lambda x: x["score"], reverse=True)
-
-            logger.debug(f"Found {len(results)} similar memories for user {user_id}")
             return results
 
-        except Exception as e:
-            logger.error(f"Failed to search memories for user {user_id}: {e}")
-            return []
+        # Search in ChromaDB with user filter, all queries in one call
+        search_results = self.collection.query(
+            query_embeddings=query_embeddings.tolist(),
+            n_results=k,
+            where=self._get_user_metadata_filter(user_id),
+        )
+
+        empty = [[]] * len(query_embeddings)
+        return [
+            [
+                {
+                    "content": doc,
+                    # Convert distance to similarity score (higher = more similar)
+                    "score": 1.0 - distance,
+                    "metadata": metadata,
+                    "memory_id": metadata.get("memory_id"),
+                }
+                for doc, metadata, distance in zip(documents, metadatas, distances)
+            ]
+            for documents, metadatas, distances in zip(
+                search_results["documents"] or empty,
+                search_results["metadatas"] or empty,
+                search_results["distances"] or empty,
+            )
+        ]
 
     async def get_user_memories(
         self, user_id: str, limit: int = 50
@@ -318,87 +764,234 @@ class VectorStore:
         Returns:
             List of memory dictionaries
         """
-        try:
-            if not self.client and not self.pinecone_index:
-                await self.initialize()
+        memories = []
 
-            if self.use_pinecone:
-                return await self._get_pinecone_memories(user_id, limit)
-            else:
-                return await self._get_chroma_memories(user_id, limit)
+        try:
+            async for memory in self.iter_user_memories(
+                user_id, page_size=min(limit, self.DEFAULT_PAGE_SIZE)
+            ):
+                memories.append(memory)
+                if len(memories) >= limit:
+                    break
 
         except Exception as e:
             logger.error(f"Failed to get memories for user {user_id}: {e}")
-            return []
 
-    async def _get_pinecone_memories(
-        self, user_id: str, limit: int
-    ) -> List[Dict[str, Any]]:
-        """Get memories from Pinecone for a specific user."""
-        memories = []
+        return memories
+
+    async def iter_user_memories(
+        self,
+        user_id: str,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every memory for a user, one page at a time.
+
+        Args:
+            user_id: Validated user ID from JWT
+            page_size: Memories fetched per backend call
+            cursor: Cursor returned by list_user_memories_page to resume from
+
+        Yields:
+            Memory dictionaries
+        """
+        while True:
+            memories, cursor = await self.list_user_memories_page(
+                user_id, page_size=page_size, cursor=cursor
+            )
+            for memory in memories:
+                yield memory
+            if not cursor:
+                return
+
+    async def list_user_memories_page(
+        self,
+        user_id: str,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of a user's memories using the backend's native listing.
+
+        Args:
+            user_id: Validated user ID from JWT
+            page_size: Maximum number of memories in the page
+            cursor: Opaque cursor from the previous page (None for the first)
+
+        Returns:
+            Tuple of (memory dictionaries, cursor for the next page or None)
+        """
+        await self._ensure_initialized()
+        page_size = max(1, page_size or self.DEFAULT_PAGE_SIZE)
+
+        if self.use_local:
+            return await self._list_local_page(user_id, page_size, cursor)
+        elif self.use_pinecone:
+            return await self._list_pinecone_page(user_id, page_size, cursor)
+        else:
+            return await self._list_chroma_page(user_id, page_size, cursor)
+
+    def _memory_dict(self, content: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the memory dictionary returned by listing methods."""
+        return {
+            "memory_id": metadata.get("memory_id"),
+            "content": content,
+            "metadata": metadata,
+            "timestamp": metadata.get("timestamp"),
+        }
+
+    async def _list_pinecone_page(
+        self, user_id: str, page_size: int, cursor: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List a page of a user's Pinecone namespace, then fetch its metadata."""
         namespace = self._get_user_namespace(user_id)
 
-        try:
-            # Get stats first to see if namespace exists
-            stats = self.pinecone_index.describe_index_stats()
+        listing = self.pinecone_index.list_paginated(
+            namespace=namespace,
+            limit=min(page_size, self.PINECONE_LIST_PAGE_SIZE),
+            pagination_token=cursor,
+        )
+        ids = [vector.id for vector in listing.vectors]
+
+        memories = []
+        if ids:
+            fetched = self.pinecone_index.fetch(ids=ids, namespace=namespace)
+            for vector_id in ids:
+                vector = fetched.vectors.get(vector_id)
+                if vector is None:
+                    continue  # Deleted between list and fetch
+                metadata = dict(vector.metadata or {})
+                memories.append(
+                    self._memory_dict(metadata.get("content_preview", ""), metadata)
+                )
+
+        next_cursor = listing.pagination.next if listing.pagination else None
+        return memories, next_cursor
+
+    async def _list_local_page(
+        self, user_id: str, page_size: int, cursor: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List a page of a user's local index (cursor is a record offset)."""
+        offset = int(cursor) if cursor else 0
+        records = await asyncio.to_thread(
+            self.local_index.list, user_id, offset, page_size
+        )
+
+        memories = [
+            self._memory_dict(record["document"], record["metadata"])
+            for record in records
+        ]
+        next_cursor = str(offset + len(records)) if len(records) == page_size else None
+        return memories, next_cursor
+
+    async def _list_chroma_page(
+        self, user_id: str, page_size: int, cursor: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List a page of a user's ChromaDB memories (cursor is a row offset)."""
+        offset = int(cursor) if cursor else 0
+        results = self.collection.get(
+            where=self._get_user_metadata_filter(user_id),
+            limit=page_size,
+            offset=offset,
+            include=["documents", "metadatas"],
+        )
+
+        documents = results["documents"] or []
+        memories = [
+            self._memory_dict(doc, results["metadatas"][i])
+            for i, doc in enumerate(documents)
+        ]
+        next_cursor = (
+            str(offset + len(documents)) if len(documents) == page_size else None
+        )
+        return memories, next_cursor
+
+    async def get_memories(
+        self, user_id: str, memory_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch specific memories by ID.
 
-            if namespace in stats.namespaces:
-                # Use a broad query to get user's memories
-                # This is not ideal but Pinecone doesn't have direct "list all" functionality
-                dummy_embedding = [0.1] * 768  # Small non-zero values
+        Args:
+            user_id: Validated user ID from JWT
+            memory_ids: Memory IDs to fetch
 
-                results = self.pinecone_index.query(
-                    vector=dummy_embedding,
-                    top_k=min(limit, 1000),  # Cap at reasonable limit
+        Returns:
+            Mapping of memory ID to memory dictionary, for memories that exist
+        """
+        memories: Dict[str, Dict[str, Any]] = {}
+        if not memory_ids:
+            return memories
+
+        await self._ensure_initialized()
+        vector_ids = [self._vector_id(user_id, memory_id) for memory_id in memory_ids]
+
+        if self.use_local:
+            records = await asyncio.to_thread(self.local_index.get, user_id, vector_ids)
+            found = [(record["document"], record["metadata"]) for record in records]
+
+        elif self.use_pinecone and self.pinecone_index:
+            namespace = self._get_user_namespace(user_id)
+            found = []
+            for start in range(0, len(vector_ids), self.PINECONE_DELETE_BATCH_SIZE):
+                fetched = self.pinecone_index.fetch(
+                    ids=vector_ids[start : start + self.PINECONE_DELETE_BATCH_SIZE],
                     namespace=namespace,
-                    include_metadata=True,
-                    include_values=False,
                 )
+                for vector in fetched.vectors.values():
+                    metadata = dict(vector.metadata or {})
+                    found.append((metadata.get("content_preview", ""), metadata))
 
-                for match in results.matches:
-                    memories.append(
-                        {
-                            "memory_id": match.metadata.get("memory_id"),
-                            "content": match.metadata.get("content_preview", ""),
-                            "metadata": match.metadata,
-                            "timestamp": match.metadata.get("timestamp"),
-                        }
-                    )
-        except Exception as e:
-            logger.warning(
-                f"Could not retrieve memories from Pinecone namespace {namespace}: {e}"
+        else:
+            results = self.collection.get(
+                ids=vector_ids, include=["documents", "metadatas"]
             )
+            found = list(zip(results["documents"] or [], results["metadatas"] or []))
+
+        for content, metadata in found:
+            # Vector IDs are user-prefixed, but verify ownership anyway
+            if metadata.get("user_id") == user_id:
+                memory = self._memory_dict(content, metadata)
+                memories[memory["memory_id"]] = memory
 
         return memories
 
-    async def _get_chroma_memories(
-        self, user_id: str, limit: int
-    ) -> List[Dict[str, Any]]:
-        """Get memories from ChromaDB for a specific user."""
-        memories = []
+    async def count_user_memories(self, user_id: str) -> int:
+        """
+        Count a user's long-term memories without loading them.
 
-        try:
-            results = self.collection.get(
-                where=self._get_user_metadata_filter(user_id), limit=limit
-            )
+        Args:
+            user_id: Validated user ID from JWT
 
-            if results["documents"]:
-                for i, doc in enumerate(results["documents"]):
-                    metadata = results["metadatas"][i]
-                    memories.append(
-                        {
-                            "memory_id": metadata.get("memory_id"),
-                            "content": doc,
-                            "metadata": metadata,
-                            "timestamp": metadata.get("timestamp"),
-                        }
-                    )
-        except Exception as e:
-            logger.warning(
-                f"Could not retrieve memories from ChromaDB for user {user_id}: {e}"
-            )
+        Returns:
+            Number of stored memories
+        """
+        await self._ensure_initialized()
 
-        return memories
+        if self.use_local:
+            return await asyncio.to_thread(self.local_index.count, user_id)
+
+        if self.use_pinecone:
+            stats = self.pinecone_index.describe_index_stats()
+            namespace = stats.namespaces.get(self._get_user_namespace(user_id))
+            return namespace.vector_count if namespace else 0
+
+        # Chroma has no filtered count, so page through ids only
+        count = 0
+        offset = 0
+        page_size = self._chroma_batch_size()
+        while True:
+            results = self.collection.get(
+                where=self._get_user_metadata_filter(user_id),
+                limit=page_size,
+                offset=offset,
+                include=[],
+            )
+            count += len(results["ids"])
+            if len(results["ids"]) < page_size:
+                return count
+            offset += page_size
 
     async def delete_memory(self, user_id: str, memory_id: str) -> bool:
         """
@@ -409,29 +1002,136 @@ class VectorStore:
             memory_id: Memory ID to delete
 
         Returns:
-            Success status
+            True if the memory existed and was deleted
         """
-        try:
-            if not self.client and not self.pinecone_index:
-                await self.initialize()
+        results = await self.delete_memories(user_id, [memory_id])
+        return results.get(memory_id, False)
 
-            vector_id = f"{user_id}_{memory_id}"
+    async def delete_memories(
+        self, user_id: str, memory_ids: List[str]
+    ) -> Dict[str, bool]:
+        """
+        Delete many memories for a user.
 
-            if self.use_pinecone and self.pinecone_index:
-                # Delete from user's Pinecone namespace
-                namespace = self._get_user_namespace(user_id)
-                self.pinecone_index.delete(ids=[vector_id], namespace=namespace)
+        IDs are checked and deleted in chunks (PINECONE_DELETE_BATCH_SIZE ids
+        per Pinecone call, max_batch_size per Chroma call) instead of one
+        request per memory.
 
-            else:
-                # Delete from ChromaDB
-                self.collection.delete(ids=[vector_id])
+        Args:
+            user_id: Validated user ID from JWT
+            memory_ids: Memory IDs to delete
 
-            logger.debug(f"Deleted memory {memory_id} for user {user_id}")
-            return True
+        Returns:
+            Mapping of memory ID to whether it existed and was deleted
+        """
+        results = {memory_id: False for memory_id in memory_ids}
+        if not memory_ids:
+            return results
 
+        try:
+            await self._ensure_initialized()
         except Exception as e:
-            logger.error(f"Failed to delete memory {memory_id} for user {user_id}: {e}")
-            return False
+            logger.error(f"Failed to delete memories for user {user_id}: {e}")
+            return results
+
+        memory_ids = list(results)
+        id_map = {
+            self._vector_id(user_id, memory_id): memory_id for memory_id in memory_ids
+        }
+        vector_ids = list(id_map)
+
+        if self.use_local:
+            batch_size = len(vector_ids)
+        elif self.use_pinecone and self.pinecone_index:
+            batch_size = self.PINECONE_DELETE_BATCH_SIZE
+        else:
+            batch_size = self._chroma_batch_size()
+
+        namespace = self._get_user_namespace(user_id)
+
+        for start in range(0, len(vector_ids), batch_size):
+            chunk = vector_ids[start : start + batch_size]
+
+            try:
+                if self.use_local:
+                    deleted = await asyncio.to_thread(
+                        self.local_index.delete, user_id, chunk
+                    )
+
+                elif self.use_pinecone and self.pinecone_index:
+                    # Delete from user's Pinecone namespace
+                    existing = self.pinecone_index.fetch(ids=chunk, namespace=namespace)
+                    deleted = list(existing.vectors.keys())
+                    if deleted:
+                        self.pinecone_index.delete(ids=deleted, namespace=namespace)
+
+                else:
+                    # Delete from ChromaDB
+                    existing = self.collection.get(ids=chunk, include=[])
+                    deleted = existing["ids"]
+                    if deleted:
+                        self.collection.delete(ids=deleted)
+
+                for vector_id in deleted:
+                    results[id_map[vector_id]] = True
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to delete {len(chunk)} memories for user {user_id}: {e}"
+                )
+
+        # Memories whose delete failed are still stored, so keep them indexed
+        deleted_ids = [memory_id for memory_id, ok in results.items() if ok]
+
+        await self.stats_index.remove_memories(user_id, LONG_TERM, deleted_ids)
+        await self.memory_index.remove_memories(user_id, LONG_TERM, deleted_ids)
+        await self.context_cache.invalidate_user(user_id)
+
+        if Config.HYBRID_SEARCH_ENABLED:
+            await self.lexical_index.remove_documents(user_id, deleted_ids)
+
+        if Config.MEMORY_DEDUP_ENABLED:
+            await self.dedup_index.remove_memories(user_id, deleted_ids)
+
+        logger.debug(
+            f"Deleted {sum(results.values())}/{len(memory_ids)} memories for user {user_id}"
+        )
+        return results
+
+    async def rebuild_lexical_index(self, user_id: str) -> int:
+        """
+        Re-index every stored memory for a user in the lexical index.
+
+        Used to backfill memories stored before lexical indexing existed.
+
+        Args:
+            user_id: Validated user ID from JWT
+
+        Returns:
+            Number of memories indexed
+        """
+        indexed = 0
+        cursor = None
+
+        await self.lexical_index.clear_user(user_id)
+        while True:
+            memories, cursor = await self.list_user_memories_page(
+                user_id, cursor=cursor
+            )
+            documents = [
+                (memory["memory_id"], memory["content"], memory["metadata"])
+                for memory in memories
+                if memory.get("memory_id")
+            ]
+            if documents:
+                await self.lexical_index.add_documents(user_id, documents)
+                indexed += len(documents)
+            if not cursor:
+                break
+
+        await self.lexical_index.mark_built(user_id)
+        logger.info(f"Rebuilt lexical index for user {user_id} ({indexed} memories)")
+        return indexed
 
     async def clear_user_memories(self, user_id: str) -> bool:
         """
@@ -444,10 +1144,13 @@ class VectorStore:
             Success status
         """
         try:
-            if not self.client and not self.pinecone_index:
-                await self.initialize()
+            await self._ensure_initialized()
 
-            if self.use_pinecone and self.pinecone_index:
+            if self.use_local:
+                # Drop the user's index files
+                await asyncio.to_thread(self.local_index.clear_user, user_id)
+
+            elif self.use_pinecone and self.pinecone_index:
                 # Delete entire user namespace
                 namespace = self._get_user_namespace(user_id)
                 self.pinecone_index.delete(delete_all=True, namespace=namespace)
@@ -456,6 +1159,17 @@ class VectorStore:
                 # Delete all user memories from ChromaDB
                 self.collection.delete(where=self._get_user_metadata_filter(user_id))
 
+            # Drop cached embeddings, scores and contexts, lexical postings,
+            # counters and index entries
+            await self.embedding_cache.clear_user(user_id)
+            await scoring_cache.clear_user(user_id)
+            await self.lexical_index.clear_user(user_id)
+            await self.dedup_index.clear_user(user_id)
+            await self.query_cache.clear_user(user_id)
+            await self.stats_index.clear_tier(user_id, LONG_TERM)
+            await self.memory_index.clear_tier(user_id, LONG_TERM)
+            await self.context_cache.clear_user(user_id)
+
             logger.info(f"Cleared all memories for user {user_id}")
             return True
 
@@ -474,15 +1188,13 @@ class VectorStore:
             User's vector storage statistics
         """
         try:
-            memories = await self.get_user_memories(user_id)
-
             return {
-                "vector_count": len(memories),
+                "vector_count": await self.count_user_memories(user_id),
                 "storage_type": self.vector_db_type,
                 "index_name": (
                     Config.PINECONE_INDEX_NAME
                     if self.use_pinecone
-                    else "chroma_collection"
+                    else "local_index" if self.use_local else "chroma_collection"
                 ),
                 "user_namespace": self._get_user_namespace(user_id),
                 "embedding_model": "google-embedding-001",
@@ -500,11 +1212,22 @@ class VectorStore:
             Health status information
         """
         try:
-            if not self.client and not self.pinecone_index:
+            if not self.is_initialized:
                 return {"status": "not_initialized", "available": False}
 
             # Test basic operations
-            if self.use_pinecone and self.pinecone_index:
+            if self.use_local:
+                return {
+                    "status": "healthy",
+                    "available": True,
+                    "backend": "local",
+                    **self.local_index.stats(),
+                    "embedding_cache": self.embedding_cache.get_stats(),
+                    "dedup": self.dedup_index.get_stats(),
+                    "query_cache": self.query_cache.get_stats(),
+                }
+
+            elif self.use_pinecone and self.pinecone_index:
                 # Test Pinecone connection
                 stats = self.pinecone_index.describe_index_stats()
                 return {
@@ -513,6 +1236,9 @@ class VectorStore:
                     "backend": "pinecone",
                     "total_vectors": stats.total_vector_count,
                     "namespaces": len(stats.namespaces),
+                    "embedding_cache": self.embedding_cache.get_stats(),
+                    "dedup": self.dedup_index.get_stats(),
+                    "query_cache": self.query_cache.get_stats(),
                 }
 
             else:
@@ -523,6 +1249,9 @@ class VectorStore:
                     "available": True,
                     "backend": "chroma",
                     "collections": collection_count,
+                    "embedding_cache": self.embedding_cache.get_stats(),
+                    "dedup": self.dedup_index.get_stats(),
+                    "query_cache": self.query_cache.get_stats(),
                 }
 
         except Exception as e:
@@ -537,6 +1266,6 @@ vector_store = VectorStore()
 # Convenience functions
 async def get_vector_store() -> VectorStore:
     """Get initialized vector store instance."""
-    if not vector_store.client and not vector_store.pinecone_index:
+    if not vector_store.is_initialized:
         await vector_store.initialize()
     return vector_store
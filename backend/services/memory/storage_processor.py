@@ -11,6 +11,7 @@ import uuid
 from .types import MemoryItem, MemoryScore
 from .storage.redis_store import RedisStore
 from .storage.vector_store import VectorStore
+from .storage.quantization import normalize_rows
 from ..privacy.security.pii_detector import PIIDetector
 from services.audit.audit_logger import AuditLogger
 from .config import Config
@@ -323,6 +324,15 @@ class StorageProcessor:
             timestamp=base_memory.timestamp,
         )
 
+        # Fold repeats of something already treasured into the existing memory
+        if Config.MEMORY_DEDUP_ENABLED:
+            duplicate = await self._find_long_term_duplicate(user_id, long_term_memory)
+            if duplicate:
+                stored_memories["long_term"] = await self._resolve_duplicate(
+                    user_id, long_term_memory, duplicate
+                )
+                return
+
         await self.vector_store.store_memory(user_id, long_term_memory)
         stored_memories["long_term"] = long_term_memory
 
@@ -330,6 +340,154 @@ class StorageProcessor:
             f"Stored long-term memory for user {user_id}: {long_term_memory.metadata['memory_category']}"
         )
 
+    async def _find_long_term_duplicate(
+        self, user_id: str, memory: MemoryItem
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find an existing long-term memory that the new memory repeats.
+
+        Candidates come from the SimHash signature index. When the cosine
+        check is enabled, a candidate only counts if its embedding is also
+        within MEMORY_DEDUP_COSINE_THRESHOLD of the new memory's.
+
+        Args:
+            user_id: Validated user ID from JWT
+            memory: Long-term memory about to be stored
+
+        Returns:
+            The duplicated memory dictionary, or None
+        """
+        dedup_index = self.vector_store.dedup_index
+        try:
+            candidates = await dedup_index.find_candidates(user_id, memory.content)
+            existing = await self.vector_store.get_memories(
+                user_id, [memory_id for memory_id, _ in candidates]
+            )
+            matches = [
+                existing[memory_id]
+                for memory_id, _ in candidates
+                if memory_id in existing and memory_id != memory.id
+            ]
+
+            if matches and Config.MEMORY_DEDUP_COSINE_CHECK:
+                embeddings = normalize_rows(
+                    await self.vector_store.embed_texts(
+                        [memory.content] + [match["content"] for match in matches],
+                        user_id=user_id,
+                    )
+                )
+                similarities = embeddings[1:] @ embeddings[0]
+                best = int(similarities.argmax())
+                if similarities[best] < Config.MEMORY_DEDUP_COSINE_THRESHOLD:
+                    await dedup_index.record_outcomes(
+                        user_id, "checked", "cosine_rejected"
+                    )
+                    return None
+                matches = [matches[best]]
+
+            if not matches:
+                await dedup_index.record_outcomes(user_id, "checked")
+                return None
+
+            await dedup_index.record_outcomes(user_id, "checked", "duplicates")
+            return matches[0]
+
+        except Exception as e:
+            logging.getLogger(__name__).warning(
+                f"Duplicate check failed for user {user_id}, storing as new: {e}"
+            )
+            return None
+
+    async def _resolve_duplicate(
+        self, user_id: str, memory: MemoryItem, duplicate: Dict[str, Any]
+    ) -> MemoryItem:
+        """
+        Apply MEMORY_DEDUP_ACTION to a memory that repeats an existing one.
+
+        - skip: keep the existing memory untouched
+        - refresh: re-store the existing memory with the new wording and time
+        - merge: keep the fuller wording and the stronger classification and
+          scores of the two
+
+        Args:
+            user_id: Validated user ID from JWT
+            memory: Long-term memory that was about to be stored
+            duplicate: Existing memory dictionary it repeats
+
+        Returns:
+            The long-term memory that now represents both
+        """
+        action = Config.MEMORY_DEDUP_ACTION
+        existing_metadata = dict(duplicate["metadata"])
+        occurrences = int(existing_metadata.get("occurrence_count", 1)) + 1
+
+        if action == "skip":
+            await self.vector_store.dedup_index.record_outcomes(user_id, "skipped")
+            logging.getLogger(__name__).info(
+                f"Skipped duplicate long-term memory for user {user_id} "
+                f"(repeats {duplicate['memory_id']})"
+            )
+            return MemoryItem(
+                id=duplicate["memory_id"],
+                content=duplicate["content"],
+                type=existing_metadata.get("type", memory.type),
+                metadata=existing_metadata,
+                timestamp=self._parse_timestamp(duplicate.get("timestamp")),
+            )
+
+        if action == "refresh":
+            content = memory.content
+            metadata = {**existing_metadata, "last_seen": memory.timestamp.isoformat()}
+            outcome = "refreshed"
+        else:
+            content = max(duplicate["content"], memory.content, key=len)
+            metadata = {**existing_metadata, **memory.metadata}
+            if content != memory.content:
+                # PII handling describes the wording that was kept
+                metadata["pii_handling"] = existing_metadata.get("pii_handling")
+            for score in ("relevance_score", "stability_score", "explicitness_score"):
+                metadata[score] = max(
+                    float(existing_metadata.get(score, 0.0)),
+                    float(memory.metadata.get(score, 0.0)),
+                )
+            for flag in ("is_meaningful", "is_lasting", "is_symbolic"):
+                metadata[flag] = bool(
+                    existing_metadata.get(flag) or memory.metadata.get(flag)
+                )
+            if "emotional_anchor" in (
+                existing_metadata.get("memory_category"),
+                memory.metadata.get("memory_category"),
+            ):
+                metadata["memory_category"] = "emotional_anchor"
+            metadata["created_at"] = existing_metadata.get(
+                "created_at", memory.metadata.get("created_at")
+            )
+            outcome = "merged"
+
+        metadata["occurrence_count"] = occurrences
+        refreshed_memory = MemoryItem(
+            id=duplicate["memory_id"],
+            content=content,
+            type=memory.type,
+            metadata=metadata,
+            timestamp=memory.timestamp,
+        )
+
+        await self.vector_store.store_memory(user_id, refreshed_memory)
+        await self.vector_store.dedup_index.record_outcomes(user_id, outcome)
+        logging.getLogger(__name__).info(
+            f"{outcome.capitalize()} duplicate long-term memory for user {user_id} "
+            f"into {duplicate['memory_id']} (seen {occurrences} times)"
+        )
+        return refreshed_memory
+
+    def _parse_timestamp(self, timestamp: Optional[str]) -> datetime:
+        """Parse a stored ISO timestamp, defaulting to now."""
+        try:
+            return datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            return datetime.utcnow()
+
     async def _anonymize_while_preserving_meaning(
         self, content: str, pii_results: Dict[str, Any], memory_category: str
     ) -> str:
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -31,6 +31,8 @@ class MemoryContext:
     short_term: List[MemoryItem]
     long_term: List[MemoryItem]
     digest: str
+    # Milliseconds spent in each retrieval stage
+    timings: Dict[str, float] = field(default_factory=dict)
 
     # Backward compatibility properties
     @property
@@ -63,8 +65,10 @@ class MemoryStats:
     long_term: int
     sensitive: int
     emotional_anchors: int = 0
+    pending_consent: int = 0
     categories: Optional[Dict[str, int]] = None
     recent_activity: Optional[Dict[str, Any]] = None
+    deduplication: Optional[Dict[str, int]] = None
 
     def __post_init__(self):
         """Initialize default values for optional fields."""
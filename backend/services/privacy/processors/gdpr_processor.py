@@ -2,8 +2,10 @@
 GDPR Processor for handling data protection and user rights.
 """
 
+import json
+import zlib
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
 from services.memory.types import MemoryItem
 from services.memory.storage.redis_store import RedisStore
@@ -15,6 +17,11 @@ from ..security.pii_detector import PIIDetector
 class GDPRProcessor:
     """Handles GDPR compliance operations."""
 
+    # Streamed exports are flushed in chunks of roughly this many bytes
+    EXPORT_CHUNK_SIZE = 64 * 1024
+    # Memory IDs looked up per store round trip in selective exports
+    EXPORT_LOOKUP_BATCH_SIZE = 100
+
     def __init__(
         self,
         redis_store: RedisStore,
@@ -32,34 +39,25 @@ class GDPRProcessor:
     ) -> Dict[str, Any]:
         """Delete specific memories."""
         try:
-            processed = 0
+            # Delete from both stores in bulk
+            short_term_deleted = await self.redis_store.delete_memories(
+                user_id, memory_ids
+            )
+            long_term_deleted = await self.vector_store.delete_memories(
+                user_id, memory_ids
+            )
+
             deleted = 0
-            failed = 0
             results = []
 
             for memory_id in memory_ids:
-                try:
-                    # Try to delete from both stores
-                    short_term_deleted = await self.redis_store.delete_memory(
-                        user_id, memory_id
-                    )
-                    long_term_deleted = await self.vector_store.delete_memory(
-                        user_id, memory_id
-                    )
-
-                    if short_term_deleted or long_term_deleted:
-                        deleted += 1
-                        results.append({"memory_id": memory_id, "status": "deleted"})
-                    else:
-                        results.append({"memory_id": memory_id, "status": "not_found"})
-
-                    processed += 1
-
-                except Exception as e:
-                    failed += 1
-                    results.append(
-                        {"memory_id": memory_id, "status": "error", "error": str(e)}
-                    )
+                if short_term_deleted.get(memory_id) or long_term_deleted.get(
+                    memory_id
+                ):
+                    deleted += 1
+                    results.append({"memory_id": memory_id, "status": "deleted"})
+                else:
+                    results.append({"memory_id": memory_id, "status": "not_found"})
 
             await self.audit_logger.log_event(
                 event_type="delete_memories",
@@ -68,9 +66,9 @@ class GDPRProcessor:
             )
 
             return {
-                "processed": processed,
+                "processed": len(memory_ids),
                 "deleted": deleted,
-                "failed": failed,
+                "failed": 0,
                 "results": results,
             }
 
@@ -127,17 +125,9 @@ class GDPRProcessor:
                         m for m in all_memories if m.get("storage_type") == "long_term"
                     ],
                 },
-                "metadata": {
-                    "export_purpose": export_purpose,
-                    "data_categories": [
-                        "memories",
-                        "conversations",
-                        "therapeutic_context",
-                    ],
-                    "retention_info": "Data exported as of export timestamp",
-                    "format_specification": "JSON with ISO timestamps",
-                    "gdpr_compliance": "Articles 15 (Access) & 20 (Portability)",
-                },
+                "metadata": self._export_metadata(
+                    export_purpose, "JSON with ISO timestamps"
+                ),
             }
 
             # Log the action
@@ -162,12 +152,148 @@ class GDPRProcessor:
             )
             raise e
 
+    async def stream_user_data(
+        self,
+        user_id: str,
+        memory_ids: Optional[List[str]] = None,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a user data export as NDJSON (GDPR Articles 15 & 20).
+
+        Memories are read page by page from the stores and written out as
+        they arrive, so memory use does not grow with the size of the export.
+        The first line is an "export" header record, followed by one "memory"
+        record per memory and a closing "summary" record with the counts.
+
+        Errors raised before the first chunk is yielded propagate, so callers
+        can read the first chunk to check the stores before responding. A
+        later error ends the export with an "error" record instead of the
+        summary, so a truncated export is never mistaken for a complete one.
+
+        Args:
+            user_id: User identifier
+            memory_ids: Optional list of specific memory IDs to export (None = all)
+            compress: Gzip the stream
+
+        Yields:
+            Chunks of NDJSON (gzip-compressed if requested)
+        """
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        buffer: List[str] = []
+        buffered = 0
+        counts = {"short_term": 0, "long_term": 0}
+        started = False
+
+        def encode(lines: List[str]) -> bytes:
+            data = "".join(lines).encode("utf-8")
+            return compressor.compress(data) if compressor else data
+
+        try:
+            if memory_ids is None:
+                memories = self._iter_all_user_memories(user_id)
+                export_purpose = "Complete data export"
+            else:
+                memories = self._iter_specific_memories(user_id, memory_ids)
+                export_purpose = f"Selective data export ({len(memory_ids)} requested)"
+
+            header = {
+                "record_type": "export",
+                "user_id": user_id,
+                "export_format": "ndjson",
+                "export_timestamp": datetime.utcnow().isoformat(),
+                "data_structure_version": "1.0",
+                "export_scope": {
+                    "requested_memory_ids": memory_ids,
+                    "export_type": "all_data" if memory_ids is None else "selective",
+                },
+                "metadata": self._export_metadata(
+                    export_purpose, "Newline-delimited JSON with ISO timestamps"
+                ),
+            }
+            buffer.append(json.dumps(header, default=str) + "\n")
+
+            async for memory in memories:
+                line = json.dumps({"record_type": "memory", **memory}, default=str)
+                buffer.append(line + "\n")
+                buffered += len(line) + 1
+                counts[memory["storage_type"]] += 1
+
+                if buffered >= self.EXPORT_CHUNK_SIZE:
+                    chunk = encode(buffer)
+                    buffer, buffered = [], 0
+                    if chunk:
+                        started = True
+                        yield chunk
+
+            summary = {
+                "record_type": "summary",
+                "total_count": counts["short_term"] + counts["long_term"],
+                "short_term_count": counts["short_term"],
+                "long_term_count": counts["long_term"],
+            }
+            buffer.append(json.dumps(summary) + "\n")
+            chunk = encode(buffer)
+            if compressor:
+                chunk += compressor.flush()
+            yield chunk
+
+            # Log the action
+            await self.audit_logger.log_event(
+                event_type="export_user_data",
+                user_id=user_id,
+                details={
+                    "format": "ndjson",
+                    "compressed": compress,
+                    "memory_ids": memory_ids,
+                    "record_count": summary["total_count"],
+                },
+            )
+
+        except Exception as e:
+            await self.audit_logger.log_event(
+                event_type="export_user_data_error",
+                user_id=user_id,
+                level="ERROR",
+                details={"error": str(e)},
+            )
+            if not started:
+                raise e
+
+            # The response has started: close the export with an error record
+            error = {
+                "record_type": "error",
+                "error": str(e),
+                "exported_count": counts["short_term"] + counts["long_term"],
+            }
+            buffer.append(json.dumps(error) + "\n")
+            chunk = encode(buffer)
+            if compressor:
+                chunk += compressor.flush()
+            yield chunk
+
+    def _export_metadata(
+        self, export_purpose: str, format_specification: str
+    ) -> Dict[str, Any]:
+        """Describe an export for the data subject."""
+        return {
+            "export_purpose": export_purpose,
+            "data_categories": [
+                "memories",
+                "conversations",
+                "therapeutic_context",
+            ],
+            "retention_info": "Data exported as of export timestamp",
+            "format_specification": format_specification,
+            "gdpr_compliance": "Articles 15 (Access) & 20 (Portability)",
+        }
+
     async def delete_all_user_data(self, user_id: str) -> Dict[str, Any]:
         """Delete all user data for GDPR compliance (right to be forgotten)."""
         try:
-            # Clear all memories from both stores
-            await self.redis_store.clear_memories(user_id)
-            await self.vector_store.clear_memories(user_id)
+            # Clear all memories from both stores (also purges cached embeddings)
+            await self.redis_store.clear_user_memories(user_id)
+            await self.vector_store.clear_user_memories(user_id)
 
             # Log the deletion
             await self.audit_logger.log_event(
@@ -245,49 +371,64 @@ class GDPRProcessor:
 
     async def _get_all_user_memories(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all memories for a user in dict format."""
-        # Get memories from both stores
-        short_term_memories = await self.redis_store.get_memories(user_id)
-        long_term_memories = await self.vector_store.get_memories(user_id)
-
-        all_memories = []
-
-        # Convert short-term memories to dict format
-        for memory in short_term_memories:
-            memory_dict = self._memory_to_dict(memory, "short_term")
-            all_memories.append(memory_dict)
-
-        # Convert long-term memories to dict format
-        for memory in long_term_memories:
-            memory_dict = self._memory_to_dict(memory, "long_term")
-            all_memories.append(memory_dict)
-
-        return all_memories
+        return [memory async for memory in self._iter_all_user_memories(user_id)]
 
     async def _get_specific_memories(
         self, user_id: str, memory_ids: List[str]
     ) -> List[Dict[str, Any]]:
         """Get specific memories by IDs."""
-        memories = []
-
-        # Get all memories
-        short_term_memories = await self.redis_store.get_memories(user_id)
-        long_term_memories = await self.vector_store.get_memories(user_id)
-
-        # Find requested memories
-        for memory_id in memory_ids:
-            # Check short-term memories
-            for memory in short_term_memories:
-                if memory.id == memory_id:
-                    memories.append(self._memory_to_dict(memory, "short_term"))
-                    break
-            else:
-                # Check long-term memories if not found in short-term
-                for memory in long_term_memories:
-                    if memory.id == memory_id:
-                        memories.append(self._memory_to_dict(memory, "long_term"))
-                        break
+        return [
+            memory async for memory in self._iter_specific_memories(user_id, memory_ids)
+        ]
 
-        return memories
+    async def _iter_all_user_memories(
+        self, user_id: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all memories for a user in dict format, page by page."""
+        async for memory in self.redis_store.iter_user_memories(user_id):
+            yield self._memory_to_dict(memory, "short_term")
+
+        async for memory_dict in self.vector_store.iter_user_memories(user_id):
+            yield self._vector_memory_to_dict(memory_dict)
+
+    async def _iter_specific_memories(
+        self, user_id: str, memory_ids: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream specific memories by ID, in the requested order."""
+        # Drop duplicates, keeping the first occurrence
+        memory_ids = list(dict.fromkeys(memory_ids))
+
+        for start in range(0, len(memory_ids), self.EXPORT_LOOKUP_BATCH_SIZE):
+            batch = memory_ids[start : start + self.EXPORT_LOOKUP_BATCH_SIZE]
+
+            # Short-term memories take precedence over long-term ones
+            short_term = await self.redis_store.get_memories(user_id, batch)
+            remaining = [
+                memory_id for memory_id in batch if memory_id not in short_term
+            ]
+            long_term = (
+                await self.vector_store.get_memories(user_id, remaining)
+                if remaining
+                else {}
+            )
+
+            for memory_id in batch:
+                if memory_id in short_term:
+                    yield self._memory_to_dict(short_term[memory_id], "short_term")
+                elif memory_id in long_term:
+                    yield self._vector_memory_to_dict(long_term[memory_id])
+
+    def _vector_memory_to_dict(self, memory_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a vector store memory dictionary to export format."""
+        metadata = memory_dict.get("metadata", {})
+        return {
+            "id": memory_dict.get("memory_id"),
+            "content": memory_dict.get("content", ""),
+            "type": metadata.get("type"),
+            "timestamp": memory_dict.get("timestamp"),
+            "metadata": metadata,
+            "storage_type": "long_term",
+        }
 
     def _memory_to_dict(self, memory: MemoryItem, storage_type: str) -> Dict[str, Any]:
         """Convert a memory item to dictionary format."""
@@ -165,6 +165,23 @@ class PrivacyProcessor:
             if memory.metadata.get("pending_long_term_consent", False)
         }
 
+        # Score approved memories in batches up front
+        approved = [
+            pending_memories[memory_id]
+            for memory_id, choice in memory_choices.items()
+            if memory_id in pending_memories
+            and choice.get("action", "deny") == "approve"
+        ]
+        approved_scores = {}
+        if approved:
+            from utils.scoring.gemini_scorer import GeminiScorer
+
+            scores = await GeminiScorer().score_memories_cached(approved)
+            approved_scores = {
+                memory.id: memory_scores
+                for memory, memory_scores in zip(approved, scores)
+            }
+
         for memory_id, choice in memory_choices.items():
             if memory_id not in pending_memories:
                 results["errors"].append(
@@ -183,7 +200,11 @@ class PrivacyProcessor:
                 if action == "approve":
                     # Process the memory with consent for long-term storage
                     await self._process_approved_memory(
-                        user_id, memory, user_consent, results
+                        user_id,
+                        memory,
+                        user_consent,
+                        results,
+                        memory_scores=approved_scores.get(memory_id),
                     )
                 elif action == "anonymize":
                     # Process the memory with anonymization
@@ -231,13 +252,14 @@ class PrivacyProcessor:
         memory: MemoryItem,
         user_consent: Dict[str, Any],
         results: Dict[str, Any],
+        memory_scores: Optional[List[MemoryScore]] = None,
     ):
         """Process an approved memory for long-term storage."""
-        from ....utils.scoring.gemini_scorer import GeminiScorer
+        # Re-run the component extraction (unless already scored) and storage
+        if memory_scores is None:
+            from utils.scoring.gemini_scorer import GeminiScorer
 
-        # Re-run the component extraction and storage
-        scorer = GeminiScorer()
-        memory_scores = scorer.score_memory(memory)
+            memory_scores = await GeminiScorer().score_memory_cached(memory)
 
         for score in memory_scores:
             score_metadata = score.metadata or {}
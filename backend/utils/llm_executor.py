@@ -0,0 +1,300 @@
+"""
+LLM Executor
+Runs blocking Gemini generate_content calls off the event loop.
+
+The google-generativeai client is synchronous, so calling it inside an async
+request handler freezes every other request in the worker until Gemini
+answers. The executor runs calls on a dedicated, bounded thread pool (so LLM
+calls cannot starve the default pool used by other to_thread work), gives
+each call a deadline that is also passed to the HTTP request, and stops
+waiting for calls whose caller is cancelled. Streaming calls hand chunks
+back to the event loop as the SDK produces them.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, Optional
+
+from utils.single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+# Identical prompts sent concurrently share one call
+llm_flight = single_flight("llm")
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when an LLM call does not finish within its timeout."""
+
+
+class LLMExecutor:
+    """Shared thread pool for blocking LLM calls, with per-call timeouts."""
+
+    def __init__(
+        self, max_workers: Optional[int] = None, timeout: Optional[float] = None
+    ):
+        self.max_workers = max_workers or int(os.getenv("LLM_EXECUTOR_WORKERS", "16"))
+        self.timeout = (
+            timeout
+            if timeout is not None
+            else float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+        )
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._stats = {
+            "calls": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "streams": 0,
+            "total_ms": 0.0,
+        }
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="llm"
+            )
+        return self._pool
+
+    async def generate_content(
+        self,
+        model,
+        prompt: Any,
+        generation_config: Any = None,
+        timeout: Optional[float] = None,
+        coalesce: bool = False,
+        **kwargs,
+    ):
+        """
+        Call model.generate_content without blocking the event loop.
+
+        Args:
+            model: genai.GenerativeModel (or anything with generate_content)
+            prompt: Prompt contents
+            generation_config: Generation config for the call
+            timeout: Seconds before giving up (defaults to LLM_TIMEOUT_SECONDS;
+                0 disables the deadline)
+            coalesce: Share the call with concurrent callers sending the same
+                model, prompt and config. Only for deterministic uses (scoring,
+                extraction) whose callers just read the response.
+            **kwargs: Passed through to generate_content
+
+        Returns:
+            The generate_content response
+
+        Raises:
+            LLMTimeoutError: The call did not finish in time
+        """
+        if coalesce:
+            key = self._call_key(model, prompt, generation_config, kwargs)
+            return await llm_flight.do(
+                key,
+                lambda: self.generate_content(
+                    model, prompt, generation_config, timeout, **kwargs
+                ),
+            )
+
+        timeout = self.timeout if timeout is None else timeout
+        if timeout:
+            # Let the HTTP request give up too, so the worker thread is freed
+            kwargs.setdefault("request_options", {"timeout": timeout})
+
+        def call():
+            return model.generate_content(
+                prompt, generation_config=generation_config, **kwargs
+            )
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), call)
+
+        self._stats["calls"] += 1
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(future, timeout or None)
+            self._stats["completed"] += 1
+            return response
+
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            logger.warning(f"LLM call timed out after {timeout}s")
+            raise LLMTimeoutError(f"LLM call timed out after {timeout}s")
+
+        except asyncio.CancelledError:
+            # The thread finishes on its own; its result is discarded
+            self._stats["cancelled"] += 1
+            raise
+
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+
+        finally:
+            self._in_flight -= 1
+            self._stats["total_ms"] += (time.perf_counter() - started) * 1000
+
+    def _call_key(
+        self, model, prompt: Any, generation_config: Any, kwargs: Dict[str, Any]
+    ) -> str:
+        """Identity of a call for coalescing: model, prompt and config."""
+        payload = "\x1f".join(
+            [
+                str(getattr(model, "model_name", id(model))),
+                repr(prompt),
+                repr(generation_config),
+                repr(sorted(kwargs.items())),
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def stream_content(
+        self,
+        model,
+        prompt: Any,
+        generation_config: Any = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the text of a model.generate_content(stream=True) response.
+
+        The SDK's stream is a blocking iterator, so it is drained on the
+        executor's pool and chunks are handed to the event loop as they arrive.
+        The timeout bounds the whole stream. Closing the generator early stops
+        the worker after its current chunk.
+
+        Args:
+            model: genai.GenerativeModel (or anything with generate_content)
+            prompt: Prompt contents
+            generation_config: Generation config for the call
+            timeout: Seconds before giving up (defaults to LLM_TIMEOUT_SECONDS;
+                0 disables the deadline)
+            **kwargs: Passed through to generate_content
+
+        Yields:
+            Text of each response chunk
+
+        Raises:
+            LLMTimeoutError: The stream did not finish in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if timeout:
+            kwargs.setdefault("request_options", {"timeout": timeout})
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+
+        def put(kind: str, value: Any = None):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, (kind, value))
+            except RuntimeError:
+                # Event loop already closed; nobody is listening
+                stopped.set()
+
+        def produce():
+            try:
+                response = model.generate_content(
+                    prompt, generation_config=generation_config, stream=True, **kwargs
+                )
+                for chunk in response:
+                    if stopped.is_set():
+                        break
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # Chunk without text parts (e.g. safety metadata only)
+                        continue
+                    if text:
+                        put("chunk", text)
+            except Exception as e:
+                put("error", e)
+            finally:
+                put("done")
+
+        loop.run_in_executor(self._get_pool(), produce)
+
+        self._stats["calls"] += 1
+        self._stats["streams"] += 1
+        self._in_flight += 1
+        started = time.perf_counter()
+        deadline = loop.time() + timeout if timeout else None
+        finished = False
+        try:
+            while True:
+                remaining = deadline - loop.time() if deadline else None
+                try:
+                    if remaining is not None and remaining <= 0:
+                        raise asyncio.TimeoutError
+                    kind, value = await asyncio.wait_for(chunks.get(), remaining)
+                except asyncio.TimeoutError:
+                    self._stats["timeouts"] += 1
+                    logger.warning(f"LLM stream timed out after {timeout}s")
+                    raise LLMTimeoutError(f"LLM stream timed out after {timeout}s")
+
+                if kind == "done":
+                    break
+                if kind == "error":
+                    self._stats["failed"] += 1
+                    raise value
+                yield value
+
+            finished = True
+            self._stats["completed"] += 1
+
+        except (asyncio.CancelledError, GeneratorExit):
+            self._stats["cancelled"] += 1
+            raise
+
+        finally:
+            if not finished:
+                stopped.set()
+            self._in_flight -= 1
+            self._stats["total_ms"] += (time.perf_counter() - started) * 1000
+
+    def shutdown(self):
+        """Stop accepting calls; running calls finish in the background."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Call counters for this process."""
+        finished = self._stats["calls"] - self._in_flight
+        return {
+            **self._stats,
+            "total_ms": round(self._stats["total_ms"], 3),
+            "avg_ms": (
+                round(self._stats["total_ms"] / finished, 3) if finished else 0.0
+            ),
+            "in_flight": self._in_flight,
+            "max_workers": self.max_workers,
+            "timeout_seconds": self.timeout,
+        }
+
+
+# Global executor (shared by every LLM call site in the process)
+llm_executor = LLMExecutor()
+
+
+async def generate_content(model, prompt: Any, generation_config: Any = None, **kwargs):
+    """Call model.generate_content on the shared LLM executor."""
+    return await llm_executor.generate_content(
+        model, prompt, generation_config=generation_config, **kwargs
+    )
+
+
+async def stream_content(model, prompt: Any, generation_config: Any = None, **kwargs):
+    """Stream model.generate_content chunks from the shared LLM executor."""
+    async for text in llm_executor.stream_content(
+        model, prompt, generation_config=generation_config, **kwargs
+    ):
+        yield text
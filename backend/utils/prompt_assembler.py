@@ -0,0 +1,271 @@
+"""
+Token-budgeted prompt assembly.
+
+Chat and assistant prompts are built from sections (system prompt,
+guidelines, conversation and memory context, the user's message) that used
+to be concatenated whatever their size. The assembler counts each section's
+tokens with a local approximation of Gemini's tokenizer, always keeps the
+required sections, and gives the rest of PROMPT_TOKEN_BUDGET to the optional
+sections in priority order. A section that does not fit is trimmed by whole
+lines from its least useful end (oldest messages, least relevant memories),
+with "..." marking the cut; a section with less room than
+PROMPT_MIN_SECTION_TOKENS left is dropped.
+
+Prompt sizes are recorded per source and mode (e.g. "chat:general") so
+budget changes can be checked against real traffic.
+"""
+
+import os
+import re
+import math
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Words and single punctuation marks; long words cost one token per 4 chars,
+# which tracks SentencePiece tokenizers closely enough for budgeting
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_CHARS_PER_TOKEN = 4
+
+OMISSION_MARKER = "..."
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of model tokens in text."""
+    if not text:
+        return 0
+    return sum(
+        max(1, math.ceil(len(match.group()) / _CHARS_PER_TOKEN))
+        for match in _TOKEN_PATTERN.finditer(text)
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut text to at most max_tokens (approximate), at a token boundary.
+
+    Args:
+        text: Text to cut
+        max_tokens: Token limit, including the trailing omission marker
+
+    Returns:
+        text unchanged if it fits, otherwise its start followed by "..."
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    limit = max(0, max_tokens - estimate_tokens(OMISSION_MARKER))
+    used = 0
+    end = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        used += max(1, math.ceil(len(match.group()) / _CHARS_PER_TOKEN))
+        if used > limit:
+            break
+        end = match.end()
+
+    return f"{text[:end].rstrip()}{OMISSION_MARKER}" if end else OMISSION_MARKER
+
+
+@dataclass
+class PromptSection:
+    """One part of a prompt."""
+
+    name: str
+    text: str
+    # Lower numbers get budget first; required sections are always kept
+    priority: int = 0
+    required: bool = False
+    # Which end to keep when trimming: "start" or "end" (e.g. latest messages)
+    keep: str = "start"
+    # Leading lines (e.g. "Recent conversation:") kept whenever the section is
+    header_lines: int = 0
+    # Cap for this section even when more budget is left
+    max_tokens: Optional[int] = None
+
+
+@dataclass
+class AssembledPrompt:
+    """Sections after budgeting, ready to be formatted into a prompt."""
+
+    texts: Dict[str, str]
+    tokens: int
+    budget: int
+    sections: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def trimmed(self) -> bool:
+        return any(info["trimmed"] for info in self.sections.values())
+
+
+class PromptAssembler:
+    """Fits prompt sections into a token budget and records prompt sizes."""
+
+    def __init__(
+        self,
+        budget_tokens: Optional[int] = None,
+        min_section_tokens: Optional[int] = None,
+    ):
+        self.budget_tokens = budget_tokens or int(
+            os.getenv("PROMPT_TOKEN_BUDGET", "6000")
+        )
+        self.min_section_tokens = (
+            min_section_tokens
+            if min_section_tokens is not None
+            else int(os.getenv("PROMPT_MIN_SECTION_TOKENS", "24"))
+        )
+        # "source:mode" -> size counters
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def assemble(
+        self,
+        sections: List[PromptSection],
+        mode: str = "general",
+        budget_tokens: Optional[int] = None,
+    ) -> AssembledPrompt:
+        """
+        Fit sections into the token budget.
+
+        Args:
+            sections: Prompt sections, in any order
+            mode: Stats key for this prompt, e.g. "chat:general"
+            budget_tokens: Budget for this prompt (defaults to PROMPT_TOKEN_BUDGET)
+
+        Returns:
+            Budgeted section texts (dropped sections map to ""), token counts
+            and per-section sizes
+        """
+        budget = budget_tokens or self.budget_tokens
+        texts: Dict[str, str] = {}
+        info: Dict[str, Dict[str, Any]] = {}
+
+        for section in sections:
+            if section.required:
+                texts[section.name] = section.text
+                tokens = estimate_tokens(section.text)
+                info[section.name] = {
+                    "tokens": tokens,
+                    "original_tokens": tokens,
+                    "trimmed": False,
+                }
+
+        required_tokens = sum(entry["tokens"] for entry in info.values())
+        available = budget - required_tokens
+        if available < 0:
+            logger.warning(
+                f"Required prompt sections for {mode} use {required_tokens} "
+                f"tokens, over the {budget} token budget"
+            )
+
+        optional = sorted(
+            (section for section in sections if not section.required),
+            key=lambda section: section.priority,
+        )
+        for section in optional:
+            original = estimate_tokens(section.text)
+            allowed = max(0, available)
+            if section.max_tokens is not None:
+                allowed = min(allowed, section.max_tokens)
+
+            if original <= allowed:
+                text = section.text
+            elif allowed < self.min_section_tokens:
+                text = ""
+            else:
+                text = self._trim(section, allowed)
+
+            tokens = estimate_tokens(text)
+            available -= tokens
+            texts[section.name] = text
+            info[section.name] = {
+                "tokens": tokens,
+                "original_tokens": original,
+                "trimmed": tokens < original,
+            }
+
+        assembled = AssembledPrompt(
+            texts=texts,
+            tokens=sum(entry["tokens"] for entry in info.values()),
+            budget=budget,
+            sections=info,
+        )
+        self._record(mode, assembled)
+        return assembled
+
+    def _trim(self, section: PromptSection, max_tokens: int) -> str:
+        """Keep whole lines from the section's preferred end that fit."""
+        lines = section.text.split("\n")
+        header = lines[: section.header_lines]
+        body = lines[section.header_lines :]
+
+        remaining = max_tokens - estimate_tokens("\n".join(header))
+        # Room for the omission marker
+        remaining -= estimate_tokens(OMISSION_MARKER)
+
+        ordered = body if section.keep == "start" else list(reversed(body))
+        kept: List[str] = []
+        for line in ordered:
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                if not kept and remaining > 0:
+                    # Not even one whole line fits: keep part of it
+                    kept.append(truncate_to_tokens(line, remaining))
+                break
+            kept.append(line)
+            remaining -= cost
+
+        if section.keep == "start":
+            body_lines = kept + [OMISSION_MARKER]
+        else:
+            body_lines = [OMISSION_MARKER] + list(reversed(kept))
+        return "\n".join(header + body_lines)
+
+    def _record(self, mode: str, assembled: AssembledPrompt):
+        stats = self._stats.setdefault(
+            mode,
+            {
+                "prompts": 0,
+                "total_tokens": 0,
+                "max_tokens": 0,
+                "trimmed": 0,
+                "over_budget": 0,
+                "section_tokens": {},
+            },
+        )
+        stats["prompts"] += 1
+        stats["total_tokens"] += assembled.tokens
+        stats["max_tokens"] = max(stats["max_tokens"], assembled.tokens)
+        stats["trimmed"] += int(assembled.trimmed)
+        stats["over_budget"] += int(assembled.tokens > assembled.budget)
+        for name, entry in assembled.sections.items():
+            stats["section_tokens"][name] = (
+                stats["section_tokens"].get(name, 0) + entry["tokens"]
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Average and maximum prompt sizes per source and mode."""
+        modes = {}
+        for mode, stats in self._stats.items():
+            prompts = stats["prompts"]
+            modes[mode] = {
+                "prompts": prompts,
+                "avg_tokens": round(stats["total_tokens"] / prompts, 1),
+                "max_tokens": stats["max_tokens"],
+                "trimmed": stats["trimmed"],
+                "over_budget": stats["over_budget"],
+                "avg_section_tokens": {
+                    name: round(total / prompts, 1)
+                    for name, total in stats["section_tokens"].items()
+                },
+            }
+
+        return {
+            "budget_tokens": self.budget_tokens,
+            "min_section_tokens": self.min_section_tokens,
+            "modes": modes,
+        }
+
+
+# Global assembler (shared by every prompt builder in the process)
+prompt_assembler = PromptAssembler()
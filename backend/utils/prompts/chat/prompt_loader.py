@@ -8,6 +8,8 @@ used by the chat assistant.
 import os
 from typing import Optional
 
+from utils.prompts.registry import prompt_registry
+
 
 class ChatPromptLoader:
     """Loads prompts for chat assistant."""
@@ -17,14 +19,16 @@ class ChatPromptLoader:
         self.chat_prompts_dir = self.base_dir
 
     def _load_prompt(self, filename: str) -> str:
-        """Load a prompt file from the chat directory."""
+        """Load a prompt file from the chat directory (cached by the registry)."""
         try:
-            prompt_path = os.path.join(self.chat_prompts_dir, filename)
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                return f.read().strip()
+            return prompt_registry.text(f"chat/{filename}")
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt file not found: {filename}")
 
+    def get_prompt_version(self, filename: str) -> str:
+        """Get the content version hash of a chat prompt file."""
+        return prompt_registry.version(f"chat/{filename}")
+
     def get_system_prompt(self, mode: str = "general") -> str:
         """Get the system prompt for specific chat mode."""
         mode_files = {
@@ -59,6 +63,14 @@ class ChatPromptLoader:
         """Get the memory scoring prompt for conversation analysis."""
         return self._load_prompt("memory_scoring.txt")
 
+    def get_memory_batch_scoring_prompt(self) -> str:
+        """Get the prompt for scoring several memories in one request."""
+        return self._load_prompt("memory_batch_scoring.txt")
+
+    def get_memory_consolidation_prompt(self) -> str:
+        """Get the prompt for consolidating clusters of long-term memories."""
+        return self._load_prompt("memory_consolidation.txt")
+
     def get_photo_generation_prompt(self) -> str:
         """Get the photo generation prompt for visual creation."""
         return self._load_prompt("photo_generation.txt")
@@ -95,6 +107,18 @@ def get_memory_scoring_prompt() -> str:
     return loader.get_memory_scoring_prompt()
 
 
+def get_memory_batch_scoring_prompt() -> str:
+    """Get the prompt for scoring several memories in one request."""
+    loader = ChatPromptLoader()
+    return loader.get_memory_batch_scoring_prompt()
+
+
+def get_memory_consolidation_prompt() -> str:
+    """Get the prompt for consolidating clusters of long-term memories."""
+    loader = ChatPromptLoader()
+    return loader.get_memory_consolidation_prompt()
+
+
 def get_photo_generation_prompt() -> str:
     """Get the photo generation prompt for visual creation."""
     loader = ChatPromptLoader()
@@ -0,0 +1,227 @@
+"""
+Prompt Registry.
+
+One in-memory cache for every prompt file under utils/prompts (chat and
+voice), replacing per-call file reads in the loaders:
+
+- Prompts are loaded at startup (load_all) into immutable Prompt objects;
+  the name -> Prompt mapping is a read-only snapshot that is swapped, never
+  mutated, when a prompt changes.
+- Each prompt's str.format template is parsed once, so render() only joins
+  the pre-rendered literal chunks with the values.
+- A prompt's file mtime is checked at most every
+  PROMPT_RELOAD_INTERVAL_SECONDS; an edited file is reloaded without a
+  restart. A deleted file keeps serving its last version.
+- Each prompt has a version hash of its content, so result caches (scoring
+  cache, etc.) can key on the prompts that produced them.
+
+Prompts are named by directory and file name, e.g. "chat/memory_scoring.txt".
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from string import Formatter
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROMPT_EXTENSIONS = (".txt", ".md")
+
+_formatter = Formatter()
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """An immutable, loaded prompt."""
+
+    name: str
+    text: str
+    version: str
+    mtime_ns: int
+    # Template fields in order of appearance; empty for static prompts
+    fields: Tuple[str, ...] = ()
+    # (literal text, field name, format spec, conversion) per template part;
+    # None when the text is not a valid format string
+    chunks: Optional[Tuple[Tuple[str, Optional[str], str, Optional[str]], ...]] = None
+
+    @classmethod
+    def from_text(cls, name: str, text: str, mtime_ns: int) -> "Prompt":
+        try:
+            chunks = tuple(
+                (literal, field_name, spec or "", conversion)
+                for literal, field_name, spec, conversion in _formatter.parse(text)
+            )
+        except ValueError:
+            # Unbalanced braces: usable as plain text, not as a template
+            chunks = None
+
+        fields = tuple(
+            dict.fromkeys(
+                field_name for _, field_name, _, _ in (chunks or ()) if field_name
+            )
+        )
+        return cls(
+            name=name,
+            text=text,
+            version=hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+            mtime_ns=mtime_ns,
+            fields=fields,
+            chunks=chunks,
+        )
+
+    def render(self, **values: Any) -> str:
+        """Fill the template; equivalent to self.text.format(**values)."""
+        if self.chunks is None:
+            raise ValueError(f"Prompt {self.name} is not a valid template")
+
+        parts = []
+        for literal, field_name, spec, conversion in self.chunks:
+            parts.append(literal)
+            if field_name is not None:
+                value, _ = _formatter.get_field(field_name, (), values)
+                value = _formatter.convert_field(value, conversion)
+                parts.append(format(value, spec))
+        return "".join(parts)
+
+
+class PromptRegistry:
+    """Cached, hot-reloading access to the prompt files."""
+
+    def __init__(
+        self,
+        roots: Optional[Dict[str, str]] = None,
+        reload_interval: Optional[float] = None,
+    ):
+        self.roots = roots or {
+            "chat": os.path.join(PROMPTS_DIR, "chat"),
+            "voice": os.path.join(PROMPTS_DIR, "voice"),
+        }
+        self.reload_interval = (
+            reload_interval
+            if reload_interval is not None
+            else float(os.getenv("PROMPT_RELOAD_INTERVAL_SECONDS", "2"))
+        )
+        self._prompts: Mapping[str, Prompt] = MappingProxyType({})
+        # name -> monotonic time of the last mtime check
+        self._checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "reloads": 0, "hits": 0, "checks": 0}
+
+    def _path(self, name: str) -> str:
+        root, _, filename = name.partition("/")
+        if root not in self.roots or not filename:
+            raise FileNotFoundError(f"Prompt file not found: {name}")
+        return os.path.join(self.roots[root], filename)
+
+    def _load(self, name: str, path: str) -> Prompt:
+        """Read a prompt file and swap it into the snapshot."""
+        with self._lock:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                prompt = Prompt.from_text(name, f.read().strip(), mtime_ns)
+
+            previous = self._prompts.get(name)
+            self._prompts = MappingProxyType({**self._prompts, name: prompt})
+            self._checked[name] = time.monotonic()
+
+        if previous is None:
+            self._stats["loads"] += 1
+        else:
+            self._stats["reloads"] += 1
+            logger.info(
+                f"Reloaded prompt {name} (version {previous.version} -> {prompt.version})"
+            )
+        return prompt
+
+    def load_all(self) -> int:
+        """
+        Load every prompt file under the registry's directories.
+
+        Returns:
+            Number of prompts loaded
+        """
+        count = 0
+        for root, directory in self.roots.items():
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(PROMPT_EXTENSIONS):
+                    self._load(f"{root}/{filename}", os.path.join(directory, filename))
+                    count += 1
+
+        logger.info(f"Loaded {count} prompts")
+        return count
+
+    def get(self, name: str) -> Prompt:
+        """
+        Get a prompt, reloading it if its file changed.
+
+        Args:
+            name: Prompt name, e.g. "chat/memory_scoring.txt"
+
+        Returns:
+            The current version of the prompt
+
+        Raises:
+            FileNotFoundError: The prompt was never loaded and has no file
+        """
+        prompt = self._prompts.get(name)
+        now = time.monotonic()
+        if (
+            prompt is not None
+            and now - self._checked.get(name, 0) < self.reload_interval
+        ):
+            self._stats["hits"] += 1
+            return prompt
+
+        path = self._path(name)
+        self._stats["checks"] += 1
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            if prompt is None:
+                raise FileNotFoundError(f"Prompt file not found: {name}")
+            logger.warning(f"Prompt file {name} removed, keeping the loaded version")
+            self._checked[name] = now
+            return prompt
+
+        if prompt is not None and prompt.mtime_ns == mtime_ns:
+            self._checked[name] = now
+            self._stats["hits"] += 1
+            return prompt
+
+        return self._load(name, path)
+
+    def text(self, name: str) -> str:
+        """Get a prompt's text."""
+        return self.get(name).text
+
+    def render(self, name: str, /, **values: Any) -> str:
+        """Fill a prompt template with values."""
+        return self.get(name).render(**values)
+
+    def version(self, name: str) -> str:
+        """Get a prompt's content version hash."""
+        return self.get(name).version
+
+    def versions(self) -> Dict[str, str]:
+        """Version hash of every loaded prompt."""
+        return {name: prompt.version for name, prompt in self._prompts.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Load and reload counters."""
+        return {
+            **self._stats,
+            "prompts": len(self._prompts),
+            "reload_interval_seconds": self.reload_interval,
+        }
+
+
+# Create global instance (shared by every prompt loader in the process)
+prompt_registry = PromptRegistry()
@@ -8,6 +8,8 @@ used by the voice assistant (Vapi).
 import os
 from typing import Optional
 
+from utils.prompts.registry import prompt_registry
+
 
 class VoicePromptLoader:
     """Loads prompts for voice assistant."""
@@ -18,11 +20,10 @@ class VoicePromptLoader:
         self.chat_prompts_dir = os.path.join(self.base_dir, "..", "chat")
 
     def _load_prompt(self, filename: str, directory: str) -> str:
-        """Load a prompt file from the specified directory."""
+        """Load a prompt file from the specified directory (cached by the registry)."""
+        root = "chat" if directory == self.chat_prompts_dir else "voice"
         try:
-            prompt_path = os.path.join(directory, filename)
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                return f.read().strip()
+            return prompt_registry.text(f"{root}/{filename}")
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt file not found: {filename}")
 
@@ -0,0 +1,75 @@
+"""
+Owner-checked Redis locks.
+
+A lock is a key set with NX and a TTL, holding a random token. Extending and
+releasing only touch the key while it still holds the caller's token, so a
+worker whose lock expired mid-run cannot extend or delete the lock another
+worker has taken since:
+
+    lock = RedisLock(client, "memory_ingestion:lock:3", ttl_seconds=300)
+    if await lock.acquire():
+        try:
+            for item in batch:
+                if not await lock.extend():
+                    break  # Another worker owns the work now
+                ...
+        finally:
+            await lock.release()
+"""
+
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# KEYS: lock; ARGV: token
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# KEYS: lock; ARGV: token, TTL in milliseconds
+_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisLock:
+    """A TTL lock on one Redis key, extended and released only by its owner."""
+
+    def __init__(self, client, key: str, ttl_seconds: float):
+        self.client = client
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+        self.token = str(uuid.uuid4())
+
+    async def acquire(self) -> bool:
+        """Take the lock if nobody holds it."""
+        return bool(
+            await self.client.set(
+                self.key, self.token, nx=True, px=int(self.ttl_seconds * 1000)
+            )
+        )
+
+    async def extend(self) -> bool:
+        """
+        Reset the lock's TTL.
+
+        Returns:
+            False if the lock expired and was lost (possibly to another owner)
+        """
+        extended = await self.client.eval(
+            _EXTEND_SCRIPT, 1, self.key, self.token, int(self.ttl_seconds * 1000)
+        )
+        if not extended:
+            logger.warning(f"Lost lock {self.key}")
+        return bool(extended)
+
+    async def release(self) -> bool:
+        """Delete the lock if it is still ours."""
+        return bool(await self.client.eval(_RELEASE_SCRIPT, 1, self.key, self.token))
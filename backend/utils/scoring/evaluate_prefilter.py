@@ -0,0 +1,191 @@
+"""
+Offline evaluation of the scoring pre-filter against logged decisions.
+
+MemoryProcessor logs a "scoring_prefilter" audit event for every user chat
+message it scores: the pre-filter's features and probability, and the
+category Gemini assigned when the message was sent to Gemini. This script
+replays those events to show, for a range of thresholds, how many Gemini
+calls the pre-filter would skip and how many of the skipped messages Gemini
+had classified as long-term or emotional anchors.
+
+Only messages Gemini classified can be evaluated, so messages the deployed
+pre-filter short-circuited are left out.
+
+Usage (from the backend directory):
+    python -m utils.scoring.evaluate_prefilter logs/audit/memory_audit.log
+    python -m utils.scoring.evaluate_prefilter logs/audit/*.log --fit weights.json
+"""
+
+import sys
+import json
+import argparse
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+from utils.scoring.prefilter import FEATURES, DEFAULT_MODEL, load_model, predict
+
+DEFAULT_THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.98, 0.99)
+
+
+def read_samples(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Read pre-filter events labelled by Gemini from audit log files.
+
+    Args:
+        paths: Audit log files ("<time> - <level> - <json>" lines)
+
+    Returns:
+        Event details, each with features and memory_category
+    """
+    samples = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                start = line.find("{")
+                if start == -1 or '"scoring_prefilter"' not in line:
+                    continue
+                try:
+                    entry = json.loads(line[start:])
+                except ValueError:
+                    continue
+                details = entry.get("details", {})
+                if (
+                    entry.get("event_type") == "scoring_prefilter"
+                    and details.get("label_source") == "gemini"
+                ):
+                    samples.append(details)
+    return samples
+
+
+def evaluate(
+    samples: List[Dict[str, Any]], model: Dict[str, Any], thresholds: Iterable[float]
+) -> List[Dict[str, Any]]:
+    """
+    Measure skipped calls and wrongly skipped memories per threshold.
+
+    Args:
+        samples: Gemini-labelled pre-filter events
+        model: Pre-filter model weights
+        thresholds: Probability thresholds to evaluate
+
+    Returns:
+        One row per threshold
+    """
+    probabilities = np.array([predict(s["features"], model) for s in samples])
+    short_term = np.array([s["memory_category"] == "short_term" for s in samples])
+    # Negations and "forever" always reach Gemini, whatever the threshold
+    blocked = np.array([bool(s.get("blocked")) for s in samples], dtype=bool)
+
+    rows = []
+    for threshold in thresholds:
+        skipped = (probabilities >= threshold) & ~blocked
+        wrong = skipped & ~short_term
+        rows.append(
+            {
+                "threshold": threshold,
+                "skipped": int(skipped.sum()),
+                "skip_rate": float(skipped.mean()) if len(samples) else 0.0,
+                "wrongly_skipped": int(wrong.sum()),
+                "precision": (
+                    float((skipped & short_term).sum() / skipped.sum())
+                    if skipped.any()
+                    else 1.0
+                ),
+                "meaningful_missed_rate": (
+                    float(wrong.sum() / (~short_term).sum())
+                    if (~short_term).any()
+                    else 0.0
+                ),
+            }
+        )
+    return rows
+
+
+def fit(
+    samples: List[Dict[str, Any]],
+    epochs: int = 2000,
+    learning_rate: float = 0.1,
+    l2: float = 0.01,
+) -> Dict[str, Any]:
+    """
+    Fit the pre-filter's logistic model to Gemini's labels.
+
+    Args:
+        samples: Gemini-labelled pre-filter events
+        epochs: Full-batch gradient descent steps
+        learning_rate: Step size
+        l2: L2 penalty on the weights (not the bias)
+
+    Returns:
+        Model weights in the format load_model reads
+    """
+    features = np.array(
+        [[s["features"].get(name, 0.0) for name in FEATURES] for s in samples]
+    )
+    labels = np.array([s["memory_category"] == "short_term" for s in samples], float)
+
+    weights = np.array([DEFAULT_MODEL["weights"][name] for name in FEATURES])
+    bias = DEFAULT_MODEL["bias"]
+    for _ in range(epochs):
+        logits = np.clip(features @ weights + bias, -60, 60)
+        errors = 1.0 / (1.0 + np.exp(-logits)) - labels
+        weights -= learning_rate * (features.T @ errors / len(labels) + l2 * weights)
+        bias -= learning_rate * errors.mean()
+
+    return {
+        "bias": round(float(bias), 4),
+        "weights": {
+            name: round(float(weight), 4) for name, weight in zip(FEATURES, weights)
+        },
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("logs", nargs="+", help="Audit log files")
+    parser.add_argument(
+        "--weights", help="Weights file to evaluate (default: built-in)"
+    )
+    parser.add_argument("--fit", metavar="PATH", help="Fit weights and write them here")
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=list(DEFAULT_THRESHOLDS),
+        help="Thresholds to evaluate",
+    )
+    args = parser.parse_args(argv)
+
+    samples = read_samples(args.logs)
+    if not samples:
+        print("No Gemini-labelled scoring_prefilter events found")
+        return 1
+
+    long_term = sum(s["memory_category"] != "short_term" for s in samples)
+    print(f"{len(samples)} labelled messages, {long_term} long-term or anchors\n")
+
+    models = [("current", load_model(args.weights))]
+    if args.fit:
+        fitted = fit(samples)
+        with open(args.fit, "w", encoding="utf-8") as f:
+            json.dump(fitted, f, indent=2)
+        print(f"Wrote fitted weights to {args.fit} (evaluated on training data)\n")
+        models.append(("fitted", fitted))
+
+    for name, model in models:
+        print(f"{name} model")
+        print("threshold  skipped  skip_rate  wrongly_skipped  precision  missed_rate")
+        for row in evaluate(samples, model, args.thresholds):
+            print(
+                f"{row['threshold']:>9.2f}  {row['skipped']:>7}  "
+                f"{row['skip_rate']:>9.1%}  {row['wrongly_skipped']:>15}  "
+                f"{row['precision']:>9.1%}  {row['meaningful_missed_rate']:>11.1%}"
+            )
+        print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
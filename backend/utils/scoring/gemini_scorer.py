@@ -1,18 +1,39 @@
 import os
 import logging
 import json
+import hashlib
 import google.generativeai as genai
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from services.memory.types import MemoryItem, MemoryScore
 from services.memory.config import Config
+from utils.llm_executor import llm_executor
+from utils.prompts.registry import prompt_registry
+
+from .score_cache import ScoringCache, scoring_cache
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+MEMORY_CATEGORIES = ("short_term", "long_term", "emotional_anchor")
+
+# Classification fields kept in the scoring cache
+CLASSIFICATION_FIELDS = (
+    "memory_category",
+    "is_meaningful",
+    "is_lasting",
+    "is_symbolic",
+    "reasoning",
+)
+
+# Prompt files whose versions key the scoring cache
+SCORING_PROMPTS = ("chat/memory_scoring.txt", "chat/memory_batch_scoring.txt")
+
+STRICT_JSON_INSTRUCTION = "CRITICAL: You must respond ONLY with valid JSON. Do not include any explanatory text, markdown, or conversational responses. Return exactly the JSON structure specified above."
+
 
 class GeminiScorer:
-    def __init__(self):
+    def __init__(self, cache: Optional[ScoringCache] = None):
         # Initialize Gemini
         genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
@@ -21,12 +42,35 @@ class GeminiScorer:
 
         self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
 
-        # Load scoring prompt
-        self.scoring_prompt = Config.get_memory_comprehensive_scoring_prompt()
+        self.batch_size = max(1, Config.MEMORY_SCORING_BATCH_SIZE)
+
+        # Cached scores are only reused for the same prompts
+        self.cache = cache or scoring_cache
 
         # Check if we're using fallbacks and warn
         self._check_configuration()
 
+    @property
+    def scoring_prompt(self) -> str:
+        """Single-memory scoring prompt (reloaded when its file changes)."""
+        return Config.get_memory_comprehensive_scoring_prompt()
+
+    @property
+    def batch_scoring_prompt(self) -> str:
+        """Batch scoring prompt (reloaded when its file changes)."""
+        return Config.get_memory_batch_scoring_prompt()
+
+    @property
+    def prompt_version(self) -> str:
+        """Version of the scoring prompts, part of every scoring cache key."""
+        versions = []
+        for name in SCORING_PROMPTS:
+            try:
+                versions.append(prompt_registry.version(name))
+            except FileNotFoundError:
+                versions.append("missing")
+        return hashlib.sha256("\x1f".join(versions).encode("utf-8")).hexdigest()[:16]
+
     def _setup_generation_configs(self):
         """Define generation configurations for consistent memory processing."""
         # Memory extraction - low temperature for consistent, instruction-following behavior
@@ -54,13 +98,15 @@ class GeminiScorer:
             logger.error(error_msg)
             # Configuration error messages are now handled by centralized config_manager
 
-    def score_memory(self, memory: MemoryItem) -> List[MemoryScore]:
+    async def score_memory(self, memory: MemoryItem) -> List[MemoryScore]:
         """Score a memory using Gemini's significance-based analysis, returning multiple components."""
         try:
             # Use comprehensive scoring with Gemini - LOW TEMPERATURE for consistency
-            comprehensive_response = self.model.generate_content(
+            comprehensive_response = await llm_executor.generate_content(
+                self.model,
                 self.scoring_prompt.format(content=memory.content),
                 generation_config=self.memory_extraction_config,
+                coalesce=True,
             )
 
             # Clean and parse the response
@@ -81,10 +127,13 @@ class GeminiScorer:
                     retry_prompt = f"""
 {self.scoring_prompt.format(content=memory.content)}
 
-CRITICAL: You must respond ONLY with valid JSON. Do not include any explanatory text, markdown, or conversational responses. Return exactly the JSON structure specified above.
+{STRICT_JSON_INSTRUCTION}
 """
-                    retry_response = self.model.generate_content(
-                        retry_prompt, generation_config=self.strict_extraction_config
+                    retry_response = await llm_executor.generate_content(
+                        self.model,
+                        retry_prompt,
+                        generation_config=self.strict_extraction_config,
+                        coalesce=True,
                     )
                     response_text = retry_response.text.strip()
 
@@ -96,60 +145,7 @@ CRITICAL: You must respond ONLY with valid JSON. Do not include any explanatory
 
             try:
                 scoring_data = json.loads(response_text)
-
-                # SIMPLIFIED: Use only basic structure - no more organic story elements
-                # Just treat the whole memory as one component with basic classification
-                memory_scores = []
-
-                # Get basic classification fields directly from scoring data
-                memory_category = scoring_data.get("memory_category", "short_term")
-                is_meaningful = scoring_data.get("is_meaningful", False)
-                is_lasting = scoring_data.get("is_lasting", False)
-                is_symbolic = scoring_data.get("is_symbolic", False)
-                reasoning = scoring_data.get("reasoning", "")
-
-                # Create intuitive scores based on simple classification
-                if memory_category == "emotional_anchor":
-                    relevance_score = 0.9
-                    stability_score = 0.9
-                    explicitness_score = 0.8
-                elif memory_category == "long_term":
-                    relevance_score = 0.8
-                    stability_score = 0.8
-                    explicitness_score = 0.7
-                else:  # short_term
-                    relevance_score = 0.5
-                    stability_score = 0.4
-                    explicitness_score = 0.6
-
-                # Store simple metadata - no component system
-                metadata = {
-                    "component_content": memory.content,
-                    "component_index": 0,
-                    "total_components": 1,
-                    "original_message": memory.content,
-                    # Simple classification fields
-                    "memory_category": memory_category,
-                    "is_meaningful": is_meaningful,
-                    "is_lasting": is_lasting,
-                    "is_symbolic": is_symbolic,
-                    "reasoning": reasoning,
-                    # Basic info
-                    "gemini_used": True,
-                    "api_calls_used": 1,
-                    "simple_structure": True,
-                }
-
-                memory_scores.append(
-                    MemoryScore(
-                        relevance=relevance_score,
-                        stability=stability_score,
-                        explicitness=explicitness_score,
-                        metadata=metadata,
-                    )
-                )
-
-                return memory_scores
+                return self._scores_from_data(memory, scoring_data)
 
             except (json.JSONDecodeError, KeyError) as e:
                 logger.warning(f"Failed to parse scoring response: {str(e)}")
@@ -189,6 +185,295 @@ CRITICAL: You must respond ONLY with valid JSON. Do not include any explanatory
                 )
             ]
 
+    def _scores_from_data(
+        self,
+        memory: MemoryItem,
+        scoring_data: Dict[str, Any],
+        batch_size: int = 1,
+        cached: bool = False,
+    ) -> List[MemoryScore]:
+        """Turn a parsed classification into the memory's scores."""
+        # SIMPLIFIED: Use only basic structure - no more organic story elements
+        # Just treat the whole memory as one component with basic classification
+        memory_category = scoring_data.get("memory_category", "short_term")
+        is_meaningful = scoring_data.get("is_meaningful", False)
+        is_lasting = scoring_data.get("is_lasting", False)
+        is_symbolic = scoring_data.get("is_symbolic", False)
+        reasoning = scoring_data.get("reasoning", "")
+
+        # Create intuitive scores based on simple classification
+        if memory_category == "emotional_anchor":
+            relevance_score = 0.9
+            stability_score = 0.9
+            explicitness_score = 0.8
+        elif memory_category == "long_term":
+            relevance_score = 0.8
+            stability_score = 0.8
+            explicitness_score = 0.7
+        else:  # short_term
+            relevance_score = 0.5
+            stability_score = 0.4
+            explicitness_score = 0.6
+
+        # Store simple metadata - no component system
+        metadata = {
+            "component_content": memory.content,
+            "component_index": 0,
+            "total_components": 1,
+            "original_message": memory.content,
+            # Simple classification fields
+            "memory_category": memory_category,
+            "is_meaningful": is_meaningful,
+            "is_lasting": is_lasting,
+            "is_symbolic": is_symbolic,
+            "reasoning": reasoning,
+            # Basic info
+            "gemini_used": True,
+            "api_calls_used": 1,
+            "simple_structure": True,
+        }
+        if batch_size > 1:
+            metadata["scoring_batch_size"] = batch_size
+        if cached:
+            metadata["api_calls_used"] = 0
+            metadata["scoring_cache_hit"] = True
+
+        return [
+            MemoryScore(
+                relevance=relevance_score,
+                stability=stability_score,
+                explicitness=explicitness_score,
+                metadata=metadata,
+            )
+        ]
+
+    def short_term_scores(
+        self, memory: MemoryItem, reasoning: str
+    ) -> List[MemoryScore]:
+        """Scores for a memory classified as short-term without calling Gemini."""
+        scores = self._scores_from_data(
+            memory,
+            {
+                "memory_category": "short_term",
+                "is_meaningful": False,
+                "is_lasting": False,
+                "is_symbolic": False,
+                "reasoning": reasoning,
+            },
+        )
+        scores[0].metadata.update({"gemini_used": False, "api_calls_used": 0})
+        return scores
+
+    async def score_memories(
+        self, memories: List[MemoryItem]
+    ) -> List[List[MemoryScore]]:
+        """
+        Score several memories, MEMORY_SCORING_BATCH_SIZE per Gemini request.
+
+        Each request lists its memories with ids and asks for one result per
+        id. Memories missing from a response, or with malformed results, are
+        re-scored together once with the strict extraction config; any still
+        unscored fall back to score_memory.
+
+        Args:
+            memories: Memories to score
+
+        Returns:
+            Scores for each memory, in input order, as score_memory returns them
+        """
+        results = []
+        for start in range(0, len(memories), self.batch_size):
+            results.extend(
+                await self._score_batch(memories[start : start + self.batch_size])
+            )
+        return results
+
+    async def _score_batch(self, memories: List[MemoryItem]) -> List[List[MemoryScore]]:
+        """Score one batch of memories, re-scoring only the failed items."""
+        scored: Dict[int, List[MemoryScore]] = {}
+        pending = list(range(len(memories)))
+
+        if "CONFIGURATION ERROR" not in self.batch_scoring_prompt:
+            for config in (
+                self.memory_extraction_config,
+                self.strict_extraction_config,
+            ):
+                # A single memory is cheaper to score on its own
+                if len(pending) < 2:
+                    break
+
+                batch = [memories[i] for i in pending]
+                parsed = await self._request_batch(batch, config)
+                for position, scoring_data in parsed.items():
+                    index = pending[position]
+                    scored[index] = self._scores_from_data(
+                        memories[index], scoring_data, batch_size=len(batch)
+                    )
+
+                pending = [i for i in pending if i not in scored]
+                if pending:
+                    logger.warning(
+                        f"Batch scoring left {len(pending)} of {len(batch)} memories unscored"
+                    )
+
+        for index in pending:
+            scored[index] = await self.score_memory(memories[index])
+
+        return [scored[index] for index in range(len(memories))]
+
+    async def _request_batch(
+        self, memories: List[MemoryItem], generation_config
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Classify memories in one request.
+
+        Returns:
+            Parsed results keyed by position in `memories`
+        """
+        items = [
+            {"id": str(position + 1), "content": memory.content}
+            for position, memory in enumerate(memories)
+        ]
+        prompt = self.batch_scoring_prompt.format(
+            memories=json.dumps(items, ensure_ascii=False)
+        )
+        if generation_config is self.strict_extraction_config:
+            prompt = f"{prompt}\n\n{STRICT_JSON_INSTRUCTION}"
+
+        try:
+            response = await llm_executor.generate_content(
+                self.model,
+                prompt,
+                generation_config=generation_config,
+                coalesce=True,
+            )
+            return self._parse_batch_response(response.text, len(memories))
+        except Exception as e:
+            logger.warning(f"Batch scoring request failed: {str(e)}")
+            return {}
+
+    def _parse_batch_response(self, text: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Pull per-item results out of a batch response.
+
+        The response should be a JSON list, but results are salvaged object by
+        object when it is wrapped in prose, truncated or otherwise invalid.
+        Results with an unknown id or category are dropped.
+        """
+        candidates = []
+        start_idx = text.find("[")
+        end_idx = text.rfind("]") + 1
+        try:
+            candidates = json.loads(text[start_idx:end_idx])
+        except ValueError:
+            pass
+
+        if not isinstance(candidates, list):
+            candidates = []
+        if not candidates:
+            decoder = json.JSONDecoder()
+            position = text.find("{")
+            while position != -1:
+                try:
+                    candidate, end = decoder.raw_decode(text, position)
+                    candidates.append(candidate)
+                    position = text.find("{", end)
+                except ValueError:
+                    position = text.find("{", position + 1)
+
+        parsed = {}
+        for candidate in candidates:
+            if not isinstance(candidate, dict):
+                continue
+            try:
+                position = int(candidate.get("id")) - 1
+            except (TypeError, ValueError):
+                continue
+            if (
+                0 <= position < count
+                and candidate.get("memory_category") in MEMORY_CATEGORIES
+            ):
+                parsed.setdefault(position, candidate)
+
+        return parsed
+
+    async def score_memory_cached(self, memory: MemoryItem) -> List[MemoryScore]:
+        """Score a memory, reusing a cached classification of the same content."""
+        return (await self.score_memories_cached([memory]))[0]
+
+    async def score_memories_cached(
+        self, memories: List[MemoryItem]
+    ) -> List[List[MemoryScore]]:
+        """
+        Score memories, consulting the scoring cache before calling Gemini.
+
+        Misses are scored with score_memories and successful classifications
+        are cached; fallback scores from failed calls are not.
+
+        Args:
+            memories: Memories to score
+
+        Returns:
+            Scores for each memory, in input order, as score_memory returns them
+        """
+        if not Config.SCORING_CACHE_ENABLED:
+            return await self.score_memories(memories)
+
+        model = Config.GEMINI_MODEL
+        prompt_version = self.prompt_version
+        contents = [memory.content for memory in memories]
+        cached = await self.cache.get_many(
+            contents,
+            prompt_version,
+            model,
+            user_ids=[memory.user_id for memory in memories],
+        )
+
+        results: List[Optional[List[MemoryScore]]] = [
+            (
+                self._scores_from_data(memory, classification, cached=True)
+                if classification
+                else None
+            )
+            for memory, classification in zip(memories, cached)
+        ]
+
+        misses = [i for i, scores in enumerate(results) if scores is None]
+        if misses:
+            fresh = await self.score_memories([memories[i] for i in misses])
+            to_cache = []
+            for i, scores in zip(misses, fresh):
+                results[i] = scores
+                classification = self._classification(scores)
+                if classification:
+                    to_cache.append((memories[i], classification))
+
+            if to_cache:
+                await self.cache.set_many(
+                    [memory.content for memory, _ in to_cache],
+                    [classification for _, classification in to_cache],
+                    prompt_version,
+                    model,
+                    user_ids=[memory.user_id for memory, _ in to_cache],
+                )
+
+        return results
+
+    def _classification(self, scores: List[MemoryScore]) -> Optional[Dict[str, Any]]:
+        """Classification fields of a successful Gemini scoring, for the cache."""
+        if len(scores) != 1:
+            return None
+
+        metadata = scores[0].metadata or {}
+        if (
+            not metadata.get("gemini_used")
+            or "error" in metadata
+            or metadata.get("memory_category") not in MEMORY_CATEGORIES
+        ):
+            return None
+
+        return {field: metadata.get(field) for field in CLASSIFICATION_FIELDS}
+
     def should_store_memory(
         self, score: MemoryScore, thresholds: Dict[str, float]
     ) -> bool:
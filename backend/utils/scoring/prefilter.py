@@ -0,0 +1,254 @@
+"""
+Local pre-filter for memory scoring.
+
+Decides, without calling Gemini, that a chat message is obviously short-term
+only ("thanks", "ok cool", "lol"), so MemoryProcessor can skip the scoring
+call. Two stages:
+
+1. Rules: empty messages and messages made only of acknowledgement words
+2. A small logistic model over message features (length, first-person and
+   emotion terms, life-event and symbolic terms, likely named entities,
+   dates) giving the probability that the message is short-term only
+
+A message is short-circuited when that probability reaches
+SCORING_PREFILTER_THRESHOLD. Messages with a negation ("not good", "no one
+cares") or "forever" are never short-circuited, however short: a brief
+negative or farewell message is exactly what must reach Gemini. Model weights can be refitted offline from
+logged decisions (see evaluate_prefilter.py) and loaded from
+SCORING_PREFILTER_WEIGHTS_FILE.
+"""
+
+import json
+import math
+import re
+import logging
+from typing import Dict, Any, Optional
+
+from services.memory.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|\d+")
+_CAPITALIZED_PATTERN = re.compile(r"(?<![.!?]\s)(?<!^)\b[A-Z][a-z]+")
+_DATE_PATTERN = re.compile(
+    r"\b(?:\d{1,2}[/.-]\d{1,2}(?:[/.-]\d{2,4})?|(?:19|20)\d{2}"
+    r"|jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+    r"|monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|yesterday|birthday|anniversary|ago)\b",
+    re.IGNORECASE,
+)
+
+ACKNOWLEDGEMENTS = frozenset(
+    "ok okay k kk yes yeah yep yup nope nah sure thanks thank thx ty you "
+    "so much very lol haha hahaha lmao hi hey hello cool nice great "
+    "good fine alright right got it hmm hm mm oh ah wow cheers welcome np".split()
+)
+# Any of these (or an "n't" contraction) sends a message to Gemini
+BLOCKING_TERMS = frozenset(
+    "not never no nobody nothing none nowhere neither nor forever".split()
+)
+FIRST_PERSON = frozenset(
+    "i i'm i've i'd i'll me my mine myself we we're our ours us".split()
+)
+EMOTION_TERMS = frozenset(
+    "sad happy angry anxious anxiety afraid scared lonely alone hurt upset "
+    "depressed depression grief grieving proud ashamed guilty love loved hate "
+    "miss missing worried stressed overwhelmed hopeless heartbroken cry crying "
+    "panic fear".split()
+)
+EVENT_TERMS = frozenset(
+    "died death passed funeral married marry wedding divorced divorce engaged "
+    "pregnant born baby graduated graduation diagnosed diagnosis cancer fired "
+    "hired promoted job moved moving breakup broke therapy therapist hospital "
+    "accident abuse abused sober relapse adopted retired".split()
+)
+ANCHOR_TERMS = frozenset(
+    "remind reminds reminded garden ring necklace song music faith pray prayer "
+    "god safe comfort comforts symbol ocean tree place grandmother grandma "
+    "grandfather grandpa".split()
+)
+
+FEATURES = (
+    "log_tokens",
+    "acknowledgement_ratio",
+    "first_person",
+    "emotion_terms",
+    "first_person_emotion",
+    "event_terms",
+    "anchor_terms",
+    "entities",
+    "dates",
+    "question",
+)
+
+# Probability of "short-term only" = sigmoid(bias + sum(weight * feature))
+DEFAULT_MODEL = {
+    "bias": 2.0,
+    "weights": {
+        "log_tokens": -0.9,
+        "acknowledgement_ratio": 3.0,
+        "first_person": -0.4,
+        "emotion_terms": -0.3,
+        "first_person_emotion": -0.3,
+        "event_terms": -3.0,
+        "anchor_terms": -2.0,
+        "entities": -0.8,
+        "dates": -0.7,
+        "question": 0.3,
+    },
+}
+
+
+def extract_features(text: str) -> Dict[str, float]:
+    """
+    Compute the pre-filter's features for a message.
+
+    Args:
+        text: Message content
+
+    Returns:
+        Feature name -> value, for every name in FEATURES
+    """
+    text = text or ""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    first_person = sum(token in FIRST_PERSON for token in tokens)
+    emotion_terms = sum(token in EMOTION_TERMS for token in tokens)
+
+    return {
+        "log_tokens": math.log1p(len(tokens)),
+        "acknowledgement_ratio": (
+            sum(token in ACKNOWLEDGEMENTS for token in tokens) / len(tokens)
+            if tokens
+            else 1.0
+        ),
+        "first_person": float(first_person),
+        "emotion_terms": float(emotion_terms),
+        "first_person_emotion": float(first_person > 0 and emotion_terms > 0),
+        "event_terms": float(sum(token in EVENT_TERMS for token in tokens)),
+        "anchor_terms": float(sum(token in ANCHOR_TERMS for token in tokens)),
+        "entities": float(len(_CAPITALIZED_PATTERN.findall(text.strip()))),
+        "dates": float(len(_DATE_PATTERN.findall(text))),
+        "question": float("?" in text),
+    }
+
+
+def blocks_short_circuit(text: str) -> bool:
+    """Whether a message contains a negation or "forever"."""
+    return any(
+        token in BLOCKING_TERMS or token.endswith("n't")
+        for token in _TOKEN_PATTERN.findall((text or "").lower())
+    )
+
+
+def predict(features: Dict[str, float], model: Dict[str, Any]) -> float:
+    """Probability that a message with these features is short-term only."""
+    logit = model["bias"] + sum(
+        weight * features.get(name, 0.0) for name, weight in model["weights"].items()
+    )
+    return 1.0 / (1.0 + math.exp(-max(-60.0, min(60.0, logit))))
+
+
+def load_model(path: Optional[str] = None) -> Dict[str, Any]:
+    """Load model weights from a JSON file, falling back to DEFAULT_MODEL."""
+    if not path:
+        return DEFAULT_MODEL
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            model = json.load(f)
+        return {
+            "bias": float(model["bias"]),
+            "weights": {
+                name: float(model["weights"].get(name, 0.0)) for name in FEATURES
+            },
+        }
+    except Exception as e:
+        logger.error(f"Failed to load pre-filter weights from {path}: {e}")
+        return DEFAULT_MODEL
+
+
+class ScoringPrefilter:
+    """Rule plus linear-model gate in front of Gemini memory scoring."""
+
+    # Acknowledgement-only messages up to this many tokens are always trivial
+    RULE_MAX_TOKENS = 6
+
+    def __init__(
+        self, threshold: Optional[float] = None, model: Optional[Dict[str, Any]] = None
+    ):
+        self.threshold = (
+            threshold if threshold is not None else Config.SCORING_PREFILTER_THRESHOLD
+        )
+        self.model = model or load_model(Config.SCORING_PREFILTER_WEIGHTS_FILE)
+        self._stats = {
+            "checked": 0,
+            "short_circuited": 0,
+            "by_rule": 0,
+            "by_model": 0,
+            "blocked": 0,
+            "passed": 0,
+        }
+
+    def evaluate(self, text: str) -> Dict[str, Any]:
+        """
+        Decide whether a message is obviously short-term only.
+
+        Args:
+            text: Message content
+
+        Returns:
+            Dictionary with short_term_only, probability, rule (or None),
+            blocked and the features used
+        """
+        features = extract_features(text)
+        tokens = _TOKEN_PATTERN.findall((text or "").lower())
+        blocked = blocks_short_circuit(text)
+
+        rule = None
+        if not tokens:
+            rule = "empty"
+        elif (
+            len(tokens) <= self.RULE_MAX_TOKENS
+            and features["acknowledgement_ratio"] == 1.0
+            and not blocked
+        ):
+            rule = "acknowledgement"
+
+        probability = 1.0 if rule else predict(features, self.model)
+        short_term_only = not blocked and (
+            rule is not None or probability >= self.threshold
+        )
+
+        self._stats["checked"] += 1
+        if short_term_only:
+            self._stats["short_circuited"] += 1
+            self._stats["by_rule" if rule else "by_model"] += 1
+        else:
+            self._stats["passed"] += 1
+            if blocked:
+                self._stats["blocked"] += 1
+
+        return {
+            "short_term_only": short_term_only,
+            "probability": round(probability, 4),
+            "rule": rule,
+            "blocked": blocked,
+            "features": {name: round(value, 4) for name, value in features.items()},
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """How often the pre-filter skipped Gemini in this process."""
+        checked = self._stats["checked"]
+        return {
+            **self._stats,
+            "short_circuit_rate": (
+                round(self._stats["short_circuited"] / checked, 4) if checked else 0.0
+            ),
+            "threshold": self.threshold,
+        }
+
+
+# Create global instance (shared by every MemoryProcessor in the process)
+scoring_prefilter = ScoringPrefilter()
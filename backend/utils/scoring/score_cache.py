@@ -0,0 +1,95 @@
+"""
+Scoring Cache for GeminiScorer.
+
+Content-addressed, two-tier cache for memory classifications:
+1. In-process LRU (bounded by SCORING_CACHE_SIZE entries)
+2. Redis (shared across workers, expires after SCORING_CACHE_TTL_SECONDS)
+
+Entries are keyed by (prompt version, model, normalized-content hash), so
+editing a scoring prompt or switching models starts a fresh cache, while
+repeated short messages ("thanks", "I'm tired") and memories re-scored after
+ingestion (consent approval) reuse the first classification. Only the
+classification fields are cached; scores are rebuilt for each memory.
+Per-user tracking for GDPR purges is inherited from TwoTierCache.
+"""
+
+import json
+import hashlib
+from typing import Dict, Any, List, Optional
+
+from utils.two_tier_cache import TwoTierCache
+from services.memory.config import Config
+
+
+class ScoringCache(TwoTierCache):
+    """Two-tier (in-process LRU + Redis) cache for memory classifications."""
+
+    KEY_PREFIX = "scoring_cache"
+    ITEM_NAME = "scores"
+    CASEFOLD = True
+
+    def __init__(
+        self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None
+    ):
+        super().__init__(
+            max_entries if max_entries is not None else Config.SCORING_CACHE_SIZE,
+            ttl_seconds if ttl_seconds is not None else Config.SCORING_CACHE_TTL_SECONDS,
+        )
+
+    def _content_hash(self, text: str, prompt_version: str, model: str) -> str:
+        """Hash (prompt version, model, normalized text) into a cache id."""
+        payload = f"{prompt_version}\x1f{model}\x1f{self._normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _encode(self, classification: Dict[str, Any]) -> str:
+        return json.dumps(classification)
+
+    def _decode(self, value: str) -> Dict[str, Any]:
+        return json.loads(value)
+
+    async def get_many(
+        self,
+        texts: List[str],
+        prompt_version: str,
+        model: str,
+        user_ids: Optional[List[Optional[str]]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up cached classifications.
+
+        Args:
+            texts: Memory contents to look up
+            prompt_version: Version of the scoring prompts
+            model: Scoring model
+            user_ids: Owner of each text; hits are tracked for per-user deletion
+
+        Returns:
+            One entry per text: the cached classification, or None on a miss
+        """
+        hashes = [self._content_hash(text, prompt_version, model) for text in texts]
+        return await self._lookup(hashes, user_ids or [None] * len(hashes))
+
+    async def set_many(
+        self,
+        texts: List[str],
+        classifications: List[Dict[str, Any]],
+        prompt_version: str,
+        model: str,
+        user_ids: Optional[List[Optional[str]]] = None,
+    ) -> None:
+        """
+        Cache classifications in both tiers.
+
+        Args:
+            texts: Memory contents that were scored
+            classifications: Classifications, aligned with texts
+            prompt_version: Version of the scoring prompts
+            model: Scoring model
+            user_ids: Owner of each text, tracked for per-user deletion
+        """
+        hashes = [self._content_hash(text, prompt_version, model) for text in texts]
+        await self._store(hashes, classifications, user_ids or [None] * len(hashes))
+
+
+# Create global instance (shared by every GeminiScorer in the process)
+scoring_cache = ScoringCache()
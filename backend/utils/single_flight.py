@@ -0,0 +1,170 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same work (a double-submitted message, the
+chat API and the background processor fetching the same context, identical
+scoring prompts) share one in-flight call instead of each making their own:
+the first caller for a key runs the work, later callers with the same key
+await its result. Nothing is cached once the call finishes; the next caller
+starts a new call.
+
+Groups are named so their counters can be reported together:
+
+    embedding_flight = single_flight("embeddings")
+    result = await embedding_flight.do(key, lambda: embed(text))
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Keyed coalescing of concurrent async calls within one process."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._stats = {
+            "calls": 0,
+            "keys": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn, or wait for the call already running for key.
+
+        Args:
+            key: Identity of the work; callers with equal keys share one call
+            fn: Coroutine function doing the work
+
+        Returns:
+            fn's result (shared with every coalesced caller)
+        """
+
+        async def run(keys: List[Hashable]) -> List[Any]:
+            return [await fn()]
+
+        return (await self.do_many([key], run))[0]
+
+    async def do_many(
+        self,
+        keys: List[Hashable],
+        fn: Callable[[List[Hashable]], Awaitable[List[Any]]],
+    ) -> List[Any]:
+        """
+        Resolve several keys, running fn once for those not already in flight.
+
+        Lets batched work (embedding many texts in one request) coalesce per
+        item: keys another caller is already resolving are awaited, and the
+        rest are passed to a single fn call.
+
+        Args:
+            keys: Keys to resolve (duplicates are resolved once)
+            fn: Coroutine function taking the keys to resolve and returning
+                one result per key, in the same order
+
+        Returns:
+            One result per input key, in input order
+        """
+        loop = asyncio.get_running_loop()
+        self._stats["calls"] += 1
+
+        waiting: Dict[Hashable, asyncio.Future] = {}
+        owned: List[Hashable] = []
+        for key in dict.fromkeys(keys):
+            self._stats["keys"] += 1
+            future = self._in_flight.get(key)
+            if future is not None and future.get_loop() is loop:
+                waiting[key] = future
+                self._stats["coalesced"] += 1
+            else:
+                owned.append(key)
+
+        if owned:
+            futures = [loop.create_future() for _ in owned]
+            for key, future in zip(owned, futures):
+                self._in_flight[key] = future
+                waiting[key] = future
+                # Mark errors as retrieved even if every caller was cancelled
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+            # The call runs as its own task, so a cancelled caller does not
+            # cancel the work other callers are waiting for
+            task = asyncio.ensure_future(fn(owned))
+            task.add_done_callback(lambda done: self._resolve(owned, futures, done))
+            self._stats["executions"] += 1
+
+        results = {}
+        for key, future in waiting.items():
+            results[key] = await asyncio.shield(future)
+        return [results[key] for key in keys]
+
+    def _resolve(
+        self,
+        keys: List[Hashable],
+        futures: List[asyncio.Future],
+        task: asyncio.Future,
+    ):
+        """Hand a finished call's results to its waiters."""
+        if task.cancelled():
+            for key, future in zip(keys, futures):
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+                future.cancel()
+            return
+
+        error = None
+        if task.exception() is not None:
+            error = task.exception()
+        else:
+            values = task.result()
+            if len(values) != len(keys):
+                error = ValueError(
+                    f"{self.name}: expected {len(keys)} results, got {len(values)}"
+                )
+
+        if error is not None:
+            self._stats["errors"] += 1
+
+        for position, (key, future) in enumerate(zip(keys, futures)):
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(values[position])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing counters for this group."""
+        keys = self._stats["keys"]
+        return {
+            **self._stats,
+            "coalesce_rate": (
+                round(self._stats["coalesced"] / keys, 4) if keys else 0.0
+            ),
+            "in_flight": len(self._in_flight),
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def single_flight(name: str) -> SingleFlight:
+    """Get the process-wide single-flight group with this name."""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every single-flight group in this process."""
+    return {name: group.get_stats() for name, group in _groups.items()}
@@ -0,0 +1,314 @@
+"""
+Two-Tier Cache Base.
+
+Content-addressed cache shared by the embedding and scoring caches:
+1. In-process LRU (bounded by max_entries)
+2. Redis (shared across workers, entries expire after ttl_seconds)
+
+Subclasses decide how entries are keyed and how values are packed for each
+tier. Each user's cache keys are tracked, on hits as well as stores, so they
+can be removed when the user's memories are cleared (GDPR). The in-process
+LRU tracks its own entries' owners, so it is purged even while Redis is
+unavailable.
+"""
+
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from utils.redis_client import get_redis_client
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class TwoTierCache:
+    """Base class for content-addressed (in-process LRU + Redis) caches."""
+
+    KEY_PREFIX = "cache"
+    # Used in log messages, e.g. "Purged 3 cached embeddings"
+    ITEM_NAME = "entries"
+    # Whether normalization ignores case
+    CASEFOLD = False
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # content hash -> LRU entry (as packed by _to_lru)
+        self._lru: "OrderedDict[str, Any]" = OrderedDict()
+        # content hash -> users whose content maps to that LRU entry
+        self._owners: Dict[str, Set[str]] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "user_purges": 0,
+        }
+
+    def _normalize_text(self, text: str) -> str:
+        """Normalize text so trivially different copies share one entry."""
+        normalized = unicodedata.normalize("NFC", text or "")
+        if self.CASEFOLD:
+            normalized = normalized.casefold()
+        return re.sub(r"\s+", " ", normalized).strip()
+
+    def _redis_key(self, content_hash: str) -> str:
+        return f"{self.KEY_PREFIX}:{content_hash}"
+
+    def _user_keys_key(self, user_id: str) -> str:
+        return f"user:{user_id}:{self.KEY_PREFIX}:keys"
+
+    def _encode(self, value: Any) -> str:
+        """Pack a value for Redis."""
+        raise NotImplementedError
+
+    def _decode(self, value: str) -> Any:
+        """Unpack a value read from Redis."""
+        raise NotImplementedError
+
+    def _to_lru(self, value: Any) -> Any:
+        """Pack a value for the in-process LRU."""
+        return value
+
+    def _from_lru(self, entry: Any) -> Any:
+        """Unpack a value held in the in-process LRU."""
+        return entry
+
+    async def _get_client(self):
+        """Get the shared Redis client, or None when Redis is unavailable."""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.debug(f"{type(self).__name__} running without Redis: {e}")
+            return None
+
+    def _remember(self, content_hash: str, value: Any):
+        """Insert into the in-process LRU, evicting the oldest entries."""
+        if self.max_entries <= 0:
+            return
+
+        self._lru[content_hash] = self._to_lru(value)
+        self._lru.move_to_end(content_hash)
+
+        while len(self._lru) > self.max_entries:
+            evicted, _ = self._lru.popitem(last=False)
+            self._owners.pop(evicted, None)
+            self._stats["evictions"] += 1
+
+    @staticmethod
+    def _by_user(
+        hashes: List[str], user_ids: List[Optional[str]]
+    ) -> Dict[str, List[str]]:
+        """Group hashes by the user that owns them, skipping unowned ones."""
+        owned: Dict[str, List[str]] = {}
+        for content_hash, user_id in zip(hashes, user_ids):
+            if user_id:
+                owned.setdefault(user_id, []).append(content_hash)
+        return owned
+
+    def _own(self, owned: Dict[str, List[str]]):
+        """Record users as owners of the LRU entries for their hashes."""
+        for user_id, hashes in owned.items():
+            for content_hash in hashes:
+                if content_hash in self._lru:
+                    self._owners.setdefault(content_hash, set()).add(user_id)
+
+    async def _lookup(
+        self,
+        hashes: List[str],
+        user_ids: List[Optional[str]],
+        use_lru: bool = True,
+    ) -> List[Optional[Any]]:
+        """
+        Look up values by content hash, in the LRU first and then in Redis.
+
+        Args:
+            hashes: Content hashes to look up
+            user_ids: Owner of each hash (or None); hits are tracked for
+                per-user deletion
+            use_lru: Whether the in-process LRU may serve the lookup
+
+        Returns:
+            One entry per hash: the cached value, or None on a miss
+        """
+        results: List[Optional[Any]] = [None] * len(hashes)
+
+        redis_lookups = []
+        for i, content_hash in enumerate(hashes):
+            entry = self._lru.get(content_hash) if use_lru else None
+            if entry is not None:
+                self._lru.move_to_end(content_hash)
+                results[i] = self._from_lru(entry)
+                self._stats["memory_hits"] += 1
+            else:
+                redis_lookups.append(i)
+
+        if redis_lookups:
+            client = await self._get_client()
+            values = []
+            if client:
+                try:
+                    values = await client.mget(
+                        [self._redis_key(hashes[i]) for i in redis_lookups]
+                    )
+                except Exception as e:
+                    logger.warning(f"{type(self).__name__} Redis lookup failed: {e}")
+                    values = []
+
+            for position, i in enumerate(redis_lookups):
+                value = values[position] if position < len(values) else None
+                if value:
+                    try:
+                        decoded = self._decode(value)
+                        results[i] = decoded
+                        self._remember(hashes[i], decoded)
+                        self._stats["redis_hits"] += 1
+                        continue
+                    except Exception as e:
+                        logger.warning(
+                            f"Invalid cached {self.ITEM_NAME} {hashes[i]}: {e}"
+                        )
+                self._stats["misses"] += 1
+
+        hit_user_ids = [
+            user_id if result is not None else None
+            for user_id, result in zip(user_ids, results)
+        ]
+        owned = self._by_user(hashes, hit_user_ids)
+        if owned:
+            self._own(owned)
+            await self._track_user_keys(owned)
+
+        return results
+
+    async def _track_user_keys(self, owned: Dict[str, List[str]]):
+        """Record in Redis that users' content maps to these cache entries."""
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for user_id, hashes in owned.items():
+                user_keys_key = self._user_keys_key(user_id)
+                pipe.sadd(user_keys_key, *hashes)
+                pipe.expire(user_keys_key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(
+                f"Failed to track cached {self.ITEM_NAME} for "
+                f"{', '.join(owned)}: {e}"
+            )
+
+    async def _store(
+        self,
+        hashes: List[str],
+        values: List[Any],
+        user_ids: List[Optional[str]],
+    ) -> None:
+        """
+        Cache values in both tiers.
+
+        Args:
+            hashes: Content hashes of the values
+            values: Values, aligned with hashes
+            user_ids: Owner of each value (or None), tracked for per-user
+                deletion
+        """
+        for content_hash, value in zip(hashes, values):
+            self._remember(content_hash, value)
+        owned = self._by_user(hashes, user_ids)
+        self._own(owned)
+        self._stats["stores"] += len(hashes)
+
+        client = await self._get_client()
+        if not client or not hashes:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for content_hash, value in zip(hashes, values):
+                pipe.setex(
+                    self._redis_key(content_hash),
+                    self.ttl_seconds,
+                    self._encode(value),
+                )
+            for user_id, user_hashes in owned.items():
+                user_keys_key = self._user_keys_key(user_id)
+                pipe.sadd(user_keys_key, *user_hashes)
+                pipe.expire(user_keys_key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to write {self.ITEM_NAME} to Redis cache: {e}")
+
+    async def clear_user(self, user_id: str) -> int:
+        """
+        Remove every cache entry derived from a user's content.
+
+        Args:
+            user_id: Validated user ID from JWT
+
+        Returns:
+            Number of cache entries removed
+        """
+        # Purge this process's LRU first, so it happens even without Redis
+        purged = {
+            content_hash
+            for content_hash, owners in self._owners.items()
+            if user_id in owners
+        }
+        for content_hash in purged:
+            self._lru.pop(content_hash, None)
+            self._owners.pop(content_hash, None)
+        self._stats["user_purges"] += 1
+
+        client = await self._get_client()
+        if not client:
+            logger.warning(
+                f"Purged {len(purged)} in-process cached {self.ITEM_NAME} for "
+                f"user {user_id}; Redis unavailable, shared cache not purged"
+            )
+            return len(purged)
+
+        try:
+            user_keys_key = self._user_keys_key(user_id)
+            hashes = list(await client.smembers(user_keys_key))
+
+            for content_hash in hashes:
+                self._lru.pop(content_hash, None)
+                self._owners.pop(content_hash, None)
+
+            if hashes:
+                await client.delete(*[self._redis_key(h) for h in hashes])
+            await client.delete(user_keys_key)
+
+            purged.update(hashes)
+            logger.info(
+                f"Purged {len(purged)} cached {self.ITEM_NAME} for user {user_id}"
+            )
+            return len(purged)
+
+        except Exception as e:
+            logger.error(
+                f"Failed to purge cached {self.ITEM_NAME} for user {user_id}: {e}"
+            )
+            return len(purged)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the cache."""
+        hits = self._stats["memory_hits"] + self._stats["redis_hits"]
+        lookups = hits + self._stats["misses"]
+
+        return {
+            **self._stats,
+            "hits": hits,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }